@@ -15,6 +15,9 @@ a = Analysis(
     binaries=[],
     datas=[
         ('DejaVuSans.ttf', '.'),
+        # Métricas da fonte em cache (lidas pelo pdf_writer em vez de analisar o .ttf)
+        ('DejaVuSans.pkl', '.'),
+        ('DejaVuSans.cw127.pkl', '.'),
         ('icon.ico', '.'),
     ],
     hiddenimports=[
@@ -42,6 +45,23 @@ a = Analysis(
         'src.core.extractor',
         'src.core.metrics',
         'src.core.metrics.maquinas',
+        # Carregados sob demanda (importlib), invisíveis para a análise estática
+        'pdfplumber',
+        'src.core.metrics.maquinas.komori',
+        'src.core.metrics.maquinas.bobst',
+        'src.core.metrics.maquinas.cv_manual',
+        'src.core.metrics.maquinas.cv_guangya',
+        'src.core.metrics.maquinas.furnax',
+        'src.core.metrics.maquinas.hcd',
+        'src.core.metrics.maquinas.heidelberg',
+        'src.core.metrics.maquinas.laminadora',
+        'src.core.metrics.maquinas.sakurai',
+        'src.core.metrics.maquinas.samkoon',
+        'src.core.metrics.maquinas.sbl',
+        'src.core.extractor.pdf_extractor',
+        'src.core.extractor.pdf_cache',
+        'src.core.data.data_processor',
+        'src.core.metrics.report.pdf_writer',
         'src.core.metrics.report',
         'src.core.metrics.report.sections',
     ],
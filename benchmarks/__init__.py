@@ -0,0 +1,5 @@
+"""
+Benchmarks do pipeline extração → relatório.
+Mede cada etapa separadamente em relatórios sintéticos e nos PDFs de exemplo
+e compara com uma linha de base gravada (ver benchmarks/run.py).
+"""
@@ -0,0 +1,282 @@
+"""
+Benchmark runner for the extraction → report pipeline.
+Mede separadamente cada etapa (extração do PDF, preparação do DataFrame,
+frame tipado, agrupamento, consolidação das OPs e texto do relatório) e
+compara os tempos com a linha de base gravada em benchmarks/baseline.json.
+
+Exemplos:
+    python -m benchmarks.run
+    python -m benchmarks.run --cenarios grande --repeticoes 10
+    python -m benchmarks.run --update-baseline
+
+Sai com código 1 quando alguma etapa fica mais lenta que a linha de base além
+do limite (--limite, fração). A linha de base depende da máquina onde foi
+gravada: atualize-a ao trocar de ambiente.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, RAIZ)
+
+CAMINHO_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+PASTA_PDFS = os.path.join(RAIZ, 'RELATORIOS PRODUTIVIDADE', 'pdf')
+
+# Regressão: mais lento que a linha de base por mais que esta fração
+LIMITE_REGRESSAO = 0.25
+# Diferenças abaixo disto (segundos) são ruído de medição e nunca contam como regressão
+TOLERANCIA_ABSOLUTA_S = 0.002
+
+ETAPAS = ('extrair_dados_pdf', 'process_dataframe', 'frame_tipado', 'processar_grupos',
+          'consolidar_ops', 'generate_report')
+
+# nome: parâmetros de sintetico.gerar_relatorio
+CENARIOS_SINTETICOS = {
+    'pequeno': {'linhas': 200, 'ops': 10, 'entradas': 2, 'maquina': 'komori'},
+    'medio': {'linhas': 2000, 'ops': 60, 'entradas': 3, 'maquina': 'bobst'},
+    'grande': {'linhas': 20000, 'ops': 400, 'entradas': 4, 'maquina': 'hcd'},
+}
+
+CONFIG = {
+    'hora_inicio': '06/06/2025 06:00',
+    'hora_fim': '06/06/2025 22:00',
+    'intervalo': 60,
+    'linhas_agrupadas': {},
+}
+
+def cenarios_pdf(pasta=PASTA_PDFS):
+    """
+    Sample PDFs under RELATORIOS PRODUTIVIDADE/pdf, as benchmark scenarios.
+
+    Returns:
+        dict: {'pdf:<mes>/<dia>/<maquina>': (caminho, maquina)}
+    """
+    from src.core.metrics.maquinas.registro import resolver_alias
+
+    cenarios = {}
+    if not os.path.isdir(pasta):
+        return cenarios
+    for raiz, _dirs, arquivos in sorted(os.walk(pasta)):
+        for arquivo in sorted(arquivos):
+            if not arquivo.lower().endswith('.pdf'):
+                continue
+            caminho = os.path.join(raiz, arquivo)
+            relativo = os.path.relpath(caminho, pasta)[:-4].replace(os.sep, '/')
+            cenarios[f'pdf:{relativo}'] = (caminho, resolver_alias(os.path.splitext(arquivo)[0]))
+    return cenarios
+
+def medir(func, repeticoes=7, aquecimento=1):
+    """
+    Best wall time of func() over repeticoes calls.
+
+    The minimum is used (as timeit does): the slower runs measure interference
+    from other processes, not the code, and make the comparison flaky.
+
+    Args:
+        func (callable): Stage to time (no arguments)
+        repeticoes (int): Timed calls
+        aquecimento (int): Untimed calls first (imports, memoized parsers)
+
+    Returns:
+        tuple: (seconds, result of the last call)
+    """
+    resultado = None
+    for _ in range(aquecimento):
+        resultado = func()
+    tempos = []
+    for _ in range(max(repeticoes, 1)):
+        inicio = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+def medir_cenario(df_bruto, maquina, repeticoes=7, caminho_pdf=None):
+    """
+    Time each pipeline stage on one report.
+
+    Every stage runs on the output of the previous one, so the stages are
+    measured in isolation (each time excludes the others).
+
+    Args:
+        df_bruto (pd.DataFrame): Output of extrair_dados_pdf (ignored when caminho_pdf is given)
+        maquina (str): Machine name
+        repeticoes (int): Timed calls per stage
+        caminho_pdf (str, optional): PDF to extract (times extrair_dados_pdf)
+
+    Returns:
+        dict: {etapa: seconds, 'linhas': rows, 'ops': OPs}
+    """
+    from core.extractor.pdf_extractor import extrair_dados_pdf
+    from src.core.pipeline import preparar_dataframe
+    from src.core.data.data_processor import processar_grupos
+    from src.core.data.typed_frame import construir_frame_tipado
+    from src.core.metrics.report.generator import ReportGenerator
+    from src.core.metrics.report.sections import efficiency
+    from src.core.metrics.maquinas.registro import obter_maquina
+
+    tempos = {}
+    if caminho_pdf:
+        tempos['extrair_dados_pdf'], df_bruto = medir(lambda: extrair_dados_pdf(caminho_pdf), repeticoes)
+
+    # process_dataframe da interface é preparar_dataframe com a máquina digitada
+    tempos['process_dataframe'], df = medir(lambda: preparar_dataframe(df_bruto.copy(), maquina), repeticoes)
+
+    # Mesmo caminho de analise._preparar_analise: regras da máquina antes do frame tipado
+    registro = obter_maquina(maquina)
+    preencher = registro.preencher_campos if registro and registro.regras_na_analise else None
+    if preencher is not None:
+        df = preencher(df.copy())
+
+    tempos['frame_tipado'], tipado = medir(lambda: construir_frame_tipado(df), repeticoes)
+    tempos['processar_grupos'], (grupos, ops_analise) = medir(
+        lambda: processar_grupos(df, CONFIG['linhas_agrupadas'], tipado), repeticoes)
+    tempos['consolidar_ops'], _ = medir(lambda: efficiency.consolidar_ops(ops_analise, df, tipado), repeticoes)
+
+    gerador = ReportGenerator()
+    dados = {'grupos': grupos, 'ops': ops_analise, 'df': df, 'tipado': tipado}
+    tempos['generate_report'], _ = medir(lambda: gerador.generate_report(dados, CONFIG), repeticoes)
+
+    tempos['linhas'] = len(df)
+    tempos['ops'] = len(ops_analise)
+    return tempos
+
+def executar(nomes=None, repeticoes=7):
+    """
+    Run the selected scenarios.
+
+    Args:
+        nomes (list, optional): Scenario names (synthetic names or 'pdf:...'); all when omitted
+        repeticoes (int): Timed calls per stage
+
+    Returns:
+        dict: {cenario: medir_cenario output}
+    """
+    from benchmarks.sintetico import gerar_relatorio
+
+    pdfs = cenarios_pdf()
+    todos = list(CENARIOS_SINTETICOS) + list(pdfs)
+    selecionados = nomes or todos
+    desconhecidos = [n for n in selecionados if n not in CENARIOS_SINTETICOS and n not in pdfs]
+    if desconhecidos:
+        raise ValueError(f"Cenário(s) desconhecido(s): {', '.join(desconhecidos)}. "
+                         f"Disponíveis: {', '.join(todos)}")
+
+    resultados = {}
+    for nome in selecionados:
+        if nome in CENARIOS_SINTETICOS:
+            parametros = CENARIOS_SINTETICOS[nome]
+            resultados[nome] = medir_cenario(gerar_relatorio(**parametros), parametros['maquina'], repeticoes)
+        else:
+            caminho, maquina = pdfs[nome]
+            resultados[nome] = medir_cenario(None, maquina, repeticoes, caminho_pdf=caminho)
+    return resultados
+
+def carregar_baseline(caminho=CAMINHO_BASELINE):
+    """Linha de base gravada ({cenario: {etapa: segundos}}), vazia se não existir."""
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f).get('cenarios', {})
+
+def gravar_baseline(resultados, caminho=CAMINHO_BASELINE, repeticoes=None):
+    """Grava os resultados como nova linha de base (mantém cenários não medidos agora)."""
+    cenarios = carregar_baseline(caminho)
+    cenarios.update(resultados)
+    conteudo = {
+        'python': sys.version.split()[0],
+        'repeticoes': repeticoes,
+        'gravado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'cenarios': cenarios,
+    }
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(conteudo, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+def comparar(resultados, baseline, limite=LIMITE_REGRESSAO):
+    """
+    Compare stage times with the baseline.
+
+    Args:
+        resultados (dict): Output of executar
+        baseline (dict): Output of carregar_baseline
+        limite (float): Allowed slowdown as a fraction (0.25 = 25%)
+
+    Returns:
+        list: (cenario, etapa, atual, base, variacao, regressao) tuples; base and
+            variacao are None for stages without a baseline
+    """
+    linhas = []
+    for cenario, tempos in resultados.items():
+        base_cenario = baseline.get(cenario, {})
+        for etapa in ETAPAS:
+            if etapa not in tempos:
+                continue
+            atual = tempos[etapa]
+            base = base_cenario.get(etapa)
+            if not base:
+                linhas.append((cenario, etapa, atual, None, None, False))
+                continue
+            variacao = atual / base - 1
+            regressao = variacao > limite and atual - base > TOLERANCIA_ABSOLUTA_S
+            linhas.append((cenario, etapa, atual, base, variacao, regressao))
+    return linhas
+
+def formatar(resultados, comparacao, limite=LIMITE_REGRESSAO):
+    """Tabela de texto com os tempos, a linha de base e as regressões."""
+    saida = [f"{'cenário':<24} {'etapa':<18} {'atual (ms)':>11} {'base (ms)':>10} {'var.':>8}", '-' * 75]
+    cenario_atual = None
+    for cenario, etapa, atual, base, variacao, regressao in comparacao:
+        if cenario != cenario_atual:
+            tempos = resultados[cenario]
+            saida.append(f"{cenario} ({tempos['linhas']} linhas, {tempos['ops']} OPs)")
+            cenario_atual = cenario
+        base_txt = f"{base * 1000:10.2f}" if base else f"{'-':>10}"
+        var_txt = f"{variacao:+8.1%}" if variacao is not None else f"{'-':>8}"
+        marca = '  << REGRESSÃO' if regressao else ''
+        saida.append(f"{'':<24} {etapa:<18} {atual * 1000:11.2f} {base_txt} {var_txt}{marca}")
+    regressoes = sum(1 for linha in comparacao if linha[5])
+    saida.append('-' * 75)
+    saida.append(f"{regressoes} regressão(ões) acima de {limite:.0%}" if regressoes
+                 else f"Nenhuma regressão acima de {limite:.0%}")
+    return '\n'.join(saida)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks do pipeline extração → relatório')
+    parser.add_argument('--cenarios', nargs='+', help='Cenários a medir (padrão: todos)')
+    parser.add_argument('--listar', action='store_true', help='Lista os cenários disponíveis')
+    parser.add_argument('--repeticoes', type=int, default=7, help='Execuções medidas por etapa (padrão: 7)')
+    parser.add_argument('--limite', type=float, default=LIMITE_REGRESSAO,
+                        help=f'Regressão tolerada, em fração (padrão: {LIMITE_REGRESSAO})')
+    parser.add_argument('--baseline', default=CAMINHO_BASELINE, help='Arquivo da linha de base')
+    parser.add_argument('--update-baseline', action='store_true', help='Grava os resultados como linha de base')
+    parser.add_argument('--json', action='store_true', help='Imprime os resultados em JSON')
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        print('\n'.join(list(CENARIOS_SINTETICOS) + list(cenarios_pdf())))
+        return 0
+
+    try:
+        resultados = executar(args.cenarios, args.repeticoes)
+    except ValueError as e:
+        parser.error(str(e))
+
+    comparacao = comparar(resultados, carregar_baseline(args.baseline), args.limite)
+    if args.json:
+        print(json.dumps(resultados, indent=2, ensure_ascii=False))
+    else:
+        print(formatar(resultados, comparacao, args.limite))
+
+    if args.update_baseline:
+        gravar_baseline(resultados, args.baseline, args.repeticoes)
+        print(f"Linha de base gravada em {args.baseline}")
+        return 0
+    return 1 if any(linha[5] for linha in comparacao) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Synthetic production reports.
+Gera DataFrames no mesmo formato de extrair_dados_pdf (primeira linha com o
+cabeçalho, campos em texto no formato brasileiro), com o número de linhas,
+OPs, entradas e a máquina configuráveis. A geração é determinística pela semente.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+# Texto do campo 'Processo' por máquina, no formato que as regras de cada uma reconhecem
+PROCESSOS = {
+    'komori': "{entrada}° entrada - 45 min - Komori Térmica - F // CMYK",
+    'bobst': "{velocidade} p/h - {tipo} - SBL{codigo}",
+    'hcd': "{entrada}° entrada - 1h - HCD nova - {velocidade} p/h",
+    'padrao': "{entrada}° entrada - {velocidade} p/h",
+}
+
+TIPOS_BOBST = ('FUNDO AUTOMÁTICO', 'COLAGEM LATERAL', 'COLAGEM BANDEJA', 'BERÇO')
+
+CLIENTES = ('ADA INDUSTRIA DE ALIMENTOS LTDA', 'SOUTHBOX COMERCIO', 'EMBALAGENS SUL LTDA',
+            'GRAFICA MODELO S.A.', 'DOCES FINOS IND. E COM.')
+
+PAUSAS = ('Ocioso', '15 min. de café', 'Manutenção', 'Falta de material')
+
+def _numero_br(valor, casas=2):
+    """Formata como no PDF: '5.220,00'."""
+    texto = f"{valor:,.{casas}f}"
+    return texto.replace(',', '_').replace('.', ',').replace('_', '.')
+
+def _duracao(minutos):
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+def _processo(maquina, entrada, velocidade, tipo, codigo):
+    modelo = PROCESSOS.get(maquina, PROCESSOS['padrao'])
+    return modelo.format(entrada=entrada, velocidade=_numero_br(velocidade, 0), tipo=tipo, codigo=codigo)
+
+def gerar_linhas(linhas=200, ops=10, entradas=2, maquina='komori', semente=0,
+                 inicio=datetime(2025, 6, 6, 6, 0)):
+    """
+    Generate the rows of a synthetic report.
+
+    Each OP has `entradas` entries; each entry is an 'acerto' followed by
+    production rows, with pauses between them. OPs are repeated in turns
+    until the requested number of rows is reached.
+
+    Args:
+        linhas (int): Number of data rows (without the header)
+        ops (int): Number of distinct OPs
+        entradas (int): Entries per OP
+        maquina (str): Machine name (selects the 'Processo' format)
+        semente (int): Random seed
+        inicio (datetime): Start of the first row
+
+    Returns:
+        list: Rows as lists of strings, in COLUNAS order
+    """
+    rnd = random.Random(semente)
+    cadastro = []
+    for i in range(max(ops, 1)):
+        cadastro.append({
+            'os': _numero_br(118000 + i * 7, 0),
+            'cliente': CLIENTES[i % len(CLIENTES)],
+            'velocidade': rnd.choice((3000, 4000, 5000, 6000)),
+            'tipo': TIPOS_BOBST[i % len(TIPOS_BOBST)],
+            'codigo': 100 + i,
+        })
+
+    resultado = []
+    instante = inicio
+
+    def adicionar(minutos, os_op='0', cliente='', processo='', evento='Ocioso', qtd=0.0, obs=''):
+        nonlocal instante
+        fim = instante + timedelta(minutes=minutos)
+        resultado.append([
+            instante.strftime('%d/%m/%Y %H:%M'), fim.strftime('%d/%m/%Y %H:%M'), _duracao(minutos),
+            os_op, cliente, processo, evento, _numero_br(qtd), _numero_br(qtd), obs,
+        ])
+        instante = fim
+
+    while len(resultado) < linhas:
+        for op in cadastro:
+            for entrada in range(1, max(entradas, 1) + 1):
+                processo = _processo(maquina, entrada, op['velocidade'], op['tipo'], op['codigo'])
+                adicionar(rnd.randint(20, 120), op['os'], op['cliente'], processo, '01 Acerto')
+                for _ in range(rnd.randint(1, 3)):
+                    minutos = rnd.randint(10, 150)
+                    qtd = round(op['velocidade'] * minutos / 60 * rnd.uniform(0.6, 1.1))
+                    adicionar(minutos, op['os'], op['cliente'], processo, '02 Produção', qtd)
+                if rnd.random() < 0.4:
+                    adicionar(rnd.randint(0, 20), evento=rnd.choice(PAUSAS))
+                if len(resultado) >= linhas:
+                    return resultado[:linhas]
+    return resultado[:linhas]
+
+def gerar_relatorio(linhas=200, ops=10, entradas=2, maquina='komori', semente=0):
+    """
+    Generate a synthetic report as returned by extrair_dados_pdf.
+
+    Args:
+        linhas, ops, entradas, maquina, semente: See gerar_linhas
+
+    Returns:
+        pd.DataFrame: Header row followed by the data rows, columns COLUNAS
+    """
+    import pandas as pd
+    from core.extractor.pdf_extractor import COLUNAS
+
+    dados = [list(COLUNAS)] + gerar_linhas(linhas, ops, entradas, maquina, semente)
+    return pd.DataFrame(dados, columns=COLUNAS)
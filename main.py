@@ -4,14 +4,19 @@ Main application entry point - Otimizado para Executável PyInstaller
 
 import os
 import sys
+import time
 import platform
 import subprocess
 import logging
+import multiprocessing
 import traceback
 from pathlib import Path
 import tkinter as tk
 from tkinter import messagebox
 
+# Instante de início do processo, para medir o tempo até a primeira janela
+_INICIO = time.perf_counter()
+
 def get_base_path():
     """Determina o caminho base da aplicação (executável ou script)"""
     if getattr(sys, 'frozen', False):
@@ -101,12 +106,20 @@ def main():
         else:
             logger.info("Executando em modo desenvolvimento")
         
-        # Importa e inicia a aplicação
+        from src.utils.startup import marcar_inicio, tempo_desde_inicio, aquecer_dependencias
+        marcar_inicio(_INICIO)
+        
+        # Importa e inicia a aplicação (pandas, pdfplumber e fpdf ficam para depois da janela)
         from src.interface.components.main_window import MainWindow
         
         logger.info("Criando janela principal...")
         app = MainWindow()
         
+        def _janela_pronta():
+            logger.info("Primeira janela em %.2fs", tempo_desde_inicio())
+            aquecer_dependencias()
+        app.window.after_idle(_janela_pronta)
+        
         logger.info("Iniciando loop principal...")
         app.run()
         
@@ -122,5 +135,30 @@ def main():
         show_error_dialog(error_msg, details)
         sys.exit(1)
 
+def startup_report():
+    """Mede o tempo até a primeira janela e imprime as importações mais lentas (--startup-report)"""
+    setup_environment()
+    from src.utils.startup import (marcar_inicio, tempo_desde_inicio, modulos_pesados_carregados,
+                                   medir_importacoes, relatorio_inicializacao, ORCAMENTO_PRIMEIRA_JANELA_S)
+    marcar_inicio(_INICIO)
+    tempo_janela = None
+    try:
+        from src.interface.components.main_window import MainWindow
+        app = MainWindow()
+        app.window.update()
+        tempo_janela = tempo_desde_inicio()
+        pesados = modulos_pesados_carregados()
+        app.window.destroy()
+    except tk.TclError:
+        # Sem display: mede apenas as importações da interface
+        pesados = modulos_pesados_carregados()
+    print(relatorio_inicializacao(tempo_janela, pesados,
+                                  medir_importacoes('src.interface.components.main_window')))
+    return 0 if tempo_janela is None or tempo_janela <= ORCAMENTO_PRIMEIRA_JANELA_S else 1
+
 if __name__ == "__main__":
+    # Necessário para o pool de processos da extração de PDF no executável
+    multiprocessing.freeze_support()
+    if '--startup-report' in sys.argv[1:]:
+        sys.exit(startup_report())
     main()
\ No newline at end of file
@@ -0,0 +1,546 @@
+"""
+Command line interface for headless analyses.
+Permite rodar análises de um período inteiro sem a interface gráfica.
+
+Exemplos:
+    python -m src.cli analyze --from 01/06 --to 30/06 --machines all --output relatorios
+    python -m src.cli analyze --from 01/06 --to 30/06 --formato json,csv --output bi
+    python -m src.cli aggregate --from 01/06 --to 30/06 --por semana --output junho.txt --store
+    python -m src.cli export --from 01/06 --to 30/06 --output bi
+    python -m src.cli query --machine bobst --from 01/06 --to 30/06
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+def _parse_data(valor, ano):
+    """Converte 'DD/MM' ou 'DD/MM/YYYY' em datetime."""
+    partes = valor.strip().split('/')
+    if len(partes) == 2:
+        partes.append(str(ano))
+    try:
+        return datetime(int(partes[2]), int(partes[1]), int(partes[0]))
+    except (ValueError, IndexError):
+        raise ValueError(f"Data inválida: {valor} (use DD/MM ou DD/MM/YYYY)")
+
+def _intervalo_datas(inicio, fim):
+    """Gera as datas de inicio a fim (inclusive) no formato DD/MM/YYYY."""
+    atual = inicio
+    while atual <= fim:
+        yield atual.strftime('%d/%m/%Y')
+        atual += timedelta(days=1)
+
+def _maquinas_disponiveis(data):
+    """Lista as máquinas com PDF na pasta do dia, resolvidas pelos aliases."""
+    from core.extractor.catalog import NOMES_MESES, obter_catalogo
+    from core.extractor.file_finder import obter_diretorio_base
+    from src.core.metrics.maquinas.registro import resolver_alias
+
+    dia, mes, _ = data.split('/')
+    nome_mes = NOMES_MESES.get(mes, '')
+    maquinas = []
+    for (pasta_mes, pasta_dia, nome), _caminho in obter_catalogo(obter_diretorio_base()).listar().items():
+        if pasta_mes.lower() == nome_mes and pasta_dia == dia:
+            maquina = resolver_alias(nome)
+            if maquina not in maquinas:
+                maquinas.append(maquina)
+    return sorted(maquinas)
+
+def montar_tarefas(datas, maquinas):
+    """
+    Build the (date, machine) pairs to analyze.
+
+    Args:
+        datas (list): Dates in format DD/MM/YYYY
+        maquinas (list | None): Machine names, or None for every machine with a PDF on each date
+
+    Returns:
+        list: (data, maquina) tuples
+    """
+    from src.core.metrics.maquinas.registro import resolver_alias
+
+    tarefas = []
+    for data in datas:
+        if maquinas is None:
+            try:
+                nomes = _maquinas_disponiveis(data)
+            except OSError as e:
+                logger.warning("Não foi possível listar os PDFs de %s: %s", data, e)
+                nomes = []
+        else:
+            nomes = [resolver_alias(m) for m in maquinas]
+        tarefas.extend((data, maquina) for maquina in nomes)
+    return tarefas
+
+def _config_do_dia(config, data, maquina=None):
+    """
+    Completa hora_inicio/hora_fim 'HH:MM' com a data analisada.
+    Com config['calendario'], a análise recebe os turnos da máquina no dia (ver aplicar_calendario).
+    """
+    from src.core.metrics.shift_calendar import aplicar_calendario
+    config = dict(config)
+    for chave in ('hora_inicio', 'hora_fim'):
+        if len(config[chave].strip()) <= 5:
+            config[chave] = f"{data} {config[chave].strip()}"
+    return aplicar_calendario(config, data, maquina)
+
+# Extensão do arquivo gravado para cada formato de --formato
+EXTENSOES = {'texto': '.txt', 'json': '.json', 'csv': '.csv'}
+
+def analisar_par(data, maquina, config, destino, resumir=False):
+    """
+    Analyze one (date, machine) pair and write the report to a file.
+    Runs inside a worker process. The analysis is computed once and rendered
+    in each format of config['formatos'] (default: text only).
+
+    Args:
+        data (str): Date in format DD/MM/YYYY
+        maquina (str): Machine name
+        config (dict): Analysis configuration; hora_inicio/hora_fim may be 'HH:MM'
+        destino (str): Output directory
+        resumir (bool): Also return the compact summary (for the analytics store)
+
+    Returns:
+        tuple: (path of the written report — the text one when requested —, summary or None)
+    """
+    from src.core.pipeline import carregar_relatorio, gerar_modelo
+    from src.core.metrics.analise import resumo_do_modelo
+    from src.core.metrics.report.renderers import renderizar
+    from src.utils.timers import coletar, etapa, formatar_rodape
+
+    formatos = config.get('formatos') or ('texto',)
+    with coletar(f"{maquina} {data}") as medicao:
+        # Extração serial: o paralelismo já está no nível dos pares
+        df = carregar_relatorio(data, maquina, workers=1)
+        config = _config_do_dia(config, data, maquina)
+        relatorio = gerar_modelo(df, maquina, config)
+        saidas = {}
+        for formato in formatos:
+            with etapa(f'renderizar_{formato}'):
+                saidas[formato] = renderizar(relatorio, formato)
+    if config.get('rodape_desempenho') and 'texto' in saidas:
+        saidas['texto'] += formatar_rodape(medicao)
+    # gerar_modelo já recusa máquinas desconhecidas; o resumo sai do mesmo modelo
+    resumo = resumo_do_modelo(relatorio) if resumir else None
+
+    dia, mes, ano = data.split('/')
+    base = os.path.join(destino, f"{ano}-{mes}-{dia}_{maquina.replace(' ', '_')}")
+    caminhos = {}
+    for formato, conteudo in saidas.items():
+        caminhos[formato] = base + EXTENSOES[formato]
+        with open(caminhos[formato], 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+    return caminhos.get('texto', caminhos[formatos[0]]), resumo
+
+def _executar_tarefas(tarefas, config, destino, workers, armazem=None):
+    """
+    Executa os pares no pool e retorna a lista de (data, maquina, caminho, erro).
+    Com armazem, o resumo de cada par é gravado nele (no processo principal).
+    """
+    resultados = []
+
+    def registrar(data, maquina, saida):
+        caminho, resumo = saida
+        if armazem is not None:
+            armazem.gravar_resumo(data, maquina, resumo)
+        resultados.append((data, maquina, caminho, None))
+
+    resumir = armazem is not None
+    if workers <= 1 or len(tarefas) <= 1:
+        for data, maquina in tarefas:
+            try:
+                registrar(data, maquina, analisar_par(data, maquina, config, destino, resumir))
+            except Exception as e:
+                resultados.append((data, maquina, None, str(e)))
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = {executor.submit(analisar_par, data, maquina, config, destino, resumir): (data, maquina)
+                   for data, maquina in tarefas}
+        for futuro in as_completed(futuros):
+            data, maquina = futuros[futuro]
+            try:
+                registrar(data, maquina, futuro.result())
+            except Exception as e:
+                resultados.append((data, maquina, None, str(e)))
+    return resultados
+
+def _abrir_armazem(args):
+    """Armazém de análises pedido com --store (None quando não pedido)."""
+    if args.store is None:
+        return None
+    from src.core.data.analytics_store import ArmazemAnalises
+    return ArmazemAnalises(args.store or None)
+
+def resumir_par(data, maquina, config):
+    """
+    Analyze one (date, machine) pair and return its compact summary.
+    Runs inside a worker process; only the summary goes back to the parent.
+
+    Args:
+        data (str): Date in format DD/MM/YYYY
+        maquina (str): Machine name
+        config (dict): Analysis configuration; hora_inicio/hora_fim may be 'HH:MM'
+
+    Returns:
+        dict: Output of analise.resumir_desempenho
+    """
+    from src.core.pipeline import carregar_relatorio
+    from src.core.metrics.maquinas.registro import obter_maquina, nomes_disponiveis
+
+    registro = obter_maquina(maquina)
+    if registro is None:
+        raise ValueError(f"Máquina '{maquina}' não encontrada ou não implementada.\nMáquinas disponíveis: {nomes_disponiveis()}")
+    df = carregar_relatorio(data, maquina, workers=1)
+    return registro.resumir_desempenho(df, _config_do_dia(config, data, maquina))
+
+def _resumos(tarefas, config, workers):
+    """Gera (data, maquina, resumo, erro) à medida que os pares terminam."""
+    if workers <= 1 or len(tarefas) <= 1:
+        for data, maquina in tarefas:
+            try:
+                yield data, maquina, resumir_par(data, maquina, config), None
+            except Exception as e:
+                yield data, maquina, None, str(e)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = {executor.submit(resumir_par, data, maquina, config): (data, maquina)
+                   for data, maquina in tarefas}
+        for futuro in as_completed(futuros):
+            data, maquina = futuros[futuro]
+            try:
+                yield data, maquina, futuro.result(), None
+            except Exception as e:
+                yield data, maquina, None, str(e)
+
+def _periodo_e_tarefas(args):
+    """Valida as datas e monta as tarefas; devolve (tarefas, None) ou (None, código de saída)."""
+    if args.base_dir:
+        # Propagado aos processos filhos pelo ambiente
+        os.environ['ANALISADOR_PDF_DIR'] = os.path.abspath(args.base_dir)
+    try:
+        inicio = _parse_data(args.data_inicio, args.ano)
+        fim = _parse_data(args.data_fim, args.ano) if args.data_fim else inicio
+    except ValueError as e:
+        print(f"❌ ERRO: {e}", file=sys.stderr)
+        return None, 2
+    if fim < inicio:
+        print("❌ ERRO: --to anterior a --from.", file=sys.stderr)
+        return None, 2
+
+    maquinas = None
+    if args.machines.strip().lower() != 'all':
+        maquinas = [m.strip() for m in args.machines.split(',') if m.strip()]
+
+    tarefas = montar_tarefas(list(_intervalo_datas(inicio, fim)), maquinas)
+    if tarefas and args.calendario:
+        try:
+            tarefas = _tarefas_com_turno(tarefas, os.path.abspath(args.calendario))
+        except (OSError, ValueError) as e:
+            print(f"❌ ERRO: calendário {args.calendario}: {e}", file=sys.stderr)
+            return None, 2
+    if not tarefas:
+        print("Nenhum relatório encontrado para o período.")
+        return None, 1
+    return tarefas, None
+
+def _tarefas_com_turno(tarefas, caminho):
+    """Descarta os pares sem turno no calendário (feriados, folgas), uma consulta por máquina."""
+    from src.core.metrics.shift_calendar import carregar_calendario
+
+    calendario = carregar_calendario(caminho)
+    datas_por_maquina = {}
+    for data, maquina in tarefas:
+        datas_por_maquina.setdefault(maquina, []).append(data)
+    com_turno = set()
+    for maquina, datas in datas_por_maquina.items():
+        minutos = calendario.minutos_disponiveis(maquina, datas)
+        com_turno.update((data, maquina) for data, disponivel in zip(datas, minutos) if disponivel > 0)
+    ignorados = len(tarefas) - len(com_turno)
+    if ignorados:
+        print(f"ℹ️ {ignorados} par(es) sem turno no calendário ignorado(s).")
+    return [tarefa for tarefa in tarefas if tarefa in com_turno]
+
+def _config_args(args):
+    from src.utils.timers import rodape_habilitado
+    return {
+        'hora_inicio': args.inicio,
+        'hora_fim': args.fim,
+        'intervalo': str(args.intervalo),
+        'linhas_agrupadas': {},
+        'rodape_desempenho': getattr(args, 'perf', False) or rodape_habilitado(),
+        'calendario': os.path.abspath(args.calendario) if args.calendario else None,
+    }
+
+def comando_aggregate(args):
+    """Run the 'aggregate' subcommand."""
+    import json
+    from src.core.metrics.aggregation import AgregadorPeriodo
+
+    tarefas, codigo = _periodo_e_tarefas(args)
+    if tarefas is None:
+        return codigo
+    agregador = AgregadorPeriodo(args.por)
+    workers = args.workers or os.cpu_count() or 1
+    armazem = _abrir_armazem(args)
+    try:
+        for data, maquina, resumo, erro in _resumos(tarefas, _config_args(args), workers):
+            if erro:
+                agregador.registrar_falha(data, maquina, erro)
+                continue
+            agregador.adicionar(data, maquina, resumo)
+            if armazem is not None:
+                armazem.gravar_resumo(data, maquina, resumo)
+    finally:
+        if armazem is not None:
+            armazem.fechar()
+
+    texto = agregador.gerar_texto(args.max_ops)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        print(f"✅ Relatório consolidado: {args.output}")
+    else:
+        print(texto)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(agregador.resultado(), f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultado em JSON: {args.json}")
+    return 1 if agregador.falhas else 0
+
+def _formatos(args):
+    """Formatos de --formato validados; devolve (formatos, None) ou (None, código de saída)."""
+    formatos = []
+    for formato in args.formato.split(','):
+        formato = formato.strip().lower()
+        if formato and formato not in formatos:
+            formatos.append(formato)
+    desconhecidos = [f for f in formatos if f not in EXTENSOES]
+    if desconhecidos or not formatos:
+        print(f"❌ ERRO: formato inválido: {args.formato} (use {', '.join(EXTENSOES)})", file=sys.stderr)
+        return None, 2
+    if args.pdf and 'texto' not in formatos:
+        print("❌ ERRO: --pdf usa os relatórios em texto; inclua 'texto' em --formato.", file=sys.stderr)
+        return None, 2
+    return formatos, None
+
+def comando_analyze(args):
+    """Run the 'analyze' subcommand."""
+    formatos, codigo = _formatos(args)
+    if formatos is None:
+        return codigo
+    tarefas, codigo = _periodo_e_tarefas(args)
+    if tarefas is None:
+        return codigo
+
+    os.makedirs(args.output, exist_ok=True)
+    workers = args.workers or os.cpu_count() or 1
+    armazem = _abrir_armazem(args)
+    try:
+        config = dict(_config_args(args), formatos=formatos)
+        resultados = _executar_tarefas(tarefas, config, args.output, workers, armazem)
+    finally:
+        if armazem is not None:
+            armazem.fechar()
+
+    falhas = 0
+    resultados = sorted(resultados, key=lambda r: (r[0][6:], r[0][3:5], r[0][:2], r[1]))
+    for data, maquina, caminho, erro in resultados:
+        if erro:
+            falhas += 1
+            print(f"❌ {data} {maquina}: {erro}")
+        else:
+            print(f"✅ {data} {maquina}: {caminho}")
+    print(f"\n{len(resultados) - falhas} relatório(s) gerado(s), {falhas} falha(s).")
+    if args.pdf:
+        secoes = gerar_pacote_pdf(args.pdf, [(data, maquina, caminho) for data, maquina, caminho, erro in resultados
+                                             if not erro])
+        print(f"PDF com {secoes} relatório(s): {args.pdf}")
+    return 1 if falhas else 0
+
+def gerar_pacote_pdf(destino, relatorios):
+    """
+    Write the generated reports into one PDF, one section per report.
+    Os textos são lidos um a um enquanto o PDF é escrito.
+
+    Args:
+        destino (str): Output PDF
+        relatorios (list): (data, maquina, caminho do .txt) in section order
+
+    Returns:
+        int: Number of sections written
+    """
+    from src.core.metrics.report.pdf_writer import gerar_pdf
+
+    def secoes():
+        for data, maquina, caminho in relatorios:
+            with open(caminho, encoding='utf-8') as f:
+                yield f"{maquina.upper()} - {data}", f.read()
+
+    pasta = os.path.dirname(os.path.abspath(destino))
+    os.makedirs(pasta, exist_ok=True)
+    return gerar_pdf(destino, secoes())
+
+def comando_export(args):
+    """Run the 'export' subcommand."""
+    from src.core.data.bi_export import ExportadorBI
+
+    try:
+        exportador = ExportadorBI(args.output, args.formato)
+    except ValueError as e:
+        print(f"❌ ERRO: {e}", file=sys.stderr)
+        return 2
+    tarefas, codigo = _periodo_e_tarefas(args)
+    if tarefas is None:
+        return codigo
+    workers = args.workers or os.cpu_count() or 1
+    armazem = _abrir_armazem(args)
+    exportados, falhas = 0, []
+    try:
+        for data, maquina, resumo, erro in _resumos(tarefas, _config_args(args), workers):
+            if erro:
+                falhas.append((data, maquina, erro))
+                continue
+            # Cada par grava só as próprias partições: reexportar um dia não reescreve o resto
+            exportador.exportar(data, maquina, resumo)
+            exportados += 1
+            if armazem is not None:
+                armazem.gravar_resumo(data, maquina, resumo)
+    finally:
+        if armazem is not None:
+            armazem.fechar()
+
+    for data, maquina, erro in sorted(falhas):
+        print(f"❌ {data} {maquina}: {erro}")
+    print(f"✅ {exportados} análise(s) exportada(s) em {exportador.formato.upper()}: {args.output}")
+    return 1 if falhas else 0
+
+def comando_query(args):
+    """Run the 'query' subcommand."""
+    import json
+    from src.core.data.analytics_store import ArmazemAnalises, caminho_armazem_padrao
+
+    caminho = args.store or caminho_armazem_padrao()
+    if not os.path.isfile(caminho):
+        print(f"❌ ERRO: armazém não encontrado: {caminho} (rode 'analyze' ou 'aggregate' com --store)",
+              file=sys.stderr)
+        return 2
+    try:
+        inicio = _parse_data(args.data_inicio, args.ano).strftime('%d/%m/%Y') if args.data_inicio else None
+        fim = _parse_data(args.data_fim, args.ano).strftime('%d/%m/%Y') if args.data_fim else None
+    except ValueError as e:
+        print(f"❌ ERRO: {e}", file=sys.stderr)
+        return 2
+    maquina = None
+    if args.machine:
+        from src.core.metrics.maquinas.registro import resolver_alias
+        maquina = resolver_alias(args.machine)
+    filtros = {'maquina': maquina, 'inicio': inicio, 'fim': fim, 'os_op': args.op, 'cliente': args.cliente}
+
+    with ArmazemAnalises(caminho) as armazem:
+        if args.ops:
+            linhas = armazem.consultar_ops(**filtros)
+        else:
+            linhas = armazem.resumo_ops(por=None if args.por == 'total' else args.por, **filtros)
+    if args.json:
+        print(json.dumps(linhas, ensure_ascii=False, indent=2))
+        return 0
+    if not linhas:
+        print("Nenhum resultado no armazém para os filtros informados.")
+        return 1
+
+    def pct(valor):
+        return f"{valor:>7.1f}%" if valor is not None else f"{'-':>8}"
+
+    if args.ops:
+        print(f"{'Data':<11}{'Máquina':<12}{'OP':<10}{'Produção':>10}{'Acerto':>9}{'Qtd':>12}{'Ef.Prod':>9}{'Ef.Acerto':>10}  Cliente")
+        for l in linhas:
+            print(f"{l['data']:<11}{l['maquina']:<12}{l['os']:<10}{l['tempo_producao']:>9.0f}m{l['tempo_setup']:>8.0f}m"
+                  f"{l['qtd_produzida']:>12,.0f}{pct(l['eficiencia_producao']):>9}{pct(l['eficiencia_acerto']):>10}  {l['cliente']}")
+    else:
+        print(f"{args.por.capitalize():<22}{'OPs':>5}{'Produção':>10}{'Acerto':>9}{'Qtd':>13}{'Ganho':>9}{'Ef.Prod':>9}{'Ef.Acerto':>10}")
+        for l in linhas:
+            ganho = l['ganho_producao'] + l['ganho_setup']
+            print(f"{str(l['grupo']):<22}{l['ops']:>5}{l['tempo_producao']:>9.0f}m{l['tempo_setup']:>8.0f}m"
+                  f"{l['qtd_produzida']:>13,.0f}{ganho:>+8.0f}m{pct(l['eficiencia_producao']):>9}{pct(l['eficiencia_acerto']):>10}")
+    return 0
+
+def _argumentos_periodo(parser):
+    """Argumentos comuns de período, máquinas e turno."""
+    parser.add_argument('--from', dest='data_inicio', required=True, help='Data inicial (DD/MM ou DD/MM/YYYY)')
+    parser.add_argument('--to', dest='data_fim', help='Data final (padrão: igual à inicial)')
+    parser.add_argument('--ano', type=int, default=datetime.now().year, help='Ano para datas sem ano (padrão: ano atual)')
+    parser.add_argument('--machines', default='all', help="Máquinas separadas por vírgula ou 'all'")
+    parser.add_argument('--inicio', default='06:00', help='Hora de início do turno (padrão: 06:00)')
+    parser.add_argument('--fim', default='22:00', help='Hora de fim do turno (padrão: 22:00)')
+    parser.add_argument('--intervalo', type=int, default=60, help='Intervalo em minutos (padrão: 60)')
+    parser.add_argument('--calendario',
+                        help='JSON de turnos por máquina (pausas, feriados); substitui --inicio/--fim/--intervalo')
+    parser.add_argument('--base-dir', help="Diretório 'RELATORIOS PRODUTIVIDADE/pdf' (padrão: o do sistema)")
+    parser.add_argument('--workers', type=int, default=None, help='Processos em paralelo (padrão: um por núcleo)')
+    parser.add_argument('--store', nargs='?', const='', default=None,
+                        help='Grava os resultados por OP no armazém SQLite (opcional: caminho do arquivo)')
+
+def criar_parser():
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description='Analisador de Produção (linha de comando)')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    analyze = subparsers.add_parser('analyze', help='Analisa um período e grava um relatório por data e máquina')
+    _argumentos_periodo(analyze)
+    analyze.add_argument('--output', default='relatorios', help='Diretório de saída (padrão: relatorios)')
+    analyze.add_argument('--pdf', help='Grava também todos os relatórios num único PDF (ex.: fechamento do mês)')
+    analyze.add_argument('--formato', default='texto',
+                         help='Formatos gravados por relatório, separados por vírgula: texto, json, csv (padrão: texto)')
+    analyze.add_argument('--perf', action='store_true',
+                         help='Acrescenta ao relatório o tempo de cada etapa (ou ANALISADOR_PERF=1)')
+    analyze.set_defaults(func=comando_analyze)
+
+    aggregate = subparsers.add_parser('aggregate', help='Consolida um período por semana, mês ou total, entre máquinas')
+    _argumentos_periodo(aggregate)
+    aggregate.add_argument('--por', choices=['dia', 'semana', 'mes', 'periodo'], default='semana',
+                           help='Agrupamento dos totais (padrão: semana)')
+    aggregate.add_argument('--max-ops', type=int, default=20, help='OPs listadas no acumulado entre dias (padrão: 20)')
+    aggregate.add_argument('--output', help='Arquivo de saída do relatório (padrão: imprime na tela)')
+    aggregate.add_argument('--json', help='Grava também o resultado estruturado em JSON')
+    aggregate.set_defaults(func=comando_aggregate)
+
+    export = subparsers.add_parser('export', help='Exporta as métricas por OP e por dia/máquina para BI (Parquet ou CSV)')
+    _argumentos_periodo(export)
+    export.add_argument('--output', required=True, help='Pasta da exportação (uma partição por dia e máquina)')
+    export.add_argument('--formato', choices=['auto', 'parquet', 'csv'], default='auto',
+                        help='Formato dos arquivos (padrão: Parquet com pyarrow instalado, senão CSV)')
+    export.set_defaults(func=comando_export)
+
+    query = subparsers.add_parser('query', help='Consulta o armazém de resultados por OP (sem reprocessar PDFs)')
+    query.add_argument('--machine', help='Máquina (nome ou alias)')
+    query.add_argument('--from', dest='data_inicio', help='Data inicial (DD/MM ou DD/MM/YYYY)')
+    query.add_argument('--to', dest='data_fim', help='Data final')
+    query.add_argument('--ano', type=int, default=datetime.now().year, help='Ano para datas sem ano (padrão: ano atual)')
+    query.add_argument('--op', help="Número da OP, como no relatório (ex.: 118.951)")
+    query.add_argument('--cliente', help='Parte do nome do cliente')
+    query.add_argument('--por', choices=['maquina', 'data', 'os', 'cliente', 'total'], default='maquina',
+                       help='Agrupamento dos totais (padrão: maquina)')
+    query.add_argument('--ops', action='store_true', help='Lista as OPs em vez de totais')
+    query.add_argument('--json', action='store_true', help='Saída em JSON')
+    query.add_argument('--store', help='Arquivo do armazém (padrão: ~/.analisador_producao/analises.sqlite3)')
+    query.set_defaults(func=comando_query)
+    return parser
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING)
+    args = criar_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
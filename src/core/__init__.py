@@ -2,6 +2,19 @@
 
 __version__ = "1.0.0"
 
-from .config.setup_config import get_setup_time
-from .data.group_manager import GroupManager
-from .data.data_processor import process_data, validate_data
+import importlib
+
+# Carregados sob demanda (PEP 562): importar o pacote não puxa pandas
+_EXPORTS = {
+    'get_setup_time': '.config.setup_config',
+    'GroupManager': '.data.group_manager',
+    'process_data': '.data.data_processor',
+    'validate_data': '.data.data_processor',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
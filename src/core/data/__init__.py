@@ -3,5 +3,22 @@ Data processing package.
 Contains data processing, validation, and group management functions.
 """
 
-from .data_processor import process_data, validate_data
-from .group_manager import GroupManager
+import importlib
+
+# Carregados sob demanda (PEP 562): importar o pacote não puxa pandas
+_EXPORTS = {
+    'process_data': '.data_processor',
+    'validate_data': '.data_processor',
+    'GroupManager': '.group_manager',
+    'construir_frame_tipado': '.typed_frame',
+    'DiarioEdicoes': '.edit_journal',
+    'normalizar_dataframe': '.edit_journal',
+    'ArmazemAnalises': '.analytics_store',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,252 @@
+"""
+Persistent analytics store.
+Guarda, em SQLite, os resultados consolidados por OP e por (dia, máquina) de
+cada análise, para responder perguntas históricas sem reprocessar PDFs.
+
+Each (date, machine) analysis replaces the rows previously stored for that
+pair, so re-running a day keeps the store consistent. Dates are stored as
+ISO 'YYYY-MM-DD' so ranges are plain string comparisons on an index.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Versão do esquema; incrementar recria as tabelas
+ESQUEMA_VERSAO = 1
+
+CAMPOS_OP = ('tempo_producao', 'tempo_setup', 'tempo_setup_programado', 'tempo_programado_producao',
+             'qtd_produzida', 'ganho_producao', 'ganho_setup')
+
+CAMPOS_ANALISE = ('tempo_disponivel', 'tempo_total_producao', 'tempo_total_acerto', 'qtd_total_produzida',
+                  'tempo_total_ganho', 'tempo_ocioso', 'eficiencia_producao', 'eficiencia_acerto',
+                  'eficiencia_tempo_geral')
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS analises (
+    data TEXT NOT NULL,
+    maquina TEXT NOT NULL,
+    {', '.join(f'{c} REAL NOT NULL DEFAULT 0' for c in CAMPOS_ANALISE)},
+    atualizado_em TEXT NOT NULL,
+    PRIMARY KEY (data, maquina)
+);
+CREATE TABLE IF NOT EXISTS ops (
+    data TEXT NOT NULL,
+    maquina TEXT NOT NULL,
+    os TEXT NOT NULL,
+    cliente TEXT NOT NULL DEFAULT '',
+    processo TEXT NOT NULL DEFAULT '',
+    {', '.join(f'{c} REAL NOT NULL DEFAULT 0' for c in CAMPOS_OP)},
+    tem_producao INTEGER NOT NULL DEFAULT 0,
+    tem_acerto INTEGER NOT NULL DEFAULT 0,
+    eficiencia_producao REAL,
+    eficiencia_acerto REAL,
+    PRIMARY KEY (data, maquina, os)
+);
+CREATE INDEX IF NOT EXISTS idx_ops_data ON ops (data);
+CREATE INDEX IF NOT EXISTS idx_ops_maquina_data ON ops (maquina, data);
+CREATE INDEX IF NOT EXISTS idx_ops_os ON ops (os);
+CREATE INDEX IF NOT EXISTS idx_ops_cliente ON ops (cliente);
+CREATE INDEX IF NOT EXISTS idx_analises_maquina_data ON analises (maquina, data);
+"""
+
+_DESLIGADO = ('off', '0', 'false', 'nao', 'não')
+
+def caminho_armazem_padrao():
+    """
+    Return the default database path.
+
+    Uses ANALISADOR_ARMAZEM when set to a path; otherwise a file next to the
+    PDF cache, in the user's home.
+    """
+    caminho = os.environ.get('ANALISADOR_ARMAZEM')
+    if caminho and armazem_habilitado():
+        return Path(caminho)
+    return Path.home() / '.analisador_producao' / 'analises.sqlite3'
+
+def data_iso(data):
+    """Converte 'DD/MM/YYYY' (ou 'YYYY-MM-DD') para 'YYYY-MM-DD'."""
+    data = str(data).strip()
+    if '/' in data:
+        return datetime.strptime(data, '%d/%m/%Y').strftime('%Y-%m-%d')
+    return datetime.strptime(data, '%Y-%m-%d').strftime('%Y-%m-%d')
+
+class ArmazemAnalises:
+    """
+    SQLite store of per-(day, machine) analyses and their consolidated OPs.
+
+    Args:
+        caminho (str | Path, optional): Database file; ':memory:' for a temporary store
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = str(caminho) if caminho else str(caminho_armazem_padrao())
+        if self.caminho != ':memory:':
+            Path(self.caminho).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._conexao.row_factory = sqlite3.Row
+        self._criar_esquema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def fechar(self):
+        self._conexao.close()
+
+    def _criar_esquema(self):
+        with self._lock, self._conexao:
+            versao = self._conexao.execute('PRAGMA user_version').fetchone()[0]
+            if versao not in (0, ESQUEMA_VERSAO):
+                logger.info("Armazém com esquema %s; recriando na versão %s", versao, ESQUEMA_VERSAO)
+                self._conexao.execute('DROP TABLE IF EXISTS ops')
+                self._conexao.execute('DROP TABLE IF EXISTS analises')
+            self._conexao.executescript(_ESQUEMA)
+            self._conexao.execute(f'PRAGMA user_version = {ESQUEMA_VERSAO}')
+
+    def gravar_resumo(self, data, maquina, resumo):
+        """
+        Store one analysis, replacing what was stored for the same (date, machine).
+
+        Args:
+            data (str): Date in format DD/MM/YYYY
+            maquina (str): Machine name
+            resumo (dict): Output of analise.resumir_desempenho
+        """
+        from src.core.metrics.aggregation import eficiencia_producao_op, eficiencia_acerto_op
+
+        dia = data_iso(data)
+        metricas = dict(resumo['metricas'], tempo_disponivel=resumo['tempo_disponivel'])
+        linhas_ops = []
+        for os_op, dados_op in resumo['ops'].items():
+            linhas_ops.append((
+                dia, maquina, os_op, dados_op['cliente'] or '', dados_op['processo'] or '',
+                *(float(dados_op[c]) for c in CAMPOS_OP),
+                int(dados_op['tem_producao']), int(dados_op['tem_acerto']),
+                eficiencia_producao_op(dados_op), eficiencia_acerto_op(dados_op),
+            ))
+        with self._lock, self._conexao:
+            self._conexao.execute('DELETE FROM ops WHERE data = ? AND maquina = ?', (dia, maquina))
+            self._conexao.execute(
+                f"INSERT OR REPLACE INTO analises (data, maquina, {', '.join(CAMPOS_ANALISE)}, atualizado_em) "
+                f"VALUES (?, ?, {', '.join('?' for _ in CAMPOS_ANALISE)}, ?)",
+                (dia, maquina, *(float(metricas.get(c, 0) or 0) for c in CAMPOS_ANALISE),
+                 datetime.now().isoformat(timespec='seconds')))
+            self._conexao.executemany(
+                f"INSERT INTO ops (data, maquina, os, cliente, processo, {', '.join(CAMPOS_OP)}, "
+                f"tem_producao, tem_acerto, eficiencia_producao, eficiencia_acerto) "
+                f"VALUES ({', '.join('?' for _ in range(5 + len(CAMPOS_OP) + 4))})",
+                linhas_ops)
+
+    @staticmethod
+    def _filtros(maquina=None, inicio=None, fim=None, os_op=None, cliente=None):
+        """Cláusula WHERE e parâmetros para os filtros usados nas consultas."""
+        condicoes, parametros = [], []
+        if maquina:
+            condicoes.append('maquina = ?')
+            parametros.append(maquina)
+        if inicio:
+            condicoes.append('data >= ?')
+            parametros.append(data_iso(inicio))
+        if fim:
+            condicoes.append('data <= ?')
+            parametros.append(data_iso(fim))
+        if os_op:
+            condicoes.append('os = ?')
+            parametros.append(str(os_op))
+        if cliente:
+            condicoes.append('cliente LIKE ?')
+            parametros.append(f'%{cliente}%')
+        where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ''
+        return where, parametros
+
+    def _consultar(self, sql, parametros):
+        with self._lock:
+            return [dict(linha) for linha in self._conexao.execute(sql, parametros).fetchall()]
+
+    def consultar_ops(self, maquina=None, inicio=None, fim=None, os_op=None, cliente=None):
+        """
+        Stored OP rows matching the filters, oldest first.
+
+        Args:
+            maquina (str, optional): Machine name
+            inicio (str, optional): First date (DD/MM/YYYY), inclusive
+            fim (str, optional): Last date (DD/MM/YYYY), inclusive
+            os_op (str, optional): OP number as shown in the report (e.g. '118.951')
+            cliente (str, optional): Substring of the client name
+
+        Returns:
+            list: One dict per (date, machine, OP)
+        """
+        where, parametros = self._filtros(maquina, inicio, fim, os_op, cliente)
+        return self._consultar(f'SELECT * FROM ops{where} ORDER BY data, maquina, os', parametros)
+
+    def resumo_ops(self, maquina=None, inicio=None, fim=None, os_op=None, cliente=None, por='maquina'):
+        """
+        Totals and mean efficiencies of the stored OPs.
+
+        Args:
+            maquina, inicio, fim, os_op, cliente: Filters (see consultar_ops)
+            por (str): Grouping column: 'maquina', 'data', 'os', 'cliente' or None for a single row
+
+        Returns:
+            list: One dict per group with 'ops', the summed CAMPOS_OP and the mean
+                'eficiencia_producao' / 'eficiencia_acerto' (same criteria as the daily report)
+        """
+        if por not in ('maquina', 'data', 'os', 'cliente', None):
+            raise ValueError(f"Agrupamento inválido: {por}")
+        where, parametros = self._filtros(maquina, inicio, fim, os_op, cliente)
+        colunas = ', '.join(f'SUM({c}) AS {c}' for c in CAMPOS_OP)
+        grupo = f'{por} AS grupo, ' if por else "'total' AS grupo, "
+        sql = (f'SELECT {grupo}COUNT(*) AS ops, {colunas}, '
+               f'AVG(eficiencia_producao) AS eficiencia_producao, AVG(eficiencia_acerto) AS eficiencia_acerto '
+               f'FROM ops{where}')
+        if por:
+            sql += f' GROUP BY {por} ORDER BY {por}'
+        return [linha for linha in self._consultar(sql, parametros) if linha['ops']]
+
+    def consultar_analises(self, maquina=None, inicio=None, fim=None):
+        """
+        Stored per-(day, machine) summaries, oldest first.
+
+        Returns:
+            list: One dict per analysis with CAMPOS_ANALISE
+        """
+        where, parametros = self._filtros(maquina, inicio, fim)
+        return self._consultar(f'SELECT * FROM analises{where} ORDER BY data, maquina', parametros)
+
+def armazem_habilitado():
+    """A gravação automática pode ser desligada com ANALISADOR_ARMAZEM=off."""
+    return os.environ.get('ANALISADOR_ARMAZEM', '').strip().lower() not in _DESLIGADO
+
+def gravar_analise(data, maquina, df, config, caminho=None):
+    """
+    Summarize one analysis and store it (used after each analysis in the GUI).
+
+    Args:
+        data (str): Date in format DD/MM/YYYY
+        maquina (str): Machine name or alias
+        df (pd.DataFrame): Production data, as passed to calcular_desempenho
+        config (dict): Analysis configuration
+        caminho (str, optional): Database file (default: caminho_armazem_padrao())
+
+    Returns:
+        bool: False when the machine has no analysis (nothing stored)
+    """
+    from src.core.metrics.maquinas.registro import obter_maquina
+
+    registro = obter_maquina(maquina)
+    if registro is None:
+        return False
+    resumo = registro.resumir_desempenho(df, config)
+    with ArmazemAnalises(caminho) as armazem:
+        armazem.gravar_resumo(data, registro.nome, resumo)
+    return True
@@ -0,0 +1,276 @@
+"""
+Columnar export for BI tools.
+Grava os resultados consolidados por OP e as métricas gerais de cada
+(dia, máquina) em Parquet (ou CSV, sem pyarrow/fastparquet), com esquema fixo.
+
+Each (date, machine) analysis is one partition file per table:
+
+    <destino>/ops/2025-06/2025-06-06_bobst.parquet
+    <destino>/analises/2025-06/2025-06-06_bobst.parquet
+
+Re-exporting a pair replaces only its own files, so a month can be exported
+day by day (or re-run after a correction) without rewriting the rest. The
+folder can be read as a single table by Power BI (folder source), DuckDB or
+pandas (ler_tabela). Datas vão como texto ISO 'YYYY-MM-DD', números como
+float e booleanos como bool, iguais nos dois formatos.
+"""
+
+import os
+import json
+import logging
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+from src.core.data.analytics_store import data_iso
+
+logger = logging.getLogger(__name__)
+
+# Versão do esquema; mudar colunas ou tipos exige outra versão (e outra pasta de exportação)
+ESQUEMA_VERSAO = 1
+
+# (coluna, tipo pandas) na ordem gravada
+COLUNAS_OPS = (
+    ('data', 'string'),
+    ('maquina', 'string'),
+    ('os', 'string'),
+    ('cliente', 'string'),
+    ('processo', 'string'),
+    ('tempo_producao', 'float64'),
+    ('tempo_setup', 'float64'),
+    ('tempo_setup_programado', 'float64'),
+    ('tempo_programado_producao', 'float64'),
+    ('qtd_produzida', 'float64'),
+    ('ganho_producao', 'float64'),
+    ('ganho_setup', 'float64'),
+    ('velocidade_real', 'float64'),
+    ('velocidade_nominal', 'float64'),
+    ('tem_producao', 'bool'),
+    ('tem_acerto', 'bool'),
+    ('acerto_sem_producao', 'bool'),
+    ('eficiencia_producao', 'float64'),
+    ('eficiencia_acerto', 'float64'),
+    ('exportado_em', 'string'),
+)
+
+COLUNAS_ANALISES = (
+    ('data', 'string'),
+    ('maquina', 'string'),
+    ('tempo_disponivel', 'float64'),
+    ('tempo_total_producao', 'float64'),
+    ('tempo_total_acerto', 'float64'),
+    ('qtd_total_produzida', 'float64'),
+    ('tempo_total_ganho', 'float64'),
+    ('tempo_total_perdido_ganho', 'float64'),
+    ('tempo_ocioso', 'float64'),
+    ('eficiencia_producao', 'float64'),
+    ('eficiencia_acerto', 'float64'),
+    ('eficiencia_tempo_geral', 'float64'),
+    ('ops', 'int64'),
+    ('exportado_em', 'string'),
+)
+
+TABELAS = {'ops': COLUNAS_OPS, 'analises': COLUNAS_ANALISES}
+
+# Totais numéricos copiados do resumo (as eficiências são calculadas à parte)
+_TOTAIS_OP = tuple(nome for nome, tipo in COLUNAS_OPS if tipo == 'float64' and not nome.startswith('eficiencia_'))
+_TOTAIS_ANALISE = tuple(nome for nome, tipo in COLUNAS_ANALISES if tipo == 'float64')
+
+EXTENSOES = {'parquet': '.parquet', 'csv': '.csv'}
+
+MANIFESTO = '_esquema.json'
+
+def parquet_disponivel():
+    """O pandas grava Parquet com pyarrow ou fastparquet instalados."""
+    return any(importlib.util.find_spec(modulo) is not None for modulo in ('pyarrow', 'fastparquet'))
+
+def resolver_formato(formato='auto'):
+    """
+    Resolve the output format.
+
+    Args:
+        formato (str): 'parquet', 'csv' or 'auto' (Parquet when available, else CSV)
+
+    Returns:
+        str: 'parquet' or 'csv'
+
+    Raises:
+        ValueError: If the format is unknown, or 'parquet' without pyarrow/fastparquet
+    """
+    formato = (formato or 'auto').strip().lower()
+    if formato == 'auto':
+        if parquet_disponivel():
+            return 'parquet'
+        logger.warning("pyarrow/fastparquet não instalado; exportando em CSV")
+        return 'csv'
+    if formato not in EXTENSOES:
+        raise ValueError(f"Formato inválido: {formato} (use auto, parquet ou csv)")
+    if formato == 'parquet' and not parquet_disponivel():
+        raise ValueError("Exportar Parquet requer pyarrow (pip install pyarrow); use --formato csv")
+    return formato
+
+def _quadro(linhas, colunas):
+    """DataFrame com as colunas e tipos do esquema, mesmo sem linhas."""
+    import pandas as pd
+    nomes = [nome for nome, _tipo in colunas]
+    quadro = pd.DataFrame(linhas, columns=nomes)
+    return quadro.astype({nome: tipo for nome, tipo in colunas})
+
+def quadro_ops(data, maquina, resumo, exportado_em=None):
+    """
+    Per-OP rows of one analysis, with the COLUNAS_OPS schema.
+
+    Args:
+        data (str): Date in format DD/MM/YYYY
+        maquina (str): Machine name
+        resumo (dict): Output of analise.resumir_desempenho
+        exportado_em (str, optional): Export timestamp (default: now)
+
+    Returns:
+        pd.DataFrame: One row per OP
+    """
+    from src.core.metrics.aggregation import eficiencia_producao_op, eficiencia_acerto_op
+
+    dia = data_iso(data)
+    exportado_em = exportado_em or datetime.now().isoformat(timespec='seconds')
+    linhas = []
+    for os_op, dados_op in resumo['ops'].items():
+        linhas.append({
+            'data': dia, 'maquina': maquina, 'os': os_op,
+            'cliente': dados_op.get('cliente') or '', 'processo': dados_op.get('processo') or '',
+            **{nome: float(dados_op.get(nome, 0) or 0) for nome in _TOTAIS_OP},
+            'tem_producao': bool(dados_op.get('tem_producao')),
+            'tem_acerto': bool(dados_op.get('tem_acerto')),
+            'acerto_sem_producao': bool(dados_op.get('acerto_sem_producao')),
+            'eficiencia_producao': eficiencia_producao_op(dados_op),
+            'eficiencia_acerto': eficiencia_acerto_op(dados_op),
+            'exportado_em': exportado_em,
+        })
+    return _quadro(linhas, COLUNAS_OPS)
+
+def quadro_analise(data, maquina, resumo, exportado_em=None):
+    """
+    General metrics of one analysis as a single row, with the COLUNAS_ANALISES schema.
+
+    Args:
+        data, maquina, resumo, exportado_em: See quadro_ops
+
+    Returns:
+        pd.DataFrame: One row
+    """
+    metricas = dict(resumo['metricas'], tempo_disponivel=resumo['tempo_disponivel'])
+    linha = {nome: float(metricas.get(nome, 0) or 0) for nome in _TOTAIS_ANALISE}
+    linha.update(data=data_iso(data), maquina=maquina, ops=len(resumo['ops']),
+                 exportado_em=exportado_em or datetime.now().isoformat(timespec='seconds'))
+    return _quadro([linha], COLUNAS_ANALISES)
+
+class ExportadorBI:
+    """
+    Writes per-(day, machine) partitions of the 'ops' and 'analises' tables.
+
+    Args:
+        destino (str | Path): Export folder (created when missing)
+        formato (str): 'parquet', 'csv' or 'auto' (see resolver_formato)
+
+    Raises:
+        ValueError: If the folder holds an export with another schema version or format
+    """
+
+    def __init__(self, destino, formato='auto'):
+        self.destino = Path(destino)
+        self.formato = resolver_formato(formato)
+        self.destino.mkdir(parents=True, exist_ok=True)
+        self._verificar_manifesto()
+
+    def _verificar_manifesto(self):
+        caminho = self.destino / MANIFESTO
+        if caminho.is_file():
+            with open(caminho, encoding='utf-8') as f:
+                manifesto = json.load(f)
+            if manifesto.get('versao') != ESQUEMA_VERSAO or manifesto.get('formato') != self.formato:
+                raise ValueError(f"{self.destino} já tem uma exportação {manifesto.get('formato')} "
+                                 f"(esquema {manifesto.get('versao')}); use outra pasta")
+            return
+        manifesto = {
+            'versao': ESQUEMA_VERSAO,
+            'formato': self.formato,
+            'tabelas': {tabela: dict(colunas) for tabela, colunas in TABELAS.items()},
+        }
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+    def caminho_particao(self, tabela, data, maquina):
+        """Arquivo da partição (tabela, dia, máquina)."""
+        dia = data_iso(data)
+        nome = f"{dia}_{maquina.replace(' ', '_').replace('/', '_')}{EXTENSOES[self.formato]}"
+        return self.destino / tabela / dia[:7] / nome
+
+    def _gravar(self, quadro, caminho):
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_name(caminho.name + '.tmp')
+        if self.formato == 'parquet':
+            quadro.to_parquet(temporario, index=False)
+        else:
+            quadro.to_csv(temporario, index=False, encoding='utf-8')
+        # Troca atômica: um leitor nunca vê a partição pela metade
+        os.replace(temporario, caminho)
+
+    def exportar(self, data, maquina, resumo):
+        """
+        Write (or replace) the partitions of one analysis.
+
+        Args:
+            data (str): Date in format DD/MM/YYYY
+            maquina (str): Machine name
+            resumo (dict): Output of analise.resumir_desempenho
+
+        Returns:
+            list: Paths written ('ops' then 'analises')
+        """
+        exportado_em = datetime.now().isoformat(timespec='seconds')
+        caminhos = []
+        for tabela, quadro in (('ops', quadro_ops(data, maquina, resumo, exportado_em)),
+                               ('analises', quadro_analise(data, maquina, resumo, exportado_em))):
+            caminho = self.caminho_particao(tabela, data, maquina)
+            self._gravar(quadro, caminho)
+            caminhos.append(caminho)
+        return caminhos
+
+def ler_tabela(destino, tabela='ops', inicio=None, fim=None, maquina=None):
+    """
+    Read an exported table back into one DataFrame, with the schema types.
+
+    Args:
+        destino (str | Path): Export folder
+        tabela (str): 'ops' or 'analises'
+        inicio (str, optional): First date (DD/MM/YYYY), inclusive
+        fim (str, optional): Last date (DD/MM/YYYY), inclusive
+        maquina (str, optional): Machine name
+
+    Returns:
+        pd.DataFrame: Rows of the selected partitions, ordered by date and machine
+    """
+    import pandas as pd
+
+    colunas = TABELAS[tabela]
+    primeiro = data_iso(inicio) if inicio else None
+    ultimo = data_iso(fim) if fim else None
+    sufixo_maquina = f"_{maquina.replace(' ', '_').replace('/', '_')}" if maquina else None
+    partes = []
+    for caminho in sorted((Path(destino) / tabela).glob('*/*')):
+        if caminho.suffix not in EXTENSOES.values():
+            continue
+        dia = caminho.stem[:10]
+        if (primeiro and dia < primeiro) or (ultimo and dia > ultimo):
+            continue
+        if sufixo_maquina and caminho.stem[10:] != sufixo_maquina:
+            continue
+        if caminho.suffix == '.parquet':
+            partes.append(pd.read_parquet(caminho))
+        else:
+            partes.append(pd.read_csv(caminho, dtype={nome: 'string' for nome, tipo in colunas if tipo == 'string'},
+                                      keep_default_na=False, na_values={nome: [''] for nome, tipo in colunas
+                                                                        if tipo == 'float64'}))
+    if not partes:
+        return _quadro([], colunas)
+    return pd.concat(partes, ignore_index=True).astype({nome: tipo for nome, tipo in colunas})
@@ -3,10 +3,16 @@ Módulo responsável pelo processamento e análise dos dados de produção.
 """
 
 from typing import Dict, List, Tuple, Set
+import numpy as np
 import pandas as pd
 import unicodedata
 import re
-from src.core.metrics.maquinas import komori, bobst
+from src.core.metrics.maquinas.registro import maquina_da_coluna
+from src.core.metrics.utils import coluna_ou_vazia, mapear_valores
+from src.utils.logger import TRACE, get_logger, trace_ativo
+from .typed_frame import construir_frame_tipado
+
+logger = get_logger(__name__)
 
 def process_data(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -153,101 +159,127 @@ def extrair_tempo_setup(row: pd.Series) -> float:
     # Para acerto, o tempo utilizado é o campo 'Tempo' (real)
     return tempo_para_minutos(row.get('Tempo', 0))
 
-def processar_grupos(df: pd.DataFrame, linhas_agrupadas: Dict[str, List[int]]) -> Tuple[dict, dict]:
+def _processo_valor(media_producao, processo):
+    # Prioriza 'Média Produção' se existir e não for vazio
+    media_producao = str(media_producao).strip()
+    return media_producao if media_producao else processo
+
+def _preparar_colunas(df: pd.DataFrame, tipado: pd.DataFrame) -> dict:
+    """
+    Extrai do frame tipado as listas por linha (posição) usadas na agregação.
+    As listas contêm tipos Python (int/float), para o relatório continuar
+    idêntico ao cálculo linha a linha.
+    """
+    producao = tipado['is_producao'].tolist()
+    # Produção prioriza 'Tempo (min)' quando preenchido; demais eventos usam 'Tempo'
+    tempo = [
+        aux if prod and usa_aux else minutos
+        for minutos, aux, usa_aux, prod in zip(tipado['tempo_min'].tolist(), tipado['tempo_aux'].tolist(),
+                                               tipado['usa_tempo_aux'].tolist(), producao)
+    ]
+    processos = tipado['processo'].tolist()
+    return {
+        'evento': tipado['evento'].tolist(),
+        'acerto': tipado['is_acerto'].tolist(),
+        'producao': producao,
+        'valida': tipado['valida'].to_numpy(),
+        'tempo': tempo,
+        'qtd_produzida': tipado['qtd_produzida'].tolist(),
+        'qtd_recebida': tipado['qtd_recebida'].tolist(),
+        'velocidade': tipado['velocidade'].tolist(),
+        'cliente': tipado['cliente'].tolist(),
+        'processo': [_processo_valor(m, p) for m, p in zip(coluna_ou_vazia(df, 'Média Produção').tolist(), processos)],
+    }
+
+def _agregar_op(op: str, indices_op: List[int], colunas: dict) -> dict:
+    """Monta o dicionário de análise de uma OP a partir das colunas já convertidas."""
+    posicoes = [i for i in indices_op if colunas['valida'][i]]
+    acerto = colunas['acerto']
+    producao = colunas['producao']
+    tempo = colunas['tempo']
+
+    pos_producao = [i for i in posicoes if producao[i]]
+    pos_acerto = [i for i in posicoes if acerto[i] and not producao[i]]
+    cliente = next((colunas['cliente'][i] for i in posicoes if colunas['cliente'][i]), '')
+    processo = next((colunas['processo'][i] for i in posicoes if colunas['processo'][i]), '')
+
+    return {
+        'linhas': list(indices_op),
+        'tempo_total_producao': sum(tempo[i] for i in pos_producao),
+        'tempo_setup': sum(tempo[i] for i in pos_acerto),
+        'qtd_produzida': sum(colunas['qtd_produzida'][i] for i in pos_producao),
+        'qtd_acerto': sum(colunas['qtd_recebida'][i] for i in pos_acerto),
+        'velocidade_nominal': colunas['velocidade'][pos_producao[-1]] if pos_producao else 0,
+        'os': op,
+        'os_original': op,
+        'cliente': cliente,
+        'processo': processo,
+        'eventos': [colunas['evento'][i] for i in posicoes],
+        'tem_acerto': any(acerto[i] for i in posicoes),
+        'tem_producao': bool(pos_producao),
+        'detalhes_eventos': [{
+            'evento': colunas['evento'][i],
+            'is_producao': producao[i],
+            'is_acerto': acerto[i],
+            'tempo_producao': tempo[i],
+            'qtd_produzida': colunas['qtd_produzida'][i],
+            'qtd_recebida': colunas['qtd_recebida'][i]
+        } for i in posicoes]
+    }
+
+def processar_grupos(df: pd.DataFrame, linhas_agrupadas: Dict[str, List[int]],
+                     tipado: pd.DataFrame = None) -> Tuple[dict, dict]:
     """
     Processa e agrupa os dados de produção para análise.
     Sempre processa todas as OPs do DataFrame, mesmo que haja agrupamento manual.
+
+    Eventos e Tempo/Qtd vêm do frame tipado (construir_frame_tipado), montado
+    uma vez por análise; as linhas de cada OP vêm de um agrupamento por OS na
+    ordem de aparição.
     """
-    print('DF shape:', df.shape)
-    print('Linhas agrupadas:', linhas_agrupadas)
+    logger.debug("processar_grupos: %d linhas, %d grupo(s) manual(is)", len(df), len(linhas_agrupadas))
     grupos_para_analise = {}
     ops_analise = {}
-    linhas_processadas = set()
+
+    # 'linhas' guarda posições: garante que rótulos e posições coincidam
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        df = df.reset_index(drop=True)
+
+    ops = coluna_ou_vazia(df, 'OS').astype(object).map(str)
+    if tipado is None:
+        tipado = construir_frame_tipado(df)
+    colunas = _preparar_colunas(df, tipado)
 
     # AGRUPAMENTO AUTOMÁTICO POR OP (sempre processa todas as OPs)
     op_to_indices = {}
-    if 'OS' in df.columns:
-        for idx, row in df.iterrows():
-            op = str(row.get('OS', ''))
+    if 'OS' in df.columns and len(df):
+        codigos, unicos = pd.factorize(ops)
+        ordem = np.argsort(codigos, kind='stable')
+        limites = np.cumsum(np.bincount(codigos, minlength=len(unicos)))[:-1]
+        for op, posicoes in zip(unicos, np.split(ordem, limites)):
             if op:
-                op_to_indices.setdefault(op, []).append(idx)
+                op_to_indices[op] = posicoes.tolist()
+    ops = ops.tolist()
+
+    if trace_ativo(logger):
+        for pos in range(len(df)):
+            logger.log(TRACE, "Linha %d: OS=%s | Evento: %s | Acerto: %s | Producao: %s | Tempo: %s",
+                       pos, ops[pos], colunas['evento'][pos], colunas['acerto'][pos],
+                       colunas['producao'][pos], colunas['tempo'][pos])
 
     # Processa grupos agrupados pelo usuário
     for nome_grupo, linhas_grupo in linhas_agrupadas.items():
-        print(f'Grupo: {nome_grupo}, linhas: {linhas_grupo}')
         op_principal = None
         for idx in linhas_grupo:
-            if idx < len(df):
-                op_val = str(df.iloc[idx].get('OS', ''))
-                if op_val:
-                    op_principal = op_val
-                    break
+            if idx < len(df) and ops[idx]:
+                op_principal = ops[idx]
+                break
         if not op_principal:
+            logger.debug("Grupo %s sem OS nas linhas %s; ignorado", nome_grupo, linhas_grupo)
             continue
-        indices_op = op_to_indices.get(op_principal, [])
-        dados_grupo = {
-            'linhas': indices_op,
-            'tempo_total_producao': 0,
-            'tempo_setup': 0,
-            'qtd_produzida': 0,
-            'qtd_acerto': 0,
-            'velocidade_nominal': 0,
-            'os': op_principal,
-            'os_original': op_principal,
-            'cliente': '',
-            'processo': '',
-            'eventos': [],
-            'tem_acerto': False,
-            'tem_producao': False,
-            'detalhes_eventos': []
-        }
-        for linha_idx in indices_op:
-            if linha_idx >= len(df):
-                print(f'Linha {linha_idx} fora do DataFrame!')
-                continue
-            row = df.iloc[linha_idx]
-            print(f'Linha {linha_idx}:', row.to_dict())
-            if not validar_dados_linha(row):
-                print(f'Linha {linha_idx} inválida!')
-                continue
-            evento = str(row.get('Evento', ''))
-            dados_grupo['eventos'].append(evento)
-            is_acerto = eh_acerto(evento)
-            is_producao = eh_producao(evento)
-            print(f'Evento: {evento} | Acerto: {is_acerto} | Producao: {is_producao}')
-            if is_acerto:
-                dados_grupo['tem_acerto'] = True
-            if is_producao:
-                dados_grupo['tem_producao'] = True
-            tempo = extrair_tempo_producao(row) if is_producao else extrair_tempo_setup(row)
-            qtd_produzida, qtd_recebida = extrair_quantidades(row)
-            if is_producao:
-                dados_grupo['tempo_total_producao'] += tempo
-                dados_grupo['qtd_produzida'] += qtd_produzida
-                dados_grupo['velocidade_nominal'] = extrair_velocidade_nominal(row)
-            elif is_acerto:
-                dados_grupo['tempo_setup'] += tempo
-                dados_grupo['qtd_acerto'] += qtd_recebida
-            if not dados_grupo['cliente']:
-                dados_grupo['cliente'] = str(row.get('Cliente', ''))
-            if not dados_grupo['processo']:
-                # Prioriza 'Média Produção' se existir e não for vazio
-                media_producao = str(row.get('Média Produção', '')).strip()
-                if media_producao:
-                    dados_grupo['processo'] = media_producao
-                else:
-                    dados_grupo['processo'] = str(row.get('Processo', ''))
-            dados_grupo['detalhes_eventos'].append({
-                'evento': evento,
-                'is_producao': is_producao,
-                'is_acerto': is_acerto,
-                'tempo_producao': tempo,
-                'qtd_produzida': qtd_produzida,
-                'qtd_recebida': qtd_recebida
-            })
+        dados_grupo = _agregar_op(op_principal, op_to_indices.get(op_principal, []), colunas)
         if dados_grupo['tem_acerto'] or dados_grupo['tem_producao']:
             grupos_para_analise[nome_grupo] = dados_grupo
-            linhas_processadas.update(indices_op)
             if dados_grupo['os_original']:
                 op_key = f"OP {dados_grupo['os_original']}"
                 ops_analise.setdefault(op_key, []).append((nome_grupo, dados_grupo))
@@ -258,98 +290,70 @@ def processar_grupos(df: pd.DataFrame, linhas_agrupadas: Dict[str, List[int]]) -
         # Se já existe no agrupamento manual, não adiciona duplicado
         if op_key in ops_analise:
             continue
-        dados_grupo = {
-            'linhas': indices_op,
-            'tempo_total_producao': 0,
-            'tempo_setup': 0,
-            'qtd_produzida': 0,
-            'qtd_acerto': 0,
-            'velocidade_nominal': 0,
-            'os': op,
-            'os_original': op,
-            'cliente': '',
-            'processo': '',
-            'eventos': [],
-            'tem_acerto': False,
-            'tem_producao': False,
-            'detalhes_eventos': []
-        }
-        for linha_idx in indices_op:
-            if linha_idx >= len(df):
-                continue
-            row = df.iloc[linha_idx]
-            if not validar_dados_linha(row):
-                continue
-            evento = str(row.get('Evento', ''))
-            dados_grupo['eventos'].append(evento)
-            is_acerto = eh_acerto(evento)
-            is_producao = eh_producao(evento)
-            if is_acerto:
-                dados_grupo['tem_acerto'] = True
-            if is_producao:
-                dados_grupo['tem_producao'] = True
-            tempo = extrair_tempo_producao(row) if is_producao else extrair_tempo_setup(row)
-            qtd_produzida, qtd_recebida = extrair_quantidades(row)
-            if is_producao:
-                dados_grupo['tempo_total_producao'] += tempo
-                dados_grupo['qtd_produzida'] += qtd_produzida
-                dados_grupo['velocidade_nominal'] = extrair_velocidade_nominal(row)
-            elif is_acerto:
-                dados_grupo['tempo_setup'] += tempo
-                dados_grupo['qtd_acerto'] += qtd_recebida
-            if not dados_grupo['cliente']:
-                dados_grupo['cliente'] = str(row.get('Cliente', ''))
-            if not dados_grupo['processo']:
-                # Prioriza 'Média Produção' se existir e não for vazio
-                media_producao = str(row.get('Média Produção', '')).strip()
-                if media_producao:
-                    dados_grupo['processo'] = media_producao
-                else:
-                    dados_grupo['processo'] = str(row.get('Processo', ''))
-            dados_grupo['detalhes_eventos'].append({
-                'evento': evento,
-                'is_producao': is_producao,
-                'is_acerto': is_acerto,
-                'tempo_producao': tempo,
-                'qtd_produzida': qtd_produzida,
-                'qtd_recebida': qtd_recebida
-            })
+        dados_grupo = _agregar_op(op, indices_op, colunas)
         if dados_grupo['tem_acerto'] or dados_grupo['tem_producao']:
             nome_grupo = f'OP_{op}'
             grupos_para_analise[nome_grupo] = dados_grupo
             ops_analise.setdefault(op_key, []).append((nome_grupo, dados_grupo))
     return grupos_para_analise, ops_analise
 
+def _maquinas_por_linha(df):
+    """Entrada do registro (ou None) de cada linha, pela coluna 'Máquina'."""
+    return mapear_valores(coluna_ou_vazia(df, 'Máquina'), func=lambda m: maquina_da_coluna(str(m).lower()))
+
+def _linhas_por_maquina(registros, linhas):
+    """Agrupa as posições selecionadas por entrada do registro."""
+    grupos = {}
+    for pos, (registro, selecionada) in enumerate(zip(registros.tolist(), linhas)):
+        if selecionada and registro is not None:
+            grupos.setdefault(registro, []).append(pos)
+    return grupos
+
 def calculate_setup_times(df):
-    for idx, row in df.iterrows():
-        maquina = str(row.get('Máquina', '')).lower()
-        evento = str(row.get('Evento', '')).lower()
-        row_dict = row.to_dict()  # Garante dicionário para as funções de extração
-        if 'acerto' in evento:
-            if 'komori' in maquina:
-                df.at[idx, 'Tempo Setup'] = komori.extrair_tempo_setup(row_dict)
-            elif 'hcd' in maquina:
-                from src.core.metrics.maquinas import hcd
-                df.at[idx, 'Tempo Setup'] = hcd.extrair_tempo_setup(row_dict)
-            elif 'bobst' in maquina:
-                df.at[idx, 'Tempo Setup'] = bobst.extrair_tempo_setup(row_dict)
-            else:
-                df.at[idx, 'Tempo Setup'] = ''
-        else:
-            df.at[idx, 'Tempo Setup'] = ''
+    """
+    Fill 'Tempo Setup' for 'acerto' rows using each machine's batch extractor.
+
+    Rows are grouped by machine and each extractor runs once per group;
+    other rows get ''.
+
+    Args:
+        df (pd.DataFrame): Prepared data with 'Máquina' and 'Evento' columns
+
+    Returns:
+        pd.DataFrame: The same DataFrame, with 'Tempo Setup' filled
+    """
+    if df.empty:
+        return df
+    eventos = df['Evento'] if 'Evento' in df.columns else pd.Series('', index=df.index)
+    acerto = [('acerto' in str(e).lower()) for e in eventos.tolist()]
+    tempos = np.full(len(df), '', dtype=object)
+    for registro, posicoes in _linhas_por_maquina(_maquinas_por_linha(df), acerto).items():
+        tempos[posicoes] = registro.extrair_tempos_setup(df.iloc[posicoes]).to_numpy(dtype=object)
+    df['Tempo Setup'] = tempos
     return df
 
 # Função para extrair média de produção por máquina
 
 def extrair_media_producao(row):
     maquina = str(row.get('Máquina', '')).lower()
-    row_dict = row.to_dict()  # Garante dicionário para as funções de extração
-    if 'komori' in maquina:
-        return komori.extrair_media_producao(row_dict)
-    elif 'hcd' in maquina:
-        from src.core.metrics.maquinas import hcd
-        return hcd.extrair_media_producao(row_dict)
-    elif 'bobst' in maquina:
-        return bobst.extrair_media_producao(row_dict)
+    registro = maquina_da_coluna(maquina)
+    if registro is not None:
+        return registro.extrair_media_producao(row.to_dict())
     else:
         return row.get('Média Produção', '').strip()
+
+def extrair_medias_producao(df):
+    """
+    Batch version of extrair_media_producao for the whole DataFrame.
+
+    Args:
+        df (pd.DataFrame): Prepared data
+
+    Returns:
+        pd.Series: Production average per row
+    """
+    medias = np.array([m.strip() for m in coluna_ou_vazia(df, 'Média Produção').tolist()], dtype=object)
+    registros = _maquinas_por_linha(df)
+    for registro, posicoes in _linhas_por_maquina(registros, [True] * len(df)).items():
+        medias[posicoes] = registro.extrair_medias_producao(df.iloc[posicoes]).to_numpy(dtype=object)
+    return pd.Series(medias, index=df.index, dtype=object)
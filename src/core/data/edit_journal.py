@@ -0,0 +1,268 @@
+"""
+Edit journal for the table DataFrame.
+Normaliza o DataFrame uma única vez (quantidades em número, tempos em minutos,
+coluna 'Tempo (min)' e linha TOTAL) e aplica cada edição da tabela como uma
+alteração de linha, mantendo os totais de produção atualizados.
+
+The TOTAL row, when present, is always the last row of the DataFrame and sums
+the quantity columns over production rows.
+"""
+
+import logging
+import pandas as pd
+import unidecode
+
+from src.core.metrics.utils import formatar_quantidade, parse_quantidade, parse_tempo
+
+logger = logging.getLogger(__name__)
+
+COLUNA_TEMPO_MIN = 'Tempo (min)'
+
+def _nome_normalizado(coluna):
+    return unidecode.unidecode(str(coluna)).lower()
+
+def _eh_coluna_qtd(coluna):
+    return 'qtd' in _nome_normalizado(coluna)
+
+def _eh_coluna_tempo(coluna):
+    return 'tempo' in _nome_normalizado(coluna)
+
+def _eh_coluna_tempo_min(coluna):
+    return 'tempo (min' in _nome_normalizado(coluna)
+
+def _eh_producao(evento):
+    return 'producao' in unidecode.unidecode(str(evento).lower())
+
+def _eh_total(valor):
+    return str(valor).strip().upper() == 'TOTAL'
+
+def _valor_de_celula(valor):
+    """Valor como era lido do Treeview: números ficam como estão; texto numérico vira inteiro."""
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return ''
+    if isinstance(valor, (int, float)):
+        return valor
+    texto = str(valor)
+    try:
+        return int(texto)
+    except ValueError:
+        return texto
+
+def _converter_coluna(serie, func):
+    """Aplica func uma vez por valor distinto da coluna."""
+    convertidos = {}
+    valores = []
+    for valor in serie.tolist():
+        try:
+            valores.append(convertidos[valor])
+        except KeyError:
+            convertidos[valor] = func(_valor_de_celula(valor))
+            valores.append(convertidos[valor])
+        except TypeError:
+            valores.append(func(_valor_de_celula(valor)))
+    return pd.Series(valores, index=serie.index)
+
+def colunas_especiais(colunas):
+    """
+    Locate the columns the journal maintains.
+
+    Args:
+        colunas (list): Column names
+
+    Returns:
+        tuple: (qtd columns, main time column or None, 'Tempo (min)' column or None, event column or None)
+    """
+    colunas_qtd = [c for c in colunas if _eh_coluna_qtd(c)]
+    coluna_tempo = None
+    coluna_tempo_min = None
+    for c in colunas:
+        if _eh_coluna_tempo(c) and not _eh_coluna_tempo_min(c):
+            coluna_tempo = c
+        if _eh_coluna_tempo_min(c):
+            coluna_tempo_min = c
+    coluna_evento = next((c for c in colunas if _nome_normalizado(c).startswith('evento')), None)
+    return colunas_qtd, coluna_tempo, coluna_tempo_min, coluna_evento
+
+def normalizar_dataframe(df):
+    """
+    Normalize a loaded DataFrame for editing and analysis.
+    Quantidades viram float, tempos viram minutos inteiros, 'Tempo (min)' é
+    (re)calculado a partir da coluna de tempo principal e linhas TOTAL são
+    removidas (DiarioEdicoes cria a linha TOTAL).
+
+    Args:
+        df (pd.DataFrame): Data as loaded from the PDF (or a previous normalized frame)
+
+    Returns:
+        pd.DataFrame: New normalized DataFrame with a RangeIndex
+    """
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    if len(df.columns) > 0 and len(df) > 0:
+        # Remove linhas TOTAL existentes antes de processar
+        df = df[~df.iloc[:, 0].map(_eh_total).to_numpy(dtype=bool)]
+    df = df.reset_index(drop=True)
+    for coluna in df.columns:
+        if _eh_coluna_qtd(coluna):
+            df[coluna] = _converter_coluna(df[coluna], parse_quantidade)
+        elif _eh_coluna_tempo(coluna):
+            df[coluna] = _converter_coluna(df[coluna], parse_tempo)
+    # Garante que a coluna 'Tempo (min)' existe
+    if not any(_eh_coluna_tempo_min(c) for c in df.columns):
+        df[COLUNA_TEMPO_MIN] = ''
+    _, coluna_tempo, coluna_tempo_min, _ = colunas_especiais(list(df.columns))
+    if coluna_tempo is not None and coluna_tempo_min is not None:
+        df[coluna_tempo_min] = df[coluna_tempo]
+    return df
+
+class DiarioEdicoes:
+    """
+    Journal of table edits applied to a normalized DataFrame.
+
+    Each operation changes only the affected rows and adjusts the running
+    quantity totals of production rows, so the TOTAL row never requires a
+    full pass over the data.
+    """
+
+    def __init__(self, df):
+        """
+        Args:
+            df (pd.DataFrame): Normalized DataFrame (see normalizar_dataframe); a TOTAL row
+                at the end, if any, is rebuilt
+        """
+        self.entradas = []
+        self.colunas = [str(c) for c in df.columns]
+        self.colunas_qtd, self.coluna_tempo, self.coluna_tempo_min, self.coluna_evento = \
+            colunas_especiais(self.colunas)
+        if len(df) > 0 and len(df.columns) > 0 and _eh_total(df.iat[len(df) - 1, 0]):
+            df = df.iloc[:-1]
+        self.df = df.reset_index(drop=True)
+        self.tem_total = False
+        self.totais = {c: 0.0 for c in self.colunas_qtd}
+        self.linhas_producao = 0
+        if self.coluna_evento is not None and len(self.df) > 0:
+            producao = self.df[self.coluna_evento].map(_eh_producao).to_numpy(dtype=bool)
+            self.linhas_producao = int(producao.sum())
+            for coluna in self.colunas_qtd:
+                valores = self.df.loc[producao, coluna]
+                numericos = valores[valores.map(lambda v: isinstance(v, (int, float)))]
+                self.totais[coluna] = float(numericos.sum()) if len(numericos) else 0.0
+        self._atualizar_linha_total()
+
+    def _registrar(self, *entrada):
+        self.entradas.append(entrada)
+        logger.debug("Edição registrada: %s", entrada)
+
+    def linhas_dados(self):
+        """Número de linhas de dados (sem a linha TOTAL)."""
+        return len(self.df) - (1 if self.tem_total else 0)
+
+    def linha_total(self):
+        """Valores da linha TOTAL, na ordem das colunas."""
+        totais = ['' for _ in self.colunas]
+        for i, coluna in enumerate(self.colunas):
+            if coluna in self.totais:
+                totais[i] = formatar_quantidade(self.totais[coluna])
+        if totais:
+            totais[0] = 'TOTAL'
+        return totais
+
+    def _atualizar_linha_total(self):
+        """Cria, atualiza ou remove a linha TOTAL conforme haja linhas de produção."""
+        precisa_total = bool(self.colunas) and self.coluna_evento is not None and self.linhas_producao > 0
+        if precisa_total and self.tem_total:
+            pos = len(self.df) - 1
+            for coluna in self.colunas_qtd:
+                self.df.at[pos, coluna] = formatar_quantidade(self.totais[coluna])
+        elif precisa_total:
+            self.df = pd.concat([self.df, pd.DataFrame([self.linha_total()], columns=pd.Index(self.colunas))],
+                                ignore_index=True)
+            self.tem_total = True
+        elif self.tem_total:
+            self.df = self.df.iloc[:-1].reset_index(drop=True)
+            self.tem_total = False
+
+    def _somar_linha(self, pos, sinal):
+        """Soma (sinal=1) ou subtrai (sinal=-1) as quantidades da linha nos totais."""
+        for coluna in self.colunas_qtd:
+            valor = self.df.at[pos, coluna]
+            if isinstance(valor, (int, float)):
+                self.totais[coluna] += sinal * valor
+
+    def _eh_linha_producao(self, pos):
+        return self.coluna_evento is not None and _eh_producao(self.df.at[pos, self.coluna_evento])
+
+    def editar(self, pos, coluna, valor):
+        """
+        Set one cell and update 'Tempo (min)' and the totals.
+
+        Args:
+            pos (int): Row position
+            coluna (str): Column name
+            valor: New value, already converted (float for qtd, minutes for tempo)
+
+        Returns:
+            bool: False when the edit was ignored (TOTAL row or unknown cell)
+        """
+        if not 0 <= pos < self.linhas_dados() or coluna not in self.colunas:
+            return False
+        antigo = self.df.at[pos, coluna]
+        producao = self._eh_linha_producao(pos)
+        if producao:
+            self._somar_linha(pos, -1)
+        self.df.at[pos, coluna] = valor
+        if coluna == self.coluna_tempo and self.coluna_tempo_min is not None:
+            self.df.at[pos, self.coluna_tempo_min] = parse_tempo(_valor_de_celula(valor))
+        producao_nova = self._eh_linha_producao(pos)
+        if producao_nova:
+            self._somar_linha(pos, 1)
+        self.linhas_producao += int(producao_nova) - int(producao)
+        self._registrar('editar', pos, coluna, antigo, valor)
+        self._atualizar_linha_total()
+        return True
+
+    def inserir(self, pos):
+        """
+        Insert an empty row before position pos (never after the TOTAL row).
+
+        Args:
+            pos (int): Row position
+
+        Returns:
+            int: Position of the new row
+        """
+        pos = max(0, min(pos, self.linhas_dados()))
+        nova = {}
+        for coluna in self.colunas:
+            if coluna in self.totais:
+                nova[coluna] = 0.0
+            elif _eh_coluna_tempo(coluna):
+                nova[coluna] = 0
+            else:
+                nova[coluna] = ''
+        partes = [self.df.iloc[:pos], pd.DataFrame([nova], columns=pd.Index(self.colunas)), self.df.iloc[pos:]]
+        self.df = pd.concat([p for p in partes if len(p) > 0], ignore_index=True)
+        self._registrar('inserir', pos)
+        return pos
+
+    def deletar(self, posicoes):
+        """
+        Delete rows by position; the TOTAL row is kept.
+
+        Args:
+            posicoes (list): Row positions
+
+        Returns:
+            list: Positions actually deleted
+        """
+        posicoes = sorted({p for p in posicoes if 0 <= p < self.linhas_dados()})
+        if not posicoes:
+            return []
+        for pos in posicoes:
+            if self._eh_linha_producao(pos):
+                self._somar_linha(pos, -1)
+                self.linhas_producao -= 1
+        self.df = self.df.drop(self.df.index[posicoes]).reset_index(drop=True)
+        self._registrar('deletar', posicoes)
+        self._atualizar_linha_total()
+        return posicoes
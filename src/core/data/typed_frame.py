@@ -0,0 +1,106 @@
+"""
+Typed companion frame for metric calculations.
+Converte uma única vez os campos em texto (formato brasileiro) para colunas
+numéricas e categóricas; o DataFrame original fica apenas para exibição.
+
+Row i of the typed frame corresponds to position i of the source frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.core.metrics.parsing import normalize_process, entrada_key, parse_speed
+from src.core.metrics.utils import coluna_ou_vazia, mapear_valores
+
+def _minutos(valor):
+    from src.core.data.data_processor import tempo_para_minutos
+    try:
+        return tempo_para_minutos(valor)
+    except Exception:
+        return 0
+
+def _tempo_auxiliar(valor):
+    """Valor de 'Tempo (min)' e se ele deve ser usado no lugar de 'Tempo'."""
+    if valor in [None, '', 0]:
+        return np.nan, False
+    try:
+        return float(valor), True
+    except Exception:
+        return np.nan, False
+
+def _media_ph(valor):
+    texto = str(valor).strip()
+    if not texto:
+        return np.nan
+    velocidade = parse_speed(texto)
+    return np.nan if velocidade is None else velocidade
+
+def _classificar_evento(evento):
+    normalizado = normalize_process(evento)
+    return (
+        'acerto' in evento.lower(),
+        'producao' in normalizado,
+        'gravando tela' in evento.lower(),
+    )
+
+def construir_frame_tipado(df):
+    """
+    Build the typed companion frame of a production DataFrame.
+
+    Columns:
+        tempo_min (int32): 'Tempo' in minutes
+        tempo_aux (float64), usa_tempo_aux (bool): 'Tempo (min)' and whether it overrides 'Tempo'
+        tempo_setup_min (int32), tem_tempo_setup (bool): programmed 'Tempo Setup'
+        qtd_produzida (int64), qtd_produzida_f (float64), qtd_recebida (int64): quantities
+        velocidade (float64): nominal speed ('Velocidade')
+        media_ph (float64): p/h speed from 'Média Produção' (NaN when absent)
+        evento, processo, cliente, chave_entrada (category): text fields
+        valida, is_acerto, is_producao (bool): classification used by the groups
+        evento_acerto, evento_producao, gravando_tela, is_sakurai (bool): substring flags
+            used by the OP consolidation and the per-entrada analysis
+
+    Args:
+        df (pd.DataFrame): Production data (after the machine rules were applied)
+
+    Returns:
+        pd.DataFrame: Typed frame with a RangeIndex aligned to df positions
+    """
+    from src.core.data.data_processor import to_int, to_float
+
+    eventos = mapear_valores(coluna_ou_vazia(df, 'Evento'), func=str)
+    processos = mapear_valores(coluna_ou_vazia(df, 'Processo'), func=str)
+
+    codigos, unicos = pd.factorize(eventos)
+    normalizados = pd.Series(unicos, dtype=object).str.normalize('NFKD') \
+        .str.encode('ascii', 'ignore').str.decode('ascii').str.upper()
+    is_acerto = normalizados.str.contains('ACERTO', regex=False).to_numpy(dtype=bool)[codigos]
+    is_producao = normalizados.str.contains('PRODUCAO', regex=False).to_numpy(dtype=bool)[codigos]
+
+    flags_evento = mapear_valores(eventos, func=_classificar_evento)
+    auxiliar = mapear_valores(coluna_ou_vazia(df, 'Tempo (min)', None), func=_tempo_auxiliar)
+    setup = mapear_valores(coluna_ou_vazia(df, 'Tempo Setup'), func=lambda v: str(v).strip())
+
+    tipado = pd.DataFrame({
+        'tempo_min': mapear_valores(coluna_ou_vazia(df, 'Tempo', 0), func=_minutos).to_numpy(dtype=np.int32),
+        'tempo_aux': np.array([a[0] for a in auxiliar], dtype=np.float64),
+        'usa_tempo_aux': np.array([a[1] for a in auxiliar], dtype=bool),
+        'tempo_setup_min': mapear_valores(setup, func=_minutos).to_numpy(dtype=np.int32),
+        'tem_tempo_setup': np.array([bool(s) for s in setup], dtype=bool),
+        'qtd_produzida': mapear_valores(coluna_ou_vazia(df, 'Qtd. Produzida', 0), func=to_int).to_numpy(dtype=np.int64),
+        'qtd_produzida_f': mapear_valores(coluna_ou_vazia(df, 'Qtd. Produzida', 0), func=to_float).to_numpy(dtype=np.float64),
+        'qtd_recebida': mapear_valores(coluna_ou_vazia(df, 'Qtd. Recebida', 0), func=to_int).to_numpy(dtype=np.int64),
+        'velocidade': mapear_valores(coluna_ou_vazia(df, 'Velocidade', 0), func=to_float).to_numpy(dtype=np.float64),
+        'media_ph': mapear_valores(coluna_ou_vazia(df, 'Média Produção'), func=_media_ph).to_numpy(dtype=np.float64),
+        'evento': pd.Categorical(eventos),
+        'processo': pd.Categorical(processos),
+        'cliente': pd.Categorical(mapear_valores(coluna_ou_vazia(df, 'Cliente'), func=str)),
+        'chave_entrada': pd.Categorical(mapear_valores(processos, func=entrada_key)),
+        'valida': eventos.to_numpy() != '',
+        'is_acerto': is_acerto,
+        'is_producao': is_producao,
+        'evento_acerto': np.array([f[0] for f in flags_evento], dtype=bool),
+        'evento_producao': np.array([f[1] for f in flags_evento], dtype=bool),
+        'gravando_tela': np.array([f[2] for f in flags_evento], dtype=bool),
+        'is_sakurai': mapear_valores(processos, func=lambda p: 'sakurai' in normalize_process(p)).to_numpy(dtype=bool),
+    })
+    return tipado
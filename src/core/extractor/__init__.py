@@ -2,10 +2,22 @@
 Data extraction package.
 """
 
-from .file_finder import construir_caminho_pdf
-from .pdf_extractor import extrair_dados_pdf
+import importlib
 
-__all__ = [
-    'construir_caminho_pdf',
-    'extrair_dados_pdf'
-]
+# Carregados sob demanda (PEP 562): pdfplumber e pandas só entram na primeira extração
+_EXPORTS = {
+    'construir_caminho_pdf': '.file_finder',
+    'obter_diretorio_base': '.file_finder',
+    'CatalogoRelatorios': '.catalog',
+    'obter_catalogo': '.catalog',
+    'extrair_dados_pdf': '.pdf_extractor',
+    'CachePDF': '.pdf_cache',
+    'extrair_dados_pdf_com_cache': '.pdf_cache',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
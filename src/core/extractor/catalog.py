@@ -0,0 +1,164 @@
+"""
+Report directory catalog.
+Mantém em memória o índice de PDFs por (mês, dia, máquina) para evitar
+listar os diretórios a cada busca.
+
+The tree is laid out as <base>/<mês>/<dia>/<máquina>.pdf. Each directory
+is listed once and its mtime remembered; later lookups only stat the
+directories on the requested path (at most once per polling interval) and
+list them again when the mtime changed. A miss forces a fresh check before
+failing, so files copied in between polls are still found.
+"""
+
+import os
+import time
+import threading
+
+NOMES_MESES = {
+    "01": "janeiro", "02": "fevereiro", "03": "marco", "04": "abril",
+    "05": "maio", "06": "junho", "07": "julho", "08": "agosto",
+    "09": "setembro", "10": "outubro", "11": "novembro", "12": "dezembro"
+}
+
+# Intervalo mínimo (segundos) entre verificações de mtime de um mesmo diretório
+INTERVALO_VERIFICACAO = 30.0
+
+def normalizar_nome_maquina(nome):
+    """Normaliza o nome da máquina/arquivo para comparação (sem espaços, '_' e caixa)."""
+    return nome.lower().replace(' ', '').replace('_', '')
+
+class _Diretorio:
+    """Conteúdo listado de um diretório e o mtime em que foi lido."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.mtime = None
+        self.verificado_em = 0.0
+        self.entradas = {}
+        self.filhos = {}
+
+class CatalogoRelatorios:
+    def __init__(self, base_dir, intervalo=INTERVALO_VERIFICACAO):
+        self.base_dir = base_dir
+        self.intervalo = intervalo
+        self._raiz = _Diretorio(base_dir)
+        self._lock = threading.Lock()
+
+    def _atualizar(self, no, listar, forcar=False):
+        """
+        Re-list a directory if its mtime changed.
+
+        Args:
+            no (_Diretorio): Directory node
+            listar (callable): Builds the entries dict from os.scandir entries
+            forcar (bool): Ignore the polling interval
+        """
+        agora = time.monotonic()
+        if not forcar and no.mtime is not None and agora - no.verificado_em < self.intervalo:
+            return
+        mtime = os.stat(no.caminho).st_mtime
+        no.verificado_em = agora
+        if mtime == no.mtime:
+            return
+        with os.scandir(no.caminho) as it:
+            no.entradas = listar(it)
+        no.filhos = {k: v for k, v in no.filhos.items() if k in no.entradas}
+        no.mtime = mtime
+
+    @staticmethod
+    def _listar_subdiretorios(it):
+        return {e.name: e.name for e in it if e.is_dir()}
+
+    @staticmethod
+    def _listar_meses(it):
+        return {e.name.lower(): e.name for e in it if e.is_dir()}
+
+    @staticmethod
+    def _listar_pdfs(it):
+        arquivos = {}
+        for e in it:
+            if e.name.endswith(".pdf") and e.is_file():
+                # Mantém o primeiro arquivo por nome normalizado, como a busca linear fazia
+                arquivos.setdefault(normalizar_nome_maquina(e.name), e.name)
+        return arquivos
+
+    def _filho(self, no, chave):
+        filho = no.filhos.get(chave)
+        if filho is None:
+            filho = _Diretorio(os.path.join(no.caminho, no.entradas[chave]))
+            no.filhos[chave] = filho
+        return filho
+
+    def _buscar(self, dia, nome_mes, maquina, forcar):
+        if not os.path.exists(self.base_dir):
+            raise FileNotFoundError(f"Diretório base não encontrado: {self.base_dir}")
+
+        self._atualizar(self._raiz, self._listar_meses, forcar)
+        if nome_mes not in self._raiz.entradas:
+            raise FileNotFoundError(f"Mês '{nome_mes}' não encontrado em {self.base_dir}")
+        no_mes = self._filho(self._raiz, nome_mes)
+        mes_folder = self._raiz.entradas[nome_mes]
+
+        self._atualizar(no_mes, self._listar_subdiretorios, forcar)
+        if dia not in no_mes.entradas:
+            raise FileNotFoundError(f"Dia '{dia}' não encontrado em {mes_folder}")
+        no_dia = self._filho(no_mes, dia)
+
+        self._atualizar(no_dia, self._listar_pdfs, forcar)
+        arquivo = no_dia.entradas.get(normalizar_nome_maquina(maquina) + ".pdf")
+        if not arquivo:
+            raise FileNotFoundError(
+                f"Arquivo correspondente à máquina '{maquina}' não encontrado em {no_dia.caminho}")
+        return os.path.join(no_dia.caminho, arquivo)
+
+    def localizar(self, data, maquina):
+        """
+        Look up the PDF for a date and machine.
+
+        Args:
+            data (str): Date in format DD/MM/YYYY
+            maquina (str): Machine name
+
+        Returns:
+            str: Absolute path to PDF file
+
+        Raises:
+            FileNotFoundError: If directory or file not found
+        """
+        dia, mes, _ = data.split("/")
+        nome_mes = NOMES_MESES.get(mes.zfill(2), "").lower()
+        with self._lock:
+            try:
+                return self._buscar(dia, nome_mes, maquina, forcar=False)
+            except FileNotFoundError:
+                # Pode ser um arquivo novo ainda não visto: confirma no disco
+                return self._buscar(dia, nome_mes, maquina, forcar=True)
+
+    def listar(self):
+        """
+        Scan the whole tree and return every known report.
+
+        Returns:
+            dict: {(pasta_mes, dia, maquina_normalizada): caminho}
+        """
+        relatorios = {}
+        with self._lock:
+            self._atualizar(self._raiz, self._listar_meses)
+            for nome_mes, mes_folder in self._raiz.entradas.items():
+                no_mes = self._filho(self._raiz, nome_mes)
+                self._atualizar(no_mes, self._listar_subdiretorios)
+                for dia in no_mes.entradas:
+                    no_dia = self._filho(no_mes, dia)
+                    self._atualizar(no_dia, self._listar_pdfs)
+                    for nome, arquivo in no_dia.entradas.items():
+                        relatorios[(mes_folder, dia, nome[:-4])] = os.path.join(no_dia.caminho, arquivo)
+        return relatorios
+
+_catalogos = {}
+
+def obter_catalogo(base_dir):
+    """Return the shared catalog for a base directory."""
+    catalogo = _catalogos.get(base_dir)
+    if catalogo is None:
+        catalogo = _catalogos[base_dir] = CatalogoRelatorios(base_dir)
+    return catalogo
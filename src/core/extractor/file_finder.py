@@ -4,13 +4,38 @@ Responsável por localizar o caminho do PDF com base na data e na máquina.
 """
 
 import os
-import difflib
 import platform
 
+from .catalog import obter_catalogo
+
+def obter_diretorio_base():
+    """
+    Return the base directory with the PDF reports for this system.
+
+    Returns:
+        str: Path to the 'RELATORIOS PRODUTIVIDADE/pdf' directory
+    """
+    # Permite apontar para outro diretório (ex.: execução pela linha de comando)
+    if os.environ.get('ANALISADOR_PDF_DIR'):
+        return os.environ['ANALISADOR_PDF_DIR']
+
+    # Auto-detect operating system
+    sistema = platform.system()
+
+    if sistema == "Linux":
+        return "/home/koga/wilmar/AnalisadorProducao/RELATORIOS PRODUTIVIDADE/pdf"
+    elif sistema == "Windows":
+        return r"C:\\Users\\Usuario\\Desktop\\WILMAR\\AnalisadorProducao\\RELATORIOS PRODUTIVIDADE\\pdf"
+    # Fallback for other systems
+    return os.path.join(os.path.expanduser("~"), "RELATORIOS PRODUTIVIDADE", "pdf")
+
 def construir_caminho_pdf(data, maquina):
     """
     Build path to PDF file based on date and machine.
-    
+
+    Lookups go through the shared report catalog, which lists each
+    directory once and only re-lists it when its mtime changes.
+
     Args:
         data (str): Date in format DD/MM/YYYY
         maquina (str): Machine name
@@ -22,61 +47,6 @@ def construir_caminho_pdf(data, maquina):
         FileNotFoundError: If directory or file not found
     """
     try:
-        # Auto-detect operating system
-        sistema = platform.system()
-        
-        if sistema == "Linux":
-            base_dir = "/home/koga/wilmar/AnalisadorProducao/RELATORIOS PRODUTIVIDADE/pdf"
-        elif sistema == "Windows":
-            base_dir = r"C:\\Users\\Usuario\\Desktop\\WILMAR\\AnalisadorProducao\\RELATORIOS PRODUTIVIDADE\\pdf"
-        else:
-            # Fallback for other systems
-            base_dir = os.path.join(os.path.expanduser("~"), "RELATORIOS PRODUTIVIDADE", "pdf")
-        
-        # Verify directory exists
-        if not os.path.exists(base_dir):
-            raise FileNotFoundError(f"Diretório base não encontrado: {base_dir}")
-            
-        meses = os.listdir(base_dir)
-        meses = [m for m in meses if os.path.isdir(os.path.join(base_dir, m))]
-
-        # Try to identify month from date
-        dia, mes, _ = data.split("/")
-        mes = mes.zfill(2)
-
-        # Convert month number to text name
-        nomes_meses = {
-            "01": "janeiro", "02": "fevereiro", "03": "marco", "04": "abril",
-            "05": "maio", "06": "junho", "07": "julho", "08": "agosto",
-            "09": "setembro", "10": "outubro", "11": "novembro", "12": "dezembro"
-        }
-
-        nome_mes = nomes_meses.get(mes, "").lower()
-
-        # Find closest matching month
-        mes_correspondente = [m for m in meses if m.lower() == nome_mes]
-        if not mes_correspondente:
-            raise FileNotFoundError(f"Mês '{nome_mes}' não encontrado em {base_dir}")
-        mes_folder = mes_correspondente[0]
-
-        # Access day folder
-        pasta_dia = os.path.join(base_dir, mes_folder, dia)
-        if not os.path.isdir(pasta_dia):
-            raise FileNotFoundError(f"Dia '{dia}' não encontrado em {mes_folder}")
-
-        # Search PDF with similar name to machine
-        arquivos_pdf = [arq for arq in os.listdir(pasta_dia) if arq.endswith(".pdf")]
-        nome_pdf = maquina.lower().replace(' ', '').replace('_', '') + ".pdf"
-        arquivo_original = None
-        for arq in arquivos_pdf:
-            if arq.lower().replace(' ', '').replace('_', '') == nome_pdf.replace('_', ''):
-                arquivo_original = arq
-                break
-
-        if not arquivo_original:
-            raise FileNotFoundError(f"Arquivo correspondente à máquina '{maquina}' não encontrado em {pasta_dia}")
-
-        return os.path.join(pasta_dia, arquivo_original)
-
+        return obter_catalogo(obter_diretorio_base()).localizar(data, maquina)
     except Exception as e:
         raise FileNotFoundError(f"Erro ao localizar arquivo: {str(e)}")
@@ -0,0 +1,275 @@
+"""
+Persistent cache for extracted PDF tables.
+Evita rodar o pdfplumber de novo quando o mesmo relatório é recarregado.
+
+Each extracted table is stored as a pickled list of rows named after the
+SHA-256 of the PDF content. An index maps path -> (mtime, size, sha) so an
+unchanged file is resolved without being hashed again. Entries are evicted
+in least-recently-used order when the cache grows past its size limit.
+
+Vários processos (os workers da CLI) podem usar a mesma pasta: cada gravação
+usa um arquivo temporário próprio e o índice é relido e mesclado sob uma
+trava de arquivo antes de ser substituído.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import pandas as pd
+
+from .pdf_extractor import COLUNAS, extrair_dados_pdf
+from src.utils.timers import etapa, contar
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato gravado; incrementar invalida entradas antigas
+CACHE_VERSAO = 1
+
+# Tamanho máximo total das entradas em disco (bytes)
+TAMANHO_MAXIMO_CACHE = 200 * 1024 * 1024
+
+def diretorio_cache_padrao():
+    """
+    Return the default cache directory.
+
+    Uses ANALISADOR_CACHE_DIR when set; otherwise a folder in the user's home,
+    which survives between runs of the PyInstaller executable.
+    """
+    diretorio = os.environ.get('ANALISADOR_CACHE_DIR')
+    if diretorio:
+        return Path(diretorio)
+    return Path.home() / '.analisador_producao' / 'cache' / 'pdf'
+
+@contextmanager
+def _trava_arquivo(caminho):
+    """Trava exclusiva entre processos (fcntl no Linux/macOS, msvcrt no Windows)."""
+    with open(caminho, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            # LK_LOCK tenta por ~10 s antes de desistir
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _gravar_atomico(destino, gravar, modo='wb'):
+    """Grava por um temporário exclusivo deste escritor e troca atomicamente."""
+    with tempfile.NamedTemporaryFile(modo, dir=destino.parent, prefix=destino.name + '.',
+                                     suffix='.tmp', delete=False) as f:
+        temporario = f.name
+        try:
+            gravar(f)
+        except BaseException:
+            f.close()
+            os.unlink(temporario)
+            raise
+    try:
+        os.replace(temporario, destino)
+    except OSError:
+        os.unlink(temporario)
+        raise
+
+def _sha256_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    """Calcula o SHA-256 do conteúdo do arquivo."""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+class CachePDF:
+    def __init__(self, diretorio=None, tamanho_maximo=TAMANHO_MAXIMO_CACHE):
+        self.diretorio = Path(diretorio) if diretorio else diretorio_cache_padrao()
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self._indice = None
+        self._lock = threading.Lock()
+
+    @property
+    def _arquivo_indice(self):
+        return self.diretorio / 'indice.json'
+
+    def _ler_indice_disco(self):
+        try:
+            with open(self._arquivo_indice, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _carregar_indice(self):
+        if self._indice is None:
+            self._indice = self._ler_indice_disco()
+        return self._indice
+
+    def _atualizar_indice(self, novos=None, removidos=()):
+        """
+        Apply changes to the on-disk index without losing other processes' entries.
+
+        O índice em disco é relido sob a trava, recebe as alterações deste
+        processo e só então é substituído; a cópia em memória passa a ser a mesclada.
+
+        Args:
+            novos (dict, optional): path -> record to add or replace
+            removidos (iterable): SHA-256 of entries deleted from disk
+        """
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        removidos = set(removidos)
+        with _trava_arquivo(self.diretorio / 'indice.lock'):
+            indice = self._ler_indice_disco()
+            indice.update(novos or {})
+            for caminho in [c for c, r in indice.items() if r.get('sha') in removidos]:
+                del indice[caminho]
+            _gravar_atomico(self._arquivo_indice, lambda f: json.dump(indice, f), modo='w')
+        self._indice = indice
+
+    def _chave(self, caminho_pdf):
+        """Return the content hash for the file, reusing the index when path, mtime and size match."""
+        caminho = os.path.abspath(caminho_pdf)
+        info = os.stat(caminho)
+        indice = self._carregar_indice()
+        registro = indice.get(caminho)
+        if registro and registro['mtime'] == info.st_mtime and registro['size'] == info.st_size:
+            return registro['sha']
+        sha = _sha256_arquivo(caminho)
+        self._atualizar_indice({caminho: {'mtime': info.st_mtime, 'size': info.st_size, 'sha': sha}})
+        return sha
+
+    def _arquivo_entrada(self, sha):
+        return self.diretorio / f'{sha}.pkl'
+
+    def obter(self, caminho_pdf):
+        """
+        Look up the extracted rows for a PDF.
+
+        Args:
+            caminho_pdf (str): Path to PDF file
+
+        Returns:
+            list | None: Cached rows, or None on a miss
+        """
+        with self._lock:
+            try:
+                entrada = self._arquivo_entrada(self._chave(caminho_pdf))
+                with open(entrada, 'rb') as f:
+                    conteudo = pickle.load(f)
+                if conteudo.get('versao') != CACHE_VERSAO or conteudo.get('colunas') != COLUNAS:
+                    raise ValueError('entrada de cache desatualizada')
+                # Atualiza o mtime da entrada: é a referência para a ordem LRU
+                os.utime(entrada)
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+                self.falhas += 1
+                logger.info("Cache PDF: falha para %s (acertos=%d, falhas=%d)",
+                            caminho_pdf, self.acertos, self.falhas)
+                return None
+            self.acertos += 1
+            logger.info("Cache PDF: acerto para %s (acertos=%d, falhas=%d)",
+                        caminho_pdf, self.acertos, self.falhas)
+            return conteudo['linhas']
+
+    def salvar(self, caminho_pdf, linhas):
+        """
+        Store the extracted rows for a PDF and evict old entries if needed.
+
+        Args:
+            caminho_pdf (str): Path to PDF file
+            linhas (list): Extracted rows
+        """
+        with self._lock:
+            try:
+                self.diretorio.mkdir(parents=True, exist_ok=True)
+                entrada = self._arquivo_entrada(self._chave(caminho_pdf))
+                conteudo = {'versao': CACHE_VERSAO, 'colunas': COLUNAS, 'linhas': linhas}
+                _gravar_atomico(entrada, lambda f: pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL))
+                self._remover_excedente()
+            except OSError as e:
+                logger.warning("Cache PDF: não foi possível gravar %s: %s", caminho_pdf, e)
+
+    def _remover_excedente(self):
+        """Remove as entradas menos usadas até o cache caber no tamanho máximo."""
+        entradas = []
+        for arquivo in self.diretorio.glob('*.pkl'):
+            try:
+                info = arquivo.stat()
+            except OSError:
+                continue
+            entradas.append((info.st_mtime, info.st_size, arquivo))
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        if total <= self.tamanho_maximo:
+            return
+        removidos = set()
+        for _, tamanho, arquivo in sorted(entradas, key=lambda e: e[0]):
+            if total <= self.tamanho_maximo:
+                break
+            try:
+                arquivo.unlink()
+            except OSError:
+                continue
+            total -= tamanho
+            removidos.add(arquivo.stem)
+        if removidos:
+            self._atualizar_indice(removidos=removidos)
+            logger.info("Cache PDF: %d entrada(s) removida(s) por limite de tamanho", len(removidos))
+
+    def limpar(self):
+        """Remove all cache entries and the index."""
+        with self._lock:
+            for arquivo in list(self.diretorio.glob('*.pkl')) + [self._arquivo_indice]:
+                try:
+                    arquivo.unlink()
+                except OSError:
+                    pass
+            self._indice = {}
+
+_cache_padrao = None
+
+def obter_cache_padrao():
+    """Return the process-wide cache instance."""
+    global _cache_padrao
+    if _cache_padrao is None:
+        _cache_padrao = CachePDF()
+    return _cache_padrao
+
+def extrair_dados_pdf_com_cache(caminho_pdf, workers=None, cache=None):
+    """
+    Extract data from a PDF report, reusing the on-disk cache when possible.
+
+    Args:
+        caminho_pdf (str): Path to PDF file
+        workers (int, optional): Worker processes for extraction on a miss
+        cache (CachePDF, optional): Cache to use. Defaults to the process-wide cache
+
+    Returns:
+        pd.DataFrame: Extracted data in DataFrame format
+
+    Raises:
+        FileNotFoundError: If PDF file not found
+    """
+    if not os.path.exists(caminho_pdf):
+        raise FileNotFoundError(f"Arquivo PDF não encontrado: {caminho_pdf}")
+    cache = cache or obter_cache_padrao()
+    linhas = cache.obter(caminho_pdf)
+    if linhas is not None:
+        contar('cache_pdf_acertos')
+        return pd.DataFrame(linhas, columns=COLUNAS)
+    contar('cache_pdf_falhas')
+    with etapa('pdfplumber'):
+        df = extrair_dados_pdf(caminho_pdf, workers=workers)
+    cache.salvar(caminho_pdf, df.values.tolist())
+    return df
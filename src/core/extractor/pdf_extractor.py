@@ -3,41 +3,111 @@ PDF data extraction module.
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
 import pandas as pd
 
 COLUNAS = [
-    "Início", "Término", "Tempo", "OS", "Cliente", 
-    "Processo", "Evento", "Qtd. Recebida", "Qtd. Produzida", 
+    "Início", "Término", "Tempo", "OS", "Cliente",
+    "Processo", "Evento", "Qtd. Recebida", "Qtd. Produzida",
     "Observações"
 ]
 
-def extrair_dados_pdf(caminho_pdf):
+# Número de processos usados na extração (None = um por núcleo da CPU)
+EXTRACAO_WORKERS = None
+
+# Abaixo deste número de páginas a extração é sempre serial:
+# o custo de subir o pool de processos supera o ganho em arquivos pequenos
+MIN_PAGINAS_PARALELO = 8
+
+def _normalizar_linhas(tabelas):
+    """Filtra linhas vazias e ajusta cada linha ao número de colunas esperado."""
+    linhas = []
+    for tabela in tabelas:
+        for linha in tabela:
+            if linha and any(linha):
+                # Ensure line has correct number of columns
+                linha_corrigida = (linha + [''] * (len(COLUNAS) - len(linha)))[:len(COLUNAS)]
+                linhas.append(linha_corrigida)
+    return linhas
+
+def _extrair_intervalo_paginas(args):
+    """
+    Extract table rows from a range of pages.
+    Runs inside a worker process, so it opens its own handle to the PDF.
+
+    Args:
+        args (tuple): (caminho_pdf, inicio, fim) with the page range [inicio, fim)
+
+    Returns:
+        list: Extracted rows, in page order
+    """
+    caminho_pdf, inicio, fim = args
+    dados = []
+    with pdfplumber.open(caminho_pdf) as pdf:
+        for pagina in pdf.pages[inicio:fim]:
+            dados.extend(_normalizar_linhas(pagina.extract_tables()))
+    return dados
+
+def _dividir_paginas(total_paginas, workers):
+    """Divide as páginas em intervalos contíguos, um ou mais por worker."""
+    tamanho = -(-total_paginas // workers)  # divisão arredondando para cima
+    return [(inicio, min(inicio + tamanho, total_paginas))
+            for inicio in range(0, total_paginas, tamanho)]
+
+def _resolver_workers(workers):
+    """Resolve o número de workers a partir do parâmetro ou da configuração do módulo."""
+    if workers is None:
+        workers = EXTRACAO_WORKERS
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, int(workers))
+
+def extrair_dados_pdf(caminho_pdf, workers=None):
     """
     Extract data from production PDF report.
-    
+
+    Multi-page files are split into contiguous page ranges extracted in
+    parallel by a process pool; rows are reassembled in page order. Small
+    files (fewer than MIN_PAGINAS_PARALELO pages) or workers=1 use the
+    serial path.
+
     Args:
         caminho_pdf (str): Path to PDF file
-        
+        workers (int, optional): Number of worker processes. Defaults to
+            EXTRACAO_WORKERS (one per CPU core when None)
+
     Returns:
         pd.DataFrame: Extracted data in DataFrame format
-        
+
     Raises:
         FileNotFoundError: If PDF file not found
     """
-    dados = []
     if not os.path.exists(caminho_pdf):
         raise FileNotFoundError(f"Arquivo PDF não encontrado: {caminho_pdf}")
 
+    workers = _resolver_workers(workers)
     with pdfplumber.open(caminho_pdf) as pdf:
-        for pagina in pdf.pages:
-            tabelas = pagina.extract_tables()
-            for tabela in tabelas:
-                for linha in tabela:
-                    if linha and any(linha):
-                        # Ensure line has correct number of columns
-                        linha_corrigida = (linha + [''] * (len(COLUNAS) - len(linha)))[:len(COLUNAS)]
-                        dados.append(linha_corrigida)
+        total_paginas = len(pdf.pages)
+        if workers <= 1 or total_paginas < MIN_PAGINAS_PARALELO:
+            dados = []
+            for pagina in pdf.pages:
+                dados.extend(_normalizar_linhas(pagina.extract_tables()))
+        else:
+            dados = None
+
+    if dados is None:
+        intervalos = _dividir_paginas(total_paginas, min(workers, total_paginas))
+        tarefas = [(caminho_pdf, inicio, fim) for inicio, fim in intervalos]
+        dados = []
+        try:
+            with ProcessPoolExecutor(max_workers=len(tarefas)) as executor:
+                # map preserva a ordem dos intervalos, mantendo a ordem das páginas
+                for linhas in executor.map(_extrair_intervalo_paginas, tarefas):
+                    dados.extend(linhas)
+        except (OSError, RuntimeError):
+            # Ambientes sem suporte a multiprocessing: volta para o modo serial
+            dados = _extrair_intervalo_paginas((caminho_pdf, 0, total_paginas))
 
     if not dados:
         raise ValueError(f"Nenhum dado encontrado no arquivo: {caminho_pdf}")
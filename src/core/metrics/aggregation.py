@@ -0,0 +1,263 @@
+"""
+Period aggregation module.
+Agrega os resumos de cada par (dia, máquina) em totais de semana, mês ou
+período, distribuições de eficiência e acumulados por OP entre dias.
+
+Summaries are consumed one at a time (AgregadorPeriodo.adicionar) and only
+running totals are kept, so a month of PDFs never has to be in memory at once.
+"""
+
+from datetime import datetime
+
+# Faixas de eficiência, as mesmas de get_efficiency_classification
+FAIXAS_EFICIENCIA = (
+    (95, 'EXCELENTE'),
+    (85, 'ÓTIMO'),
+    (75, 'BOM'),
+    (65, 'REGULAR'),
+    (None, 'INSATISFATÓRIO'),
+)
+
+AGRUPAMENTOS = ('dia', 'semana', 'mes', 'periodo')
+
+def chave_periodo(data, agrupamento):
+    """
+    Period key of a date.
+
+    Args:
+        data (str): Date in format DD/MM/YYYY
+        agrupamento (str): 'dia', 'semana' (ISO week), 'mes' or 'periodo'
+
+    Returns:
+        str: 'YYYY-MM-DD', 'YYYY-Www', 'YYYY-MM' or 'total'
+    """
+    dt = datetime.strptime(data, '%d/%m/%Y')
+    if agrupamento == 'dia':
+        return dt.strftime('%Y-%m-%d')
+    if agrupamento == 'semana':
+        ano, semana, _ = dt.isocalendar()
+        return f"{ano}-W{semana:02d}"
+    if agrupamento == 'mes':
+        return dt.strftime('%Y-%m')
+    if agrupamento == 'periodo':
+        return 'total'
+    raise ValueError(f"Agrupamento inválido: {agrupamento} (use {', '.join(AGRUPAMENTOS)})")
+
+def faixa_eficiencia(eficiencia):
+    """Nome da faixa de eficiência (ver FAIXAS_EFICIENCIA)."""
+    for limite, nome in FAIXAS_EFICIENCIA:
+        if limite is None or eficiencia >= limite:
+            return nome
+
+class Distribuicao:
+    """Running count, mean, min, max and band histogram of efficiency values."""
+
+    def __init__(self):
+        self.n = 0
+        self.soma = 0.0
+        self.minimo = None
+        self.maximo = None
+        self.faixas = {nome: 0 for _, nome in FAIXAS_EFICIENCIA}
+
+    def adicionar(self, valor):
+        self.n += 1
+        self.soma += valor
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+        self.faixas[faixa_eficiencia(valor)] += 1
+
+    def media(self):
+        return self.soma / self.n if self.n else 0.0
+
+    def como_dict(self):
+        return {'n': self.n, 'media': self.media(), 'minimo': self.minimo, 'maximo': self.maximo,
+                'faixas': dict(self.faixas)}
+
+class Totais:
+    """Summed times and quantities of one (period, machine) cell."""
+
+    CAMPOS = ('tempo_disponivel', 'tempo_total_producao', 'tempo_total_acerto', 'qtd_total_produzida',
+              'tempo_total_ganho', 'tempo_ocioso')
+
+    def __init__(self):
+        self.dias = 0
+        for campo in self.CAMPOS:
+            setattr(self, campo, 0.0)
+        self.eficiencia_producao = Distribuicao()
+        self.eficiencia_acerto = Distribuicao()
+
+    def adicionar(self, resumo):
+        self.dias += 1
+        metricas = resumo['metricas']
+        self.tempo_disponivel += resumo['tempo_disponivel']
+        for campo in self.CAMPOS[1:]:
+            setattr(self, campo, getattr(self, campo) + metricas.get(campo, 0))
+        for dados_op in resumo['ops'].values():
+            eficiencia = eficiencia_producao_op(dados_op)
+            if eficiencia is not None:
+                self.eficiencia_producao.adicionar(eficiencia)
+            eficiencia = eficiencia_acerto_op(dados_op)
+            if eficiencia is not None:
+                self.eficiencia_acerto.adicionar(eficiencia)
+
+    def eficiencia_tempo_geral(self):
+        """(produção + acerto + ganho) / disponível, sobre o período somado."""
+        if self.tempo_disponivel <= 0:
+            return 0.0
+        return (self.tempo_total_producao + self.tempo_total_acerto + self.tempo_total_ganho) / self.tempo_disponivel * 100
+
+    def como_dict(self):
+        dados = {'dias': self.dias}
+        dados.update((campo, getattr(self, campo)) for campo in self.CAMPOS)
+        dados['eficiencia_tempo_geral'] = self.eficiencia_tempo_geral()
+        dados['eficiencia_producao'] = self.eficiencia_producao.como_dict()
+        dados['eficiencia_acerto'] = self.eficiencia_acerto.como_dict()
+        return dados
+
+def eficiencia_producao_op(dados_op):
+    """Eficiência de produção de uma OP, com o mesmo critério do resumo diário (None se não se aplica)."""
+    if dados_op['tem_producao'] and dados_op['tempo_producao'] > 0 and dados_op['tempo_programado_producao'] > 0:
+        return dados_op['tempo_programado_producao'] / dados_op['tempo_producao'] * 100
+    return None
+
+def eficiencia_acerto_op(dados_op):
+    """Eficiência de acerto de uma OP, com o mesmo critério do resumo diário (None se não se aplica)."""
+    if (dados_op['tem_producao'] and dados_op['tem_acerto'] and dados_op['tempo_setup'] > 0
+            and dados_op['tempo_setup_programado'] > 0):
+        return dados_op['tempo_setup_programado'] / dados_op['tempo_setup'] * 100
+    return None
+
+class AgregadorPeriodo:
+    """
+    Streaming aggregation of per-(day, machine) summaries.
+
+    Args:
+        agrupamento (str): 'dia', 'semana', 'mes' or 'periodo' (see chave_periodo)
+    """
+
+    def __init__(self, agrupamento='semana'):
+        chave_periodo('01/01/2000', agrupamento)  # valida
+        self.agrupamento = agrupamento
+        self.celulas = {}
+        self.total = Totais()
+        self.eficiencia_dia = Distribuicao()
+        self.ops = {}
+        self.falhas = []
+
+    def adicionar(self, data, maquina, resumo):
+        """
+        Add the summary of one (day, machine) analysis.
+
+        Args:
+            data (str): Date in format DD/MM/YYYY
+            maquina (str): Machine name
+            resumo (dict): Output of analise.resumir_desempenho
+        """
+        chave = (chave_periodo(data, self.agrupamento), maquina)
+        self.celulas.setdefault(chave, Totais()).adicionar(resumo)
+        self.total.adicionar(resumo)
+        if resumo['tempo_disponivel'] > 0:
+            self.eficiencia_dia.adicionar(resumo['metricas'].get('eficiencia_tempo_geral', 0.0))
+        for os_op, dados_op in resumo['ops'].items():
+            self._acumular_op(os_op, data, maquina, dados_op)
+
+    def registrar_falha(self, data, maquina, erro):
+        """Guarda um par que não pôde ser analisado."""
+        self.falhas.append((data, maquina, str(erro)))
+
+    def _acumular_op(self, os_op, data, maquina, dados_op):
+        op = self.ops.get(os_op)
+        if op is None:
+            op = self.ops[os_op] = {
+                'cliente': dados_op['cliente'], 'processo': dados_op['processo'],
+                'dias': set(), 'maquinas': set(),
+                'tempo_producao': 0.0, 'tempo_setup': 0.0, 'tempo_setup_programado': 0.0,
+                'tempo_programado_producao': 0.0, 'qtd_produzida': 0.0,
+                'ganho_producao': 0.0, 'ganho_setup': 0.0,
+            }
+        op['dias'].add(data)
+        op['maquinas'].add(maquina)
+        for campo in ('tempo_producao', 'tempo_setup', 'tempo_setup_programado', 'tempo_programado_producao',
+                      'qtd_produzida', 'ganho_producao', 'ganho_setup'):
+            op[campo] += dados_op[campo]
+
+    def resultado(self):
+        """
+        Aggregated result as plain data (JSON-serializable).
+
+        Returns:
+            dict: 'agrupamento', 'periodos' ({periodo: {maquina: totais}}), 'total',
+                'eficiencia_dia', 'ops' and 'falhas'
+        """
+        periodos = {}
+        for (periodo, maquina), totais in sorted(self.celulas.items()):
+            periodos.setdefault(periodo, {})[maquina] = totais.como_dict()
+        ops = {}
+        for os_op, op in sorted(self.ops.items()):
+            dados = dict(op)
+            dados['dias'] = sorted(op['dias'], key=lambda d: (d[6:], d[3:5], d[:2]))
+            dados['maquinas'] = sorted(op['maquinas'])
+            ops[os_op] = dados
+        return {
+            'agrupamento': self.agrupamento,
+            'periodos': periodos,
+            'total': self.total.como_dict(),
+            'eficiencia_dia': self.eficiencia_dia.como_dict(),
+            'ops': ops,
+            'falhas': list(self.falhas),
+        }
+
+    def gerar_texto(self, max_ops=20):
+        """
+        Format the aggregated result as a text report.
+
+        Args:
+            max_ops (int): OPs listed in the cross-day rollup (largest production time first)
+
+        Returns:
+            str: Report
+        """
+        res = self.resultado()
+        texto = f"📊 RELATÓRIO CONSOLIDADO ({self.agrupamento.upper()})\n"
+        texto += "=" * 80 + "\n\n"
+        for periodo, maquinas in res['periodos'].items():
+            texto += f"📅 {periodo}\n" + "─" * 80 + "\n"
+            texto += f"{'Máquina':<14}{'Dias':>5}{'Produção':>11}{'Acerto':>9}{'Ocioso':>9}{'Qtd':>13}{'Ef.Geral':>10}{'Ef.Prod':>9}\n"
+            for maquina, t in maquinas.items():
+                texto += (f"{maquina:<14}{t['dias']:>5}{t['tempo_total_producao']:>9.0f}m{t['tempo_total_acerto']:>7.0f}m"
+                          f"{t['tempo_ocioso']:>7.0f}m{t['qtd_total_produzida']:>13,.0f}"
+                          f"{t['eficiencia_tempo_geral']:>9.1f}%{t['eficiencia_producao']['media']:>8.1f}%\n")
+            texto += "\n"
+        t = res['total']
+        texto += "📈 TOTAL DO PERÍODO\n" + "─" * 80 + "\n"
+        texto += f"Análises (dia × máquina): {t['dias']}\n"
+        texto += f"Tempo Total Produção:     {t['tempo_total_producao']:>8.0f} min ({t['tempo_total_producao'] / 60:.1f}h)\n"
+        texto += f"Tempo Total de Acerto:    {t['tempo_total_acerto']:>8.0f} min ({t['tempo_total_acerto'] / 60:.1f}h)\n"
+        texto += f"Tempo Ocioso:             {t['tempo_ocioso']:>8.0f} min ({t['tempo_ocioso'] / 60:.1f}h)\n"
+        texto += f"Quantidade Produzida:     {t['qtd_total_produzida']:>12,.0f} unidades\n"
+        texto += f"Eficiência de Tempo Geral: {t['eficiencia_tempo_geral']:.2f}%\n\n"
+        for titulo, dist in (("Eficiência de tempo geral por dia × máquina", res['eficiencia_dia']),
+                             ("Eficiência de produção por OP", t['eficiencia_producao']),
+                             ("Eficiência de acerto por OP", t['eficiencia_acerto'])):
+            texto += f"📊 {titulo}\n"
+            if not dist['n']:
+                texto += "   (sem dados)\n\n"
+                continue
+            texto += f"   n={dist['n']}  média={dist['media']:.1f}%  mín={dist['minimo']:.1f}%  máx={dist['maximo']:.1f}%\n"
+            for _, nome in FAIXAS_EFICIENCIA:
+                qtd = dist['faixas'][nome]
+                texto += f"   {nome:<15}{qtd:>5}  {'█' * round(qtd / dist['n'] * 30)}\n"
+            texto += "\n"
+        if res['ops']:
+            texto += f"📋 OPs ENTRE DIAS (maiores {min(max_ops, len(res['ops']))} por tempo de produção)\n" + "─" * 80 + "\n"
+            maiores = sorted(res['ops'].items(), key=lambda item: -item[1]['tempo_producao'])[:max_ops]
+            for os_op, op in maiores:
+                texto += (f"OP {os_op:<10}{len(op['dias']):>3} dia(s)  {', '.join(op['maquinas']):<20}"
+                          f"prod {op['tempo_producao']:>6.0f}m  acerto {op['tempo_setup']:>5.0f}m  "
+                          f"qtd {op['qtd_produzida']:>10,.0f}  ganho {op['ganho_producao'] + op['ganho_setup']:>+7.0f}m\n")
+            texto += "\n"
+        if res['falhas']:
+            texto += "❌ FALHAS\n" + "─" * 80 + "\n"
+            for data, maquina, erro in res['falhas']:
+                texto += f"{data} {maquina}: {erro}\n"
+        return texto
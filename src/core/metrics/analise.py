@@ -0,0 +1,156 @@
+"""
+Standard performance analysis pipeline.
+Fluxo comum das máquinas: aplica as regras da máquina, monta o frame tipado
+uma única vez e o compartilha entre o agrupamento e as seções do relatório.
+"""
+
+from src.utils.timers import etapa, contar
+
+def calcular_desempenho_padrao(df_global, config, preencher=None):
+    """
+    Run the standard analysis used by the machine modules.
+
+    Args:
+        df_global (pd.DataFrame): Production data loaded from the PDF
+        config (dict): hora_inicio, hora_fim, intervalo and linhas_agrupadas
+        preencher (callable, optional): Machine rule fill (preencher_campos_X), applied to a copy
+
+    Returns:
+        str: Formatted report, or an error message when the shift hours are missing
+    """
+    config_relatorio = _config_relatorio(config)
+    if config_relatorio is None:
+        return "❌ ERRO: Preencha os horários de início e fim."
+    from src.core.metrics.report.generator import ReportGenerator
+    df, tipado, grupos_para_analise, ops_analise = _preparar_analise(df_global, config, preencher)
+    generator = ReportGenerator()
+    with etapa('relatorio'):
+        return generator.generate_report(
+            {'grupos': grupos_para_analise, 'ops': ops_analise, 'df': df, 'tipado': tipado},
+            config_relatorio)
+
+def modelo_desempenho_padrao(df_global, config, preencher=None):
+    """
+    Run the standard analysis and return the structured report, without formatting text.
+
+    Args:
+        df_global (pd.DataFrame): Production data loaded from the PDF
+        config (dict): hora_inicio, hora_fim, intervalo and linhas_agrupadas
+        preencher (callable, optional): Machine rule fill, applied to a copy
+
+    Returns:
+        RelatorioDesempenho: Metrics and per-OP records (see report.renderers)
+
+    Raises:
+        ValueError: If the shift hours are missing
+    """
+    config_relatorio = _config_relatorio(config)
+    if config_relatorio is None:
+        raise ValueError("Preencha os horários de início e fim.")
+    from src.core.metrics.report.generator import ReportGenerator
+    df, tipado, grupos_para_analise, ops_analise = _preparar_analise(df_global, config, preencher)
+    with etapa('relatorio'):
+        return ReportGenerator().gerar_modelo(
+            {'grupos': grupos_para_analise, 'ops': ops_analise, 'df': df, 'tipado': tipado},
+            config_relatorio)
+
+def _config_relatorio(config):
+    """
+    hora_inicio, hora_fim e intervalo (int) do relatório; None sem os horários.
+    Com config['turnos'] (shift_calendar.aplicar_calendario) os três vêm do mapa
+    do dia, que segue junto em 'turnos' para o tempo disponível e a linha do tempo.
+    """
+    turnos = config.get('turnos')
+    if turnos is not None:
+        return {'hora_inicio': turnos.hora_inicio, 'hora_fim': turnos.hora_fim,
+                'intervalo': turnos.intervalo, 'turnos': turnos}
+    hora_inicio = config.get('hora_inicio')
+    hora_fim = config.get('hora_fim')
+    if not hora_inicio or not hora_fim:
+        return None
+    intervalo_str = config.get('intervalo', '60')
+    intervalo = int(intervalo_str) if intervalo_str else 60
+    return {'hora_inicio': hora_inicio, 'hora_fim': hora_fim, 'intervalo': intervalo}
+
+def _preparar_analise(df_global, config, preencher):
+    """Aplica as regras numa cópia, monta o frame tipado e agrupa as OPs."""
+    from src.core.data.data_processor import processar_grupos
+    from src.core.data.typed_frame import construir_frame_tipado
+    df = df_global.copy()
+    if preencher is not None:
+        with etapa('regras_maquina'):
+            df = preencher(df)
+    # As regras alteram Tempo Setup/Média Produção, então o frame tipado vem depois delas
+    with etapa('frame_tipado'):
+        tipado = construir_frame_tipado(df)
+    with etapa('processar_grupos'):
+        grupos_para_analise, ops_analise = processar_grupos(df, config.get('linhas_agrupadas', {}), tipado)
+    contar('linhas_analisadas', len(df))
+    contar('ops', len(ops_analise))
+    return df, tipado, grupos_para_analise, ops_analise
+
+def resumir_desempenho(df_global, config, preencher=None):
+    """
+    Run the standard analysis and return a compact summary instead of text.
+    Usado pela agregação de períodos: o resumo não guarda o DataFrame.
+
+    Args:
+        df_global (pd.DataFrame): Production data loaded from the PDF
+        config (dict): hora_inicio, hora_fim, intervalo and linhas_agrupadas
+        preencher (callable, optional): Machine rule fill, applied to a copy
+
+    Returns:
+        dict: 'tempo_disponivel', 'metricas' (as in the report summary) and 'ops'
+            ({os: totals of the OP})
+
+    Raises:
+        ValueError: If the shift hours are missing
+    """
+    config_relatorio = _config_relatorio(config)
+    if config_relatorio is None:
+        raise ValueError("Preencha os horários de início e fim.")
+    from src.core.metrics.report.sections import efficiency, period
+    df, tipado, grupos_para_analise, ops_analise = _preparar_analise(df_global, config, preencher)
+    tempo_disponivel = period.tempo_disponivel(config_relatorio)
+    consolidados = efficiency.consolidar_ops(ops_analise, df, tipado)
+    metricas = efficiency.calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel,
+                                                    df, consolidados)
+    return {'tempo_disponivel': tempo_disponivel, 'metricas': dict(metricas), 'ops': _resumo_ops(consolidados.values())}
+
+def resumo_do_modelo(relatorio):
+    """
+    Compact summary of an already computed report, without analyzing again.
+
+    Args:
+        relatorio (RelatorioDesempenho): Output of modelo_desempenho_padrao
+
+    Returns:
+        dict: Same shape as resumir_desempenho
+    """
+    return {'tempo_disponivel': relatorio.tempo_disponivel, 'metricas': dict(relatorio.metricas),
+            'ops': _resumo_ops(relatorio.ops)}
+
+def _resumo_ops(registros):
+    """{os: totais} a partir dos consolidados de consolidar_ops ou dos registros do modelo (mesmos campos)."""
+    ops = {}
+    for dados_op in registros:
+        chave = str(dados_op.get('os') or '').strip()
+        if not chave:
+            continue
+        ops[chave] = {
+            'cliente': dados_op.get('cliente', ''),
+            'processo': dados_op.get('processo', ''),
+            'tempo_producao': float(dados_op['tempo_total_producao']),
+            'tempo_setup': float(dados_op['tempo_setup']),
+            'tempo_setup_programado': float(dados_op['tempo_setup_programado']),
+            'tempo_programado_producao': float(dados_op['tempo_programado_producao']),
+            'qtd_produzida': float(dados_op['qtd_produzida']),
+            'ganho_producao': float(dados_op['ganho_producao']),
+            'ganho_setup': float(dados_op['ganho_setup']),
+            'velocidade_real': float(dados_op['velocidade_real']),
+            'velocidade_nominal': float(dados_op['velocidade_nominal']),
+            'tem_producao': bool(dados_op['tem_producao']),
+            'tem_acerto': bool(dados_op['tem_acerto']),
+            'acerto_sem_producao': bool(dados_op['acerto_sem_producao']),
+        }
+    return ops
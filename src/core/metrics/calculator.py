@@ -4,26 +4,46 @@ Performance analysis and calculation module.
 
 import tkinter as tk
 from ..config.setup_config import TEMPOS_SETUP
-import importlib
-from src.interface.handlers.data_handler import MACHINE_ALIASES
+from src.core.metrics.maquinas.registro import MACHINES_MAP, obter_maquina, nomes_disponiveis
+from src.utils.logger import get_logger
+from src.utils.timers import etapa
 
-MACHINES_MAP = {
-    'komori': 'komori',
-    'hcd': 'hcd',
-    'sbl': 'sbl',
-    'furnax': 'furnax',
-    'c/v manual': 'cv_manual',
-    'cv manual': 'cv_manual',
-    'samkoon': 'samkoon',
-    'laminadora': 'laminadora',
-    'sakurai': 'sakurai',
-    'verniz uv sakurai': 'sakurai',
-    'verniz.uv sakurai': 'sakurai',
-    'verniz sakurai': 'sakurai',
-    'uv sakurai': 'sakurai',
-    'bobst': 'bobst',
-    'cv_guangya': 'cv_guangya',
-}
+logger = get_logger(__name__)
+
+def gerar_texto_desempenho(df_global, config):
+    """
+    Run the machine-specific analysis and return the text to display.
+    Não acessa widgets, então pode rodar fora da thread do Tk.
+
+    Args:
+        df_global (pd.DataFrame): Production data
+        config (dict): Analysis configuration (includes 'maquina')
+
+    Returns:
+        str: Report, or an error message starting with '❌ ERRO'
+    """
+    if df_global is None or df_global.empty:
+        return "❌ ERRO: Nenhum dado carregado para calcular o desempenho."
+
+    try:
+        maquina = config.get('maquina', '').strip().lower()
+        registro = obter_maquina(maquina)
+        try:
+            calcular = registro.calcular_desempenho if registro else None
+        except ModuleNotFoundError:
+            calcular = None
+        if calcular is None:
+            return f"❌ ERRO: Máquina '{maquina}' não encontrada ou não implementada.\nMáquinas disponíveis: {nomes_disponiveis()}"
+        with etapa(f'calcular_desempenho ({registro.nome})'):
+            return calcular(df_global, config)
+    except Exception as e:
+        logger.exception("Erro ao calcular desempenho")
+        return f"❌ ERRO ao calcular desempenho: {str(e)}"
+
+def exibir_resultado(text_resultado, texto):
+    """Substitui o conteúdo do widget de resultado."""
+    text_resultado.delete("1.0", tk.END)
+    text_resultado.insert(tk.END, texto)
 
 def calcular_desempenho(df_global, text_resultado, config):
     """
@@ -37,41 +57,4 @@ def calcular_desempenho(df_global, text_resultado, config):
     Returns:
         None: Results are displayed in text_resultado widget
     """
-    import importlib
-    import sys
-    if df_global is None or df_global.empty:
-        text_resultado.delete("1.0", tk.END)
-        text_resultado.insert(tk.END, "❌ ERRO: Nenhum dado carregado para calcular o desempenho.")
-        return
-
-    try:
-        maquina = config.get('maquina', '').strip().lower()
-        maquina_padrao = MACHINE_ALIASES.get(maquina, maquina)
-        modulo = None
-        for key, modname in MACHINES_MAP.items():
-            if key == maquina_padrao:
-                modulo = modname
-                break
-        if modulo:
-            try:
-                mod = importlib.import_module(f"src.core.metrics.maquinas.{modulo}")
-            except ModuleNotFoundError:
-                maquinas_disp = ', '.join(sorted(set(MACHINES_MAP.keys())))
-                text_resultado.delete("1.0", tk.END)
-                text_resultado.insert(tk.END, f"❌ ERRO: Máquina '{maquina}' não encontrada ou não implementada.\nMáquinas disponíveis: {maquinas_disp}")
-                return
-            resultado = mod.calcular_desempenho(df_global, config)
-        else:
-            maquinas_disp = ', '.join(sorted(set(MACHINES_MAP.keys())))
-            text_resultado.delete("1.0", tk.END)
-            text_resultado.insert(tk.END, f"❌ ERRO: Máquina '{maquina}' não encontrada ou não implementada.\nMáquinas disponíveis: {maquinas_disp}")
-            return
-        # Exibe resultado
-        text_resultado.delete("1.0", tk.END)
-        text_resultado.insert(tk.END, resultado)
-
-    except Exception as e:
-        text_resultado.delete("1.0", tk.END)
-        text_resultado.insert(tk.END, f"❌ ERRO ao calcular desempenho: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    exibir_resultado(text_resultado, gerar_texto_desempenho(df_global, config))
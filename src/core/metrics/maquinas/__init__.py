@@ -1,11 +1,25 @@
 # Módulo de lógica específica para cada máquina
-from . import komori
-from . import bobst
-from . import cv_manual
-from . import furnax
-from . import hcd
-from . import heidelberg
-from . import laminadora
-from . import samkoon
-from . import sbl
-# from . import verniz_uv_sakurai  # Arquivo deletado
+# Os módulos são importados sob demanda (PEP 562): `from . import komori` ou
+# `maquinas.komori` carregam só a máquina usada.
+import importlib
+
+MODULOS_MAQUINAS = (
+    'komori',
+    'bobst',
+    'cv_manual',
+    'cv_guangya',
+    'furnax',
+    'hcd',
+    'heidelberg',
+    'laminadora',
+    'sakurai',
+    'samkoon',
+    'sbl',
+)
+
+__all__ = list(MODULOS_MAQUINAS)
+
+def __getattr__(name):
+    if name in MODULOS_MAQUINAS:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,47 +2,33 @@
 Lógica de análise e setup para máquina Bobst
 """
 
-from src.core.metrics.utils import preencher_campos_generico
+from src.core.metrics.utils import preencher_campos_generico, compilar_regras, coluna_ou_vazia, mapear_valores
 
 def _media_bobst(proc, evt):
     if 'p/h' in proc:
         return proc.split('p/h')[0].strip() + ' p/h'
     return '4000 p/h'
 
+REGRAS_SETUP = compilar_regras([
+    {'processo': ['colagem', 'bandeja'], 'valor': '02:10'},
+    {'processo': ['colagem', 'lateral'], 'valor': '02:10'},
+    {'processo': 'fundo automático', 'valor': '02:10'},
+    {'valor': '03:00'},
+])
+
+REGRAS_MEDIA = compilar_regras([
+    {'evento': 'produção', 'valor': '4000 p/h'},
+])
+
 def preencher_campos_bobst(df):
-    regras_setup = [
-        (lambda proc, evt: 'colagem' in proc and 'bandeja' in proc, '02:10'),
-        (lambda proc, evt: 'colagem' in proc and 'lateral' in proc, '02:10'),
-        (lambda proc, evt: 'fundo automático' in proc, '02:10'),
-        (lambda proc, evt: True, '03:00'),
-    ]
-    regras_media = [
-        (lambda proc, evt: 'produção' in evt, '4000 p/h'),
-    ]
-    return preencher_campos_generico(df, regras_setup, regras_media)
+    return preencher_campos_generico(df, REGRAS_SETUP, REGRAS_MEDIA)
 
 def calcular_desempenho(df_global, config):
     """
     Lógica de desempenho padrão para Bobst, usando o pipeline de análise geral.
     """
-    hora_inicio = config.get('hora_inicio')
-    hora_fim = config.get('hora_fim')
-    intervalo_str = config.get('intervalo', '60')
-    if not hora_inicio or not hora_fim:
-        return "❌ ERRO: Preencha os horários de início e fim."
-    intervalo = int(intervalo_str) if intervalo_str else 60
-    from src.core.data.data_processor import processar_grupos
-    from src.core.metrics.report.generator import ReportGenerator
-    df = df_global.copy()
-    df = preencher_campos_bobst(df)
-    grupos_para_analise, ops_analise = processar_grupos(df, config.get('linhas_agrupadas', {}))
-    generator = ReportGenerator()
-    resultado = generator.generate_report({'grupos': grupos_para_analise, 'ops': ops_analise, 'df': df}, {
-        'hora_inicio': hora_inicio,
-        'hora_fim': hora_fim,
-        'intervalo': intervalo
-    })
-    return resultado
+    from src.core.metrics.analise import calcular_desempenho_padrao
+    return calcular_desempenho_padrao(df_global, config, preencher_campos_bobst)
 
 def get_tempos_setup():
     # Pode retornar tempos de setup específicos da Bobst
@@ -60,20 +46,30 @@ from core.config.setup_config import get_setup_time
 
 def extrair_tempo_setup(linha):
     # Para Bobst, usar configuração global conforme o tipo de processo
-    processo = linha.get('Processo', '').lower()
-    # Tenta identificar o tipo de processo e retorna o tempo pré-determinado
-    tempo_min = get_setup_time(processo)
-    # Retorna no formato 'HH:MM'
-    horas = tempo_min // 60
-    minutos = tempo_min % 60
-    return f'{horas:02d}:{minutos:02d}'
+    return _tempo_setup_de(linha.get('Processo', ''))
 
 def extrair_media_producao(linha):
-    media = linha.get('Média Produção', '').strip()
+    return _media_de(linha.get('Média Produção', ''), linha.get('Processo', ''))
+
+def _media_de(media, processo):
+    media = media.strip()
     if not media:
         # Fallback: extrair do campo Processo
-        processo = linha.get('Processo', '')
         if 'p/h' in processo:
             return processo.split('p/h')[0].strip() + ' p/h'
         return ''
     return media
+
+def _tempo_setup_de(processo):
+    # Tempo pré-determinado pelo tipo de processo, no formato 'HH:MM'
+    tempo_min = get_setup_time(processo.lower())
+    return f'{tempo_min // 60:02d}:{tempo_min % 60:02d}'
+
+def extrair_tempos_setup(df):
+    """Versão em lote de extrair_tempo_setup: uma chamada por processo distinto."""
+    return mapear_valores(coluna_ou_vazia(df, 'Processo'), func=_tempo_setup_de)
+
+def extrair_medias_producao(df):
+    """Versão em lote de extrair_media_producao."""
+    return mapear_valores(coluna_ou_vazia(df, 'Média Produção'), coluna_ou_vazia(df, 'Processo'),
+                          func=_media_de)
@@ -0,0 +1,190 @@
+"""
+Machine registry.
+Registro único das máquinas: nome, módulo de análise, aliases digitados pelo
+usuário e nomes aceitos na análise. Os módulos só são importados no primeiro
+uso e as funções resolvidas ficam em cache, então o despacho por linha é uma
+consulta a dicionário.
+
+MACHINE_ALIASES and MACHINES_MAP are derived from the registry and kept for
+the modules that still import them.
+"""
+
+import importlib
+from functools import lru_cache
+
+class Maquina:
+    """
+    Registry entry for one machine.
+
+    Args:
+        nome (str): Internal name (used in the 'Máquina' column and in PDF paths)
+        modulo (str): Module in src.core.metrics.maquinas
+        aliases (tuple): What the user may type, in matching order (includes nome)
+        nomes (tuple): Names that select this machine's analysis
+        extrai_da_linha (bool): Whether setup time and production average are
+            read from each 'acerto'/production row at load time
+        regras_na_analise (bool): Whether the analysis applies preencher_campos again
+            before grouping (as the module's calcular_desempenho does)
+    """
+
+    def __init__(self, nome, modulo, aliases=(), nomes=(), extrai_da_linha=False, regras_na_analise=True):
+        self.nome = nome
+        self.modulo = modulo
+        self.aliases = tuple(aliases) or (nome,)
+        self.nomes = tuple(nomes) or (nome,)
+        self.extrai_da_linha = extrai_da_linha
+        self.regras_na_analise = regras_na_analise
+        self._funcoes = {}
+
+    def __repr__(self):
+        return f"Maquina({self.nome!r}, {self.modulo!r})"
+
+    def carregar(self):
+        """Importa (uma vez) o módulo da máquina."""
+        return importlib.import_module(f"src.core.metrics.maquinas.{self.modulo}")
+
+    def funcao(self, nome):
+        """Função do módulo da máquina (None se não existir), resolvida uma vez."""
+        try:
+            return self._funcoes[nome]
+        except KeyError:
+            self._funcoes[nome] = getattr(self.carregar(), nome, None)
+            return self._funcoes[nome]
+
+    @property
+    def calcular_desempenho(self):
+        return self.funcao('calcular_desempenho')
+
+    @property
+    def preencher_campos(self):
+        return self.funcao(f"preencher_campos_{self.modulo}")
+
+    def resumir_desempenho(self, df, config):
+        """Resumo compacto da análise (ver analise.resumir_desempenho)."""
+        from src.core.metrics.analise import resumir_desempenho
+        return resumir_desempenho(df, config, self.preencher_campos if self.regras_na_analise else None)
+
+    def modelo_desempenho(self, df, config):
+        """Relatório estruturado da análise, sem texto (ver analise.modelo_desempenho_padrao)."""
+        from src.core.metrics.analise import modelo_desempenho_padrao
+        return modelo_desempenho_padrao(df, config, self.preencher_campos if self.regras_na_analise else None)
+
+    @property
+    def extrair_tempo_setup(self):
+        return self.funcao('extrair_tempo_setup') if self.extrai_da_linha else None
+
+    @property
+    def extrair_media_producao(self):
+        return self.funcao('extrair_media_producao') if self.extrai_da_linha else None
+
+    @property
+    def extrair_tempos_setup(self):
+        """Versão em lote (DataFrame -> Series) de extrair_tempo_setup."""
+        return self.funcao('extrair_tempos_setup') if self.extrai_da_linha else None
+
+    @property
+    def extrair_medias_producao(self):
+        """Versão em lote (DataFrame -> Series) de extrair_media_producao."""
+        return self.funcao('extrair_medias_producao') if self.extrai_da_linha else None
+
+_MAQUINAS = []
+_POR_NOME = {}
+
+def registrar_maquina(nome, modulo, aliases=(), nomes=(), extrai_da_linha=False, regras_na_analise=True):
+    """
+    Register a machine (the module is not imported).
+
+    Returns:
+        Maquina: The registry entry
+    """
+    maquina = Maquina(nome, modulo, aliases, nomes, extrai_da_linha, regras_na_analise)
+    _MAQUINAS.append(maquina)
+    for chave in maquina.nomes:
+        _POR_NOME[chave] = maquina
+    MACHINE_ALIASES.update((alias, nome) for alias in maquina.aliases)
+    MACHINES_MAP.update((chave, modulo) for chave in maquina.nomes)
+    resolver_alias.cache_clear()
+    obter_maquina.cache_clear()
+    maquina_da_coluna.cache_clear()
+    return maquina
+
+def listar_maquinas():
+    """Máquinas registradas, na ordem de registro."""
+    return list(_MAQUINAS)
+
+def nomes_disponiveis():
+    """Texto com os nomes aceitos na análise, para mensagens de erro."""
+    return ', '.join(sorted(_POR_NOME))
+
+@lru_cache(maxsize=None)
+def resolver_alias(valor):
+    """
+    Resolve what the user typed to the internal machine name.
+    Exato, depois prefixo, depois substring; sem correspondência devolve o valor.
+
+    Args:
+        valor (str): Typed value
+
+    Returns:
+        str: Internal name (or the normalized value itself)
+    """
+    valor = str(valor).strip().lower()
+    if valor in MACHINE_ALIASES:
+        return MACHINE_ALIASES[valor]
+    # Matching por prefixo
+    for alias in MACHINE_ALIASES:
+        if alias.startswith(valor):
+            return MACHINE_ALIASES[alias]
+    # Matching por substring (fuzzy leve)
+    for alias in MACHINE_ALIASES:
+        if valor in alias:
+            return MACHINE_ALIASES[alias]
+    return valor
+
+@lru_cache(maxsize=None)
+def obter_maquina(valor):
+    """
+    Machine whose analysis handles a name or exact alias.
+
+    Args:
+        valor (str): Machine name or alias
+
+    Returns:
+        Maquina: Registry entry, or None if there is no analysis for it
+    """
+    chave = str(valor).strip().lower()
+    return _POR_NOME.get(MACHINE_ALIASES.get(chave, chave))
+
+@lru_cache(maxsize=None)
+def maquina_da_coluna(valor):
+    """
+    Machine with row extractors named in a 'Máquina' cell (substring match).
+
+    Args:
+        valor (str): Cell value, lowercase
+
+    Returns:
+        Maquina: Registry entry, or None
+    """
+    for maquina in _MAQUINAS:
+        if maquina.extrai_da_linha and maquina.nome in valor:
+            return maquina
+    return None
+
+MACHINE_ALIASES = {}
+MACHINES_MAP = {}
+
+# A ordem de registro é a ordem do matching por prefixo/substring dos aliases
+registrar_maquina('bobst', 'bobst', aliases=('b', 'bobst'), extrai_da_linha=True)
+registrar_maquina('komori', 'komori', aliases=('k', 'komori'), extrai_da_linha=True)
+registrar_maquina('furnax', 'furnax', aliases=('f', 'furnax'))
+registrar_maquina('cv manual', 'cv_manual', aliases=('cv', 'cv manual'), nomes=('c/v manual', 'cv manual'))
+registrar_maquina('cv_guangya', 'cv_guangya',
+                  aliases=('cv guangya', 'guangya', 'guan', 'cvgy', 'cv guan', 'gy'))
+registrar_maquina('hcd', 'hcd', aliases=('h', 'hcd'), extrai_da_linha=True, regras_na_analise=False)
+registrar_maquina('samkoon', 'samkoon', aliases=('s', 'samkoon'))
+registrar_maquina('laminadora', 'laminadora', aliases=('l', 'laminadora'))
+registrar_maquina('sakurai', 'sakurai',
+                  aliases=('verniz uv sakurai', 'verniz.uv sakurai', 'verniz sakurai', 'uv sakurai', 'sakurai', 'v'),
+                  nomes=('sakurai', 'verniz uv sakurai', 'verniz.uv sakurai', 'verniz sakurai', 'uv sakurai'))
+registrar_maquina('sbl', 'sbl', aliases=('sbl',))
@@ -0,0 +1,143 @@
+"""
+Process string parsing module.
+Padrões pré-compilados e funções memorizadas para interpretar os textos de
+Processo/Evento (velocidade p/h, tempo de setup, chave de entrada).
+
+Processo values repeat heavily across rows and OPs, so every parser is
+wrapped in an LRU cache keyed by the raw string.
+"""
+
+import re
+from functools import lru_cache
+import unidecode
+
+TAMANHO_CACHE = 4096
+
+# Velocidade no formato '4.000 p/h', '2000 p/h', '1.500,5 p/h'
+PADRAO_VELOCIDADE = re.compile(r'(\d{1,3}(?:\.\d{3})*,?\d*|\d+)\s*p/h')
+# Primeiro número de um texto (rótulo de velocidade programada)
+PADRAO_NUMERO = re.compile(r'(\d+[\.,]?\d*)')
+# Separador título - ... - sufixo
+PADRAO_SEPARADOR = re.compile(r'\s*-\s*')
+# Sufixo que identifica a entrada (frente, verso, cores...)
+PADRAO_SUFIXO_ENTRADA = re.compile(r'(f|v|t/r|tr|fr|fv|vr|cmyk|preto|colorido|\(.*\))$')
+# Identificador '1ª entrada'
+PADRAO_ID_ENTRADA = re.compile(r'(\d+ª entrada)')
+
+# Tempo de setup escrito no processo: '1h 30 min', '1h30min', '1h', '2 horas', '45 min', '45min'
+PADRAO_HORA_MIN = re.compile(r'(\d{1,2})\s*h(?:ora)?(?:s)?\s*(\d{1,2})?\s*min')
+PADRAO_HORA_MIN_JUNTO = re.compile(r'(\d{1,2})h(\d{1,2})min')
+PADRAO_HORA = re.compile(r'(\d{1,2})\s*h(?:ora)?(?:s)?')
+PADRAO_MIN = re.compile(r'(\d{1,2})\s*min')
+PADRAO_MIN_JUNTO = re.compile(r'(\d{1,2})min')
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalize_process(texto):
+    """
+    Normalize a Processo/Evento string: lowercase, stripped, without accents.
+
+    Args:
+        texto (str): Raw text
+
+    Returns:
+        str: Normalized text
+    """
+    return unidecode.unidecode(texto.lower().strip())
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def entrada_key(processo):
+    """
+    Return the key that identifies the entrada (pass) of a process.
+
+    Processes mentioning 'entrada' are keyed by the whole normalized text;
+    otherwise the key is 'título|sufixo', where the suffix is the side/color
+    marker at the end of the last ' - ' separated part.
+
+    Args:
+        processo (str): Raw Processo text
+
+    Returns:
+        str: Entrada key
+    """
+    proc_norm = normalize_process(processo)
+    # 1. Se contém 'entrada', usa como chave
+    if 'entrada' in proc_norm:
+        return proc_norm
+    partes = PADRAO_SEPARADOR.split(proc_norm)
+    titulo = partes[0] if partes else proc_norm
+    sufixo = ''
+    if len(partes) > 1:
+        sufixo = partes[-1]
+    match_suf = PADRAO_SUFIXO_ENTRADA.search(sufixo)
+    sufixo_final = match_suf.group(1) if match_suf else sufixo
+    return f"{titulo.strip()}|{sufixo_final.strip()}"
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def parse_speed(texto):
+    """
+    Extract the p/h speed from a text such as '4.000 p/h'.
+
+    Args:
+        texto (str): Média Produção or Processo text
+
+    Returns:
+        float | None: Speed in pieces per hour, or None when there is no 'p/h' value
+    """
+    match = PADRAO_VELOCIDADE.search(texto)
+    if not match:
+        return None
+    return float(match.group(1).replace('.', '').replace(',', '.'))
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def speed_label(texto):
+    """
+    Build the programmed speed label ('4000 p/h') from the first number in a text.
+
+    Args:
+        texto (str): Média Produção text
+
+    Returns:
+        str | None: Label, or None when the text has no number
+    """
+    match = PADRAO_NUMERO.search(texto)
+    if not match:
+        return None
+    return f"{match.group(1).replace(',', '')} p/h"
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def entrada_id(processo):
+    """Retorna o identificador '1ª entrada' do processo (em minúsculas) ou ''."""
+    match = PADRAO_ID_ENTRADA.match(processo.lower())
+    return match.group(1) if match else ''
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def parse_setup_duration(processo):
+    """
+    Extract the setup duration written in a process description.
+
+    Args:
+        processo (str): Processo text (lowercase)
+
+    Returns:
+        str: Duration as 'HH:MM', or '' when none is found
+    """
+    match_hora_min = PADRAO_HORA_MIN.search(processo)
+    if match_hora_min:
+        horas = int(match_hora_min.group(1))
+        minutos = int(match_hora_min.group(2)) if match_hora_min.group(2) else 0
+        return f'{horas:02d}:{minutos:02d}'
+    match_hora_min_junto = PADRAO_HORA_MIN_JUNTO.search(processo)
+    if match_hora_min_junto:
+        horas = int(match_hora_min_junto.group(1))
+        minutos = int(match_hora_min_junto.group(2))
+        return f'{horas:02d}:{minutos:02d}'
+    match_hora = PADRAO_HORA.search(processo)
+    if match_hora:
+        return f'{int(match_hora.group(1)):02d}:00'
+    match_min = PADRAO_MIN.search(processo)
+    if match_min:
+        return f'00:{int(match_min.group(1)):02d}'
+    match_min_junto = PADRAO_MIN_JUNTO.search(processo)
+    if match_min_junto:
+        return f'00:{int(match_min_junto.group(1)):02d}'
+    return ''
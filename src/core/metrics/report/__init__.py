@@ -3,11 +3,15 @@ Report generation package.
 """
 
 from .generator import ReportGenerator
+from .model import RelatorioDesempenho
+from . import renderers
 from . import sections
 from . import utils
 
 __all__ = [
     'ReportGenerator',
+    'RelatorioDesempenho',
+    'renderers',
     'sections',
     'utils'
 ]
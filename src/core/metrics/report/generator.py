@@ -1,12 +1,16 @@
 """
 Core module for report generation.
 This module coordinates the generation of different report sections.
+A análise é calculada uma vez num RelatorioDesempenho (gerar_modelo); o texto
+e os demais formatos são renderizados a partir dele (renderers.py).
 """
 
-from datetime import datetime
+from src.utils.timers import etapa
+from src.core.metrics.timeline import analisar_linha_do_tempo
+from .model import RelatorioDesempenho
+from .renderers import formatar_cabecalho, renderizar_texto
 from .sections import (
     period,
-    summary,
     efficiency,
     ops
 )
@@ -14,54 +18,76 @@ from .sections import (
 class ReportGenerator:
     def __init__(self):
         self.sections = []
-        
-    def generate_report(self, data, report_config):
+
+    def gerar_modelo(self, data, report_config):
         """
-        Generate a complete production analysis report.
-        
+        Compute the structured report (metrics + per-OP records) without formatting text.
+
         Args:
-            data (dict): Data containing groups and OPs analysis
-            report_config (dict): Configuration for report generation
-            
+            data (dict): Data containing groups and OPs analysis ('grupos', 'ops', 'df'
+                and optionally 'tipado', the typed frame of df)
+            report_config (dict): hora_inicio, hora_fim and intervalo (plus 'turnos',
+                the TurnosDoDia of the day, when a shift calendar is used)
+
         Returns:
-            str: Complete formatted report
+            RelatorioDesempenho: Analysis result, ready for any renderer
         """
         grupos_para_analise = data.get('grupos', {})
         ops_analise = data.get('ops', {})
+        df = data.get('df')
         hora_inicio = report_config.get('hora_inicio')
         hora_fim = report_config.get('hora_fim')
         intervalo = report_config.get('intervalo', 60)
-        
+
         # Calculate available time
-        tempo_disponivel = period.calculate_available_time(hora_inicio, hora_fim, intervalo)
-        
-        # Header section
-        report = self._generate_header()
-        
-        # Period section
-        report += period.generate_period_section(hora_inicio, hora_fim, intervalo, tempo_disponivel)
-        
-        # Calculate general metrics
-        metrics = efficiency.calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel, data.get('df'))
-        
-        # Summary section
-        report += summary.generate_general_summary(metrics, tempo_disponivel)
-        
-        # General averages section
-        if ops_analise:
-            report += efficiency.generate_detailed_general_averages(ops_analise)
-        
-        # OPs analysis section
+        tempo_disponivel = period.tempo_disponivel(report_config)
+        periodo = {
+            'hora_inicio': hora_inicio,
+            'hora_fim': hora_fim,
+            'intervalo': intervalo,
+            'tempo_disponivel': tempo_disponivel,
+        }
+
+        # Consolidate each OP once; the metrics and the OP records reuse the result
+        with etapa('consolidar_ops'):
+            consolidados = efficiency.consolidar_ops(ops_analise, df, data.get('tipado'))
+
+        with etapa('metricas_gerais'):
+            metrics = efficiency.calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel,
+                                                           df, consolidados)
+
+        # Ocupação real pelos horários de Início/Término (independe dos tempos somados)
+        linha_do_tempo = None
+        if df is not None:
+            with etapa('linha_do_tempo'):
+                linha_do_tempo = analisar_linha_do_tempo(df, hora_inicio, hora_fim, intervalo, data.get('tipado'),
+                                                         report_config.get('turnos'))
+
+        # Sempre registrar todas as OPs, mesmo com agrupamento
+        registros = []
         if ops_analise:
-            df = data.get('df')
-            # Sempre mostrar todas as OPs, mesmo com agrupamento
-            report += ops.generate_ops_section(ops_analise, grupos_para_analise, df)
+            with etapa('registros_ops'):
+                registros = ops.montar_registros_ops(ops_analise, df, consolidados, data.get('tipado'))
+
+        return RelatorioDesempenho(periodo, metrics, registros, linha_do_tempo=linha_do_tempo)
+
+    def generate_report(self, data, report_config):
+        """
+        Generate a complete production analysis report.
         
-        return report
+        Args:
+            data (dict): Data containing groups and OPs analysis ('grupos', 'ops', 'df'
+                and optionally 'tipado', the typed frame of df)
+            report_config (dict): Configuration for report generation
+            
+        Returns:
+            str: Complete formatted report
+        """
+        relatorio = self.gerar_modelo(data, report_config)
+        with etapa('renderizar_texto'):
+            return renderizar_texto(relatorio)
     
     def _generate_header(self):
         """Generate report header with current date"""
-        data_atual = datetime.now().strftime("%d/%m/%Y %H:%M")
-        header = f"📊 RELATÓRIO DE DESEMPENHO - {data_atual}\n"
-        header += "=" * 80 + "\n\n"
-        return header
+        from datetime import datetime
+        return formatar_cabecalho(datetime.now())
@@ -0,0 +1,87 @@
+"""
+Structured report model.
+Resultado de uma análise antes da formatação: período, métricas gerais e um
+registro por OP. É calculado uma vez por ReportGenerator.gerar_modelo e
+consumido pelos renderizadores (texto, JSON, CSV, PDF) sem recalcular nada.
+"""
+
+import math
+from datetime import date, datetime
+
+class RelatorioDesempenho:
+    """
+    Structured result of one performance analysis.
+
+    Args:
+        periodo (dict): hora_inicio, hora_fim, intervalo and tempo_disponivel (min)
+        metricas (dict): Output of efficiency.calculate_general_metrics
+        ops (list): Per-OP records (ops.montar_registros_ops), in report order
+        gerado_em (datetime, optional): Timestamp shown in the header (default: now)
+        linha_do_tempo (dict, optional): Output of timeline.analisar_linha_do_tempo
+            (None when the rows have no valid Início/Término)
+    """
+
+    def __init__(self, periodo, metricas, ops, gerado_em=None, linha_do_tempo=None):
+        self.periodo = periodo
+        self.metricas = metricas
+        self.ops = ops
+        self.gerado_em = gerado_em or datetime.now()
+        self.linha_do_tempo = linha_do_tempo
+
+    def __repr__(self):
+        return f"RelatorioDesempenho({len(self.ops)} OPs, {self.gerado_em:%d/%m/%Y %H:%M})"
+
+    @property
+    def tempo_disponivel(self):
+        return self.periodo['tempo_disponivel']
+
+    @property
+    def classificacao(self):
+        """Classificação da eficiência de tempo geral, como no resumo."""
+        from .sections.efficiency import get_efficiency_classification
+        return get_efficiency_classification(self.metricas['eficiencia_tempo_geral'])
+
+    def como_dict(self):
+        """
+        Plain-type copy of the model (JSON-serializable).
+
+        Returns:
+            dict: 'gerado_em' (ISO), 'periodo', 'metricas' (with 'classificacao'),
+                'linha_do_tempo' and 'ops'
+        """
+        metricas = dict(self.metricas)
+        metricas['classificacao'] = self.classificacao
+        return valor_simples({
+            'gerado_em': self.gerado_em,
+            'periodo': self.periodo,
+            'metricas': metricas,
+            'linha_do_tempo': self.linha_do_tempo,
+            'ops': self.ops,
+        })
+
+def valor_simples(valor):
+    """
+    Convert numpy scalars, NaN and dates to plain JSON types, recursively.
+
+    Args:
+        valor: Model value (dict, list, number, text...)
+
+    Returns:
+        The same value with dicts/lists rebuilt and NaN/inf as None
+    """
+    if isinstance(valor, dict):
+        return {str(chave): valor_simples(item) for chave, item in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [valor_simples(item) for item in valor]
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat(timespec='seconds') if isinstance(valor, datetime) else valor.isoformat()
+    if valor is None or isinstance(valor, (bool, str)):
+        return valor
+    if hasattr(valor, 'item'):
+        # numpy.int64, numpy.float64, numpy.bool_
+        valor = valor.item()
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    if isinstance(valor, (bool, int, float)):
+        return valor
+    return str(valor)
@@ -0,0 +1,336 @@
+"""
+PDF writer for analysis reports.
+Escreve um ou vários relatórios em texto num único PDF, uma seção por
+relatório, numa só passada. As métricas da fonte DejaVuSans são carregadas uma
+vez por processo (do DejaVuSans.pkl distribuído, quando confere com o .ttf) e
+os caracteres são convertidos por uma tabela de str.translate.
+
+With fpdf 1.7.x the font is registered from the cached metrics instead of
+add_font: the bundled .pkl stores the absolute .ttf path of the machine that
+generated it, which add_font would try to embed. Without the font the writer
+falls back to Helvetica and Latin-1 text.
+"""
+
+import os
+import sys
+import pickle
+import logging
+import warnings
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FONTE_PADRAO = 'DejaVuSans.ttf'
+FAMILIA_UNICODE = 'dejavu'
+FAMILIA_PADRAO = 'helvetica'
+
+ALTURA_LINHA = 6
+ALTURA_LINHA_VAZIA = 4
+TAMANHO_TEXTO = 10
+TAMANHO_TITULO = 14
+
+# Emojis sem glyph nas fontes do PDF: substituídos por texto (os demais viram espaço)
+SUBSTITUICOES = {
+    '🎯': '-> ',
+    '🖱': '-> ',
+    '📊': '[GRAFICO] ',
+    '⚡': '[RAPIDO] ',
+    '🔧': '[CONFIG] ',
+    '📈': '[CRESCIMENTO] ',
+    '⏰': '[TEMPO] ',
+    '⏱': '[TEMPO] ',
+    '⏳': '[TEMPO] ',
+    '🏭': '[FABRICA] ',
+    '🔗': '[LINK] ',
+    '🔓': '[DESBLOQUEADO] ',
+    '📝': '[EDICAO] ',
+    '➕': '+ ',
+    '🗑': '- ',
+    '📤': '[EXPORTAR] ',
+    '📑': '[RELATORIO] ',
+    '✅': '[OK] ',
+    '❌': '[ERRO] ',
+    '⚠': '[!] ',
+    '⭐': '* ',
+    '🌟': '* ',
+    '🔹': '- ',
+    '🚀': '[LANCAMENTO] ',
+    '💡': '[IDEIA] ',
+    '🎨': '[DESIGN] ',
+    '🔍': '[BUSCA] ',
+    '🔎': '[BUSCA] ',
+    '📋': '[LISTA] ',
+    '⚙': '[CONFIGURACAO] ',
+    '📦': '[PACOTE] ',
+    '🔄': '[ATUALIZAR] ',
+    '📅': '[DATA] ',
+    '🕐': '[HORA] ',
+    '🕒': '[HORA] ',
+    '📌': '[FIXAR] ',
+}
+
+# Sem equivalente em Latin-1 (Helvetica); com DejaVu esses caracteres são mantidos
+SUBSTITUICOES_LATIN1 = {
+    '•': '- ',
+    '—': '-',
+    '–': '-',
+    '─': '-',
+    '═': '=',
+    '║': '|',
+    '█': '#',
+    '▫': '- ',
+    '→': '->',
+}
+
+class _TabelaTraducao(dict):
+    """
+    str.translate table: explicit replacements first, then the characters the
+    font can draw are kept and everything else becomes a space. Codepoints not
+    seen before are resolved once and memoized.
+    """
+
+    def __init__(self, substituicoes, desenhavel):
+        super().__init__({ord(c): texto for c, texto in substituicoes.items()})
+        self[0xFE0F] = None  # seletor de variação dos emojis
+        self._desenhavel = desenhavel
+
+    def __missing__(self, codigo):
+        if codigo in (9, 10, 13):
+            valor = codigo
+        elif codigo < 32 or not self._desenhavel(codigo):
+            valor = ' '
+        else:
+            valor = codigo
+        self[codigo] = valor
+        return valor
+
+def _latin1(codigo):
+    return 32 <= codigo <= 126 or 160 <= codigo <= 255
+
+@lru_cache(maxsize=None)
+def tabela_traducao(unicode=True):
+    """
+    Translation table for the PDF fonts, built once per process.
+
+    Args:
+        unicode (bool): True for the DejaVu font (keeps every character it has a
+            glyph for), False for Helvetica (Latin-1 only)
+
+    Returns:
+        dict: Table for str.translate
+    """
+    if unicode:
+        metricas = metricas_fonte()
+        if metricas is not None:
+            larguras = metricas['cw']
+            return _TabelaTraducao(SUBSTITUICOES, lambda c: c < len(larguras) and larguras[c] > 0)
+    return _TabelaTraducao({**SUBSTITUICOES, **SUBSTITUICOES_LATIN1}, _latin1)
+
+def limpar_texto(texto, unicode=False):
+    """Converte o texto para o que a fonte do PDF consegue desenhar."""
+    return texto.translate(tabela_traducao(unicode))
+
+def caminho_fonte_padrao():
+    """DejaVuSans.ttf na raiz do projeto (ou do executável PyInstaller)."""
+    if getattr(sys, 'frozen', False):
+        base = Path(sys._MEIPASS)
+    else:
+        base = Path(os.environ.get('ANALISADOR_BASE_PATH') or Path(__file__).resolve().parents[4])
+    return base / FONTE_PADRAO
+
+@lru_cache(maxsize=None)
+def metricas_fonte(caminho_ttf=None):
+    """
+    TrueType metrics of the PDF font, loaded once per process.
+
+    Uses the .pkl next to the .ttf when it was generated from the same file
+    (same size); otherwise reads the metrics from the .ttf.
+
+    Args:
+        caminho_ttf (str, optional): Font file (default: caminho_fonte_padrao())
+
+    Returns:
+        dict: fpdf font metrics with 'ttffile' pointing to the local file, or
+            None when the font is not available
+    """
+    ttf = Path(caminho_ttf) if caminho_ttf else caminho_fonte_padrao()
+    if not ttf.exists():
+        logger.warning("Fonte %s não encontrada; PDF em Helvetica", ttf)
+        return None
+    tamanho = ttf.stat().st_size
+    cache = ttf.with_suffix('.pkl')
+    metricas = None
+    if cache.exists():
+        try:
+            with open(cache, 'rb') as f:
+                metricas = pickle.load(f)
+            if metricas.get('originalsize') != tamanho:
+                metricas = None
+        except Exception as e:
+            logger.warning("Métricas em cache de %s ilegíveis: %s", ttf.name, e)
+            metricas = None
+    if metricas is None:
+        try:
+            metricas = _ler_metricas_ttf(ttf, tamanho)
+        except Exception as e:
+            logger.warning("Não foi possível ler a fonte %s: %s", ttf, e)
+            return None
+        cache = None
+    metricas = dict(metricas, ttffile=str(ttf))
+    # O fpdf 1.7 guarda ao lado deste arquivo as larguras dos caracteres < 128 (.cw127.pkl)
+    metricas['unifilename'] = str(cache) if cache is not None else None
+    return metricas
+
+def _ler_metricas_ttf(ttf, tamanho):
+    """Mesmas métricas que o fpdf 1.7 grava no .pkl (ver FPDF.add_font)."""
+    import re
+    from fpdf.ttfonts import TTFontFile
+    fonte = TTFontFile()
+    fonte.getMetrics(str(ttf))
+    return {
+        'name': re.sub('[ ()]', '', fonte.fullName),
+        'type': 'TTF',
+        'desc': {
+            'Ascent': int(round(fonte.ascent, 0)),
+            'Descent': int(round(fonte.descent, 0)),
+            'CapHeight': int(round(fonte.capHeight, 0)),
+            'Flags': fonte.flags,
+            'FontBBox': "[%s %s %s %s]" % tuple(int(round(v, 0)) for v in fonte.bbox[:4]),
+            'ItalicAngle': int(fonte.italicAngle),
+            'StemV': int(round(fonte.stemV, 0)),
+            'MissingWidth': int(round(fonte.defaultWidth, 0)),
+        },
+        'up': round(fonte.underlinePosition),
+        'ut': round(fonte.underlineThickness),
+        'originalsize': tamanho,
+        'cw': fonte.charWidths,
+    }
+
+class _Subconjunto(list):
+    """
+    Characters used with the font (fpdf 1.7 'subset').
+
+    fpdf appends every character written and, when saving, tests each font
+    codepoint with `in` against this list: quadratic in the document size.
+    Here duplicates are ignored and membership is a set lookup.
+    """
+
+    def __init__(self, codigos=()):
+        super().__init__()
+        self._codigos = set()
+        for codigo in codigos:
+            self.append(codigo)
+
+    def append(self, codigo):
+        if codigo not in self._codigos:
+            self._codigos.add(codigo)
+            super().append(codigo)
+
+    def __contains__(self, codigo):
+        return codigo in self._codigos
+
+    def __delitem__(self, indice):
+        removidos = self[indice] if isinstance(indice, slice) else [self[indice]]
+        super().__delitem__(indice)
+        self._codigos.difference_update(removidos)
+
+def _fpdf_legado():
+    import fpdf
+    return str(getattr(fpdf, 'FPDF_VERSION', getattr(fpdf, '__version__', '1'))).startswith('1.')
+
+def _registrar_fonte(pdf, caminho_ttf=None):
+    """
+    Register the Unicode font in the document.
+
+    Returns:
+        str: Font family to use (FAMILIA_PADRAO when the font is unavailable)
+    """
+    metricas = metricas_fonte(caminho_ttf)
+    if metricas is None:
+        return FAMILIA_PADRAO
+    if not _fpdf_legado():
+        # fpdf2 lê o .ttf por documento; um documento pode ter várias seções
+        pdf.add_font(FAMILIA_UNICODE, '', metricas['ttffile'])
+        return FAMILIA_UNICODE
+    # Equivalente a add_font(..., uni=True) a partir das métricas já carregadas
+    pdf.fonts[FAMILIA_UNICODE] = {
+        'i': len(pdf.fonts) + 1, 'type': 'TTF', 'name': metricas['name'], 'desc': metricas['desc'],
+        'up': metricas['up'], 'ut': metricas['ut'], 'cw': metricas['cw'],
+        'ttffile': metricas['ttffile'], 'fontkey': FAMILIA_UNICODE,
+        'subset': _Subconjunto(range(0, 57 if hasattr(pdf, 'str_alias_nb_pages') else 32)),
+        'unifilename': metricas['unifilename'],
+    }
+    pdf.font_files[FAMILIA_UNICODE] = {'length1': metricas['originalsize'], 'type': 'TTF',
+                                       'ttffile': metricas['ttffile']}
+    return FAMILIA_UNICODE
+
+class EscritorPDF:
+    """
+    Multi-section PDF document for text reports.
+
+    Each section starts on a new page and is written when added, so a month
+    of reports can be streamed into one file without keeping the texts.
+
+    Args:
+        caminho_fonte (str, optional): TrueType font (default: DejaVuSans.ttf)
+    """
+
+    def __init__(self, caminho_fonte=None):
+        warnings.filterwarnings("ignore", category=UserWarning, module="fpdf")
+        from fpdf import FPDF
+        self.pdf = FPDF()
+        self.pdf.set_auto_page_break(True, margin=15)
+        self.familia = _registrar_fonte(self.pdf, caminho_fonte)
+        self.tabela = tabela_traducao(self.familia == FAMILIA_UNICODE)
+        self.secoes = 0
+
+    def adicionar_secao(self, texto, titulo=None):
+        """
+        Write one report, starting on a new page.
+
+        Args:
+            texto (str): Report text
+            titulo (str, optional): Centered title above the text
+        """
+        pdf = self.pdf
+        pdf.add_page()
+        if titulo:
+            pdf.set_font(self.familia, '', TAMANHO_TITULO)
+            pdf.cell(0, 10, titulo.translate(self.tabela), ln=1, align='C')
+            pdf.ln(5)
+        pdf.set_font(self.familia, '', TAMANHO_TEXTO)
+        largura = pdf.w - pdf.l_margin - pdf.r_margin
+        for linha in texto.translate(self.tabela).split('\n'):
+            linha = linha.rstrip()
+            if not linha.strip():
+                pdf.ln(ALTURA_LINHA_VAZIA)
+            elif pdf.get_string_width(linha) > largura:
+                pdf.multi_cell(0, ALTURA_LINHA, linha)
+            else:
+                pdf.cell(0, ALTURA_LINHA, linha, ln=1)
+        self.secoes += 1
+
+    def salvar(self, caminho):
+        """Grava o documento (uma página em branco se não houver seções)."""
+        if not self.secoes:
+            self.pdf.add_page()
+        self.pdf.output(str(caminho))
+
+def gerar_pdf(caminho, secoes, caminho_fonte=None):
+    """
+    Write reports into one PDF, one section each, in a single pass.
+
+    Args:
+        caminho (str): Output file
+        secoes (iterable): (titulo, texto) pairs; may be a generator
+        caminho_fonte (str, optional): TrueType font (default: DejaVuSans.ttf)
+
+    Returns:
+        int: Number of sections written
+    """
+    escritor = EscritorPDF(caminho_fonte)
+    for titulo, texto in secoes:
+        escritor.adicionar_secao(texto, titulo)
+    escritor.salvar(caminho)
+    return escritor.secoes
@@ -0,0 +1,115 @@
+"""
+Report renderers.
+Formatam um RelatorioDesempenho (model.py) como texto do terminal, JSON, CSV
+ou PDF. Nenhum renderizador recalcula a análise: gerar o modelo uma vez e
+chamar vários renderizadores não repete o trabalho.
+"""
+
+import csv
+import io
+import json
+
+from .model import valor_simples
+from .sections import period, summary, ops, timeline
+
+# Colunas do CSV por OP, nesta ordem (acrescentar no fim para não quebrar planilhas)
+COLUNAS_CSV = (
+    'os', 'cliente', 'processo', 'tempo_total_producao', 'tempo_setup', 'tempo_setup_programado',
+    'qtd_produzida', 'velocidade_real', 'velocidade_nominal', 'tempo_programado_producao',
+    'ganho_producao', 'ganho_setup', 'acerto_sem_producao', 'tem_producao', 'tem_acerto',
+    'eficiencia_producao', 'eficiencia_acerto', 'media_final', 'entradas', 'grupos',
+)
+
+def formatar_cabecalho(gerado_em):
+    """Cabeçalho do relatório em texto."""
+    header = f"📊 RELATÓRIO DE DESEMPENHO - {gerado_em.strftime('%d/%m/%Y %H:%M')}\n"
+    header += "=" * 80 + "\n\n"
+    return header
+
+def renderizar_texto(relatorio):
+    """
+    Render the report as the text shown in the application.
+
+    Args:
+        relatorio (RelatorioDesempenho): Analysis result
+
+    Returns:
+        str: Complete formatted report
+    """
+    dados_periodo = relatorio.periodo
+    texto = formatar_cabecalho(relatorio.gerado_em)
+    texto += period.generate_period_section(dados_periodo['hora_inicio'], dados_periodo['hora_fim'],
+                                            dados_periodo['intervalo'], dados_periodo['tempo_disponivel'])
+    texto += summary.generate_general_summary(relatorio.metricas, dados_periodo['tempo_disponivel'])
+    texto += timeline.generate_timeline_section(relatorio.linha_do_tempo)
+    if relatorio.ops:
+        texto += ops.formatar_secao_ops(relatorio.ops)
+    return texto
+
+def renderizar_json(relatorio, indent=2):
+    """
+    Render the report as JSON (see RelatorioDesempenho.como_dict).
+
+    Args:
+        relatorio (RelatorioDesempenho): Analysis result
+        indent (int | None): Indentation passed to json.dumps
+
+    Returns:
+        str: JSON document
+    """
+    return json.dumps(relatorio.como_dict(), ensure_ascii=False, indent=indent)
+
+def renderizar_csv(relatorio, separador=';'):
+    """
+    Render the per-OP records as CSV, one row per OP, columns COLUNAS_CSV.
+    Entradas e grupos viram contagens; o detalhe completo fica no JSON.
+
+    Args:
+        relatorio (RelatorioDesempenho): Analysis result
+        separador (str): Field separator (';' opens directly in a pt-BR spreadsheet)
+
+    Returns:
+        str: CSV text with header
+    """
+    saida = io.StringIO()
+    escritor = csv.writer(saida, delimiter=separador, lineterminator='\n')
+    escritor.writerow(COLUNAS_CSV)
+    for registro in relatorio.ops:
+        linha = valor_simples(dict(registro, entradas=len(registro['entradas']), grupos=len(registro['grupos'])))
+        escritor.writerow(['' if linha.get(coluna) is None else linha[coluna] for coluna in COLUNAS_CSV])
+    return saida.getvalue()
+
+def renderizar_pdf(relatorio, caminho, titulo=None, caminho_fonte=None):
+    """
+    Write the text rendering of the report to a PDF.
+
+    Args:
+        relatorio (RelatorioDesempenho): Analysis result
+        caminho (str): Output PDF
+        titulo (str, optional): Section title
+        caminho_fonte (str, optional): TTF font (see pdf_writer.gerar_pdf)
+
+    Returns:
+        int: Number of sections written
+    """
+    from .pdf_writer import gerar_pdf
+    return gerar_pdf(caminho, [(titulo, renderizar_texto(relatorio))], caminho_fonte)
+
+RENDERIZADORES = {
+    'texto': renderizar_texto,
+    'json': renderizar_json,
+    'csv': renderizar_csv,
+}
+
+def renderizar(relatorio, formato='texto'):
+    """
+    Render the report in a text format ('texto', 'json' or 'csv').
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        funcao = RENDERIZADORES[formato]
+    except KeyError:
+        raise ValueError(f"Formato desconhecido: {formato} (use {', '.join(RENDERIZADORES)})")
+    return funcao(relatorio)
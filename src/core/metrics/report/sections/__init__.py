@@ -6,10 +6,12 @@ from . import period
 from . import summary
 from . import efficiency
 from . import ops
+from . import timeline
 
 __all__ = [
     'period',
     'summary',
     'efficiency', 
-    'ops'
+    'ops',
+    'timeline'
 ]
@@ -3,9 +3,26 @@ Efficiency calculations and metrics module.
 Contains functions for calculating and analyzing efficiency metrics.
 """
 
+import math
 from core.config.setup_config import TEMPOS_SETUP as tempos_setup, get_setup_time
+from src.core.metrics.parsing import parse_speed
 
-def calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel, df=None):
+def consolidar_ops(ops_analise, df, tipado=None):
+    """
+    Consolidate every OP once for a report run.
+
+    Args:
+        ops_analise (dict): {op_key: [(nome_grupo, dados), ...]}
+        df (pd.DataFrame): Production data
+        tipado (pd.DataFrame, optional): Typed frame of df
+
+    Returns:
+        dict: {op_key: dados consolidados}, shared by all report sections
+    """
+    colunas = colunas_consolidacao(df, tipado)
+    return {op_key: consolidar_dados_op(grupos_op, df, colunas=colunas) for op_key, grupos_op in ops_analise.items()}
+
+def calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel, df=None, consolidados=None):
     """Calculate general metrics with new formulas (corrigido para considerar ganhos de tempo nas OPs e médias corretas)"""
     metrics = {
         'tempo_total_producao': 0.0,
@@ -34,9 +51,11 @@ def calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel
     tempo_total_ganho = 0
     eficiencia_producao_list = []
     eficiencia_acerto_list = []
+    if ops_analise and consolidados is None:
+        consolidados = consolidar_ops(ops_analise, df)
     if ops_analise:
-        for grupos_op in ops_analise.values():
-            dados_op = consolidar_dados_op(grupos_op, df)
+        for op_key in ops_analise:
+            dados_op = consolidados[op_key]
             # Ganho de produção
             if dados_op.get('ganho_producao', 0) > 0:
                 tempo_total_ganho += dados_op['ganho_producao']
@@ -55,7 +74,7 @@ def calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel
     # Tempo ocioso: tempo disponível menos produção e acerto (NÃO descontar ganhos)
     metrics['tempo_ocioso'] = int(max(0, round(tempo_disponivel - (tempo_total_producao + tempo_total_acerto))))
     if ops_analise:
-        metrics.update(_calculate_ops_metrics(ops_analise, tempo_disponivel, df))
+        metrics.update(_calculate_ops_metrics(ops_analise, tempo_disponivel, df, consolidados))
         if eficiencia_producao_list:
             metrics['eficiencia_producao'] = float(sum(eficiencia_producao_list)) / float(len(eficiencia_producao_list))
         if eficiencia_acerto_list:
@@ -64,14 +83,16 @@ def calculate_general_metrics(grupos_para_analise, ops_analise, tempo_disponivel
             metrics['eficiencia_tempo_geral'] = ((tempo_total_producao + tempo_total_acerto + tempo_total_ganho) / tempo_disponivel) * 100
     return metrics
 
-def _calculate_ops_metrics(ops_analise, tempo_disponivel, df=None):
+def _calculate_ops_metrics(ops_analise, tempo_disponivel, df=None, consolidados=None):
     """Calculate metrics related to OPs"""
     metrics = {}
     soma_atraso_ops = 0
     count_ops = 0
+    if consolidados is None:
+        consolidados = consolidar_ops(ops_analise, df)
     
-    for grupos_op in ops_analise.values():
-        dados_op = consolidar_dados_op(grupos_op, df)
+    for op_key in ops_analise:
+        dados_op = consolidados[op_key]
         
         if dados_op['velocidade_nominal'] > 0 and dados_op['qtd_produzida'] > 0:
             tempo_programado = (dados_op['qtd_produzida'] / dados_op['velocidade_nominal']) * 60
@@ -82,11 +103,36 @@ def _calculate_ops_metrics(ops_analise, tempo_disponivel, df=None):
     metrics['tempo_total_perdido_ganho'] = soma_atraso_ops
     return metrics
 
-def consolidar_dados_op(grupos_op, df):
-    """Consolida dados de múltiplos grupos da mesma OP, somando tempos, quantidades e calculando médias e ganhos/perdas."""
-    from src.core.data.data_processor import tempo_para_minutos
+def colunas_consolidacao(df, tipado=None):
+    """
+    Extract the per-row lists used by consolidar_dados_op from the typed frame.
+
+    Args:
+        df (pd.DataFrame): Production data (may be None)
+        tipado (pd.DataFrame, optional): Typed frame; built from df when omitted
+
+    Returns:
+        dict: Lists indexed by row position, plus 'n' (number of rows)
+    """
+    if tipado is None:
+        if df is None:
+            return {'n': 0}
+        from src.core.data.typed_frame import construir_frame_tipado
+        tipado = construir_frame_tipado(df)
+    colunas = {nome: tipado[nome].tolist() for nome in (
+        'tempo_min', 'tempo_setup_min', 'tem_tempo_setup', 'processo', 'chave_entrada',
+        'evento_acerto', 'gravando_tela', 'is_sakurai', 'media_ph')}
+    colunas['n'] = len(tipado)
+    return colunas
+
+def consolidar_dados_op(grupos_op, df, tipado=None, colunas=None):
+    """
+    Consolida dados de múltiplos grupos da mesma OP, somando tempos, quantidades e calculando médias e ganhos/perdas.
+    Os valores por linha vêm do frame tipado (ou de colunas_consolidacao já extraídas).
+    """
     from core.config.setup_config import get_setup_time
-    import re
+    if colunas is None and tipado is not None:
+        colunas = colunas_consolidacao(df, tipado)
     dados_consolidados = {
         'tempo_total_producao': 0,
         'tempo_setup': 0,
@@ -114,6 +160,12 @@ def consolidar_dados_op(grupos_op, df):
     processo_str = ''
     entradas_distintas = set()
     setup_por_entrada = {}
+    # Colunas tipadas por posição (ver construir_frame_tipado)
+    if colunas is None:
+        colunas = colunas_consolidacao(df)
+    n_linhas = colunas['n']
+    def linha_valida(idx):
+        return -n_linhas <= idx < n_linhas
     for nome_grupo, dados in grupos_op:
         linhas.extend(dados.get('linhas', []))
         if dados.get('tem_producao'):
@@ -127,78 +179,40 @@ def consolidar_dados_op(grupos_op, df):
             # Identificar entradas distintas e somar apenas um setup por entrada
             if 'linhas' in dados:
                 for idx in dados['linhas']:
-                    try:
-                        row = df.iloc[idx]
-                        evento = str(row.get('Evento', '')).lower()
-                        processo = str(row.get('Processo', ''))
-                        proc_norm = processo.lower().strip()
-                        import re, unidecode
-                        proc_norm_sem_acento = unidecode.unidecode(proc_norm)
-                        # 1. Se contém 'entrada', usa como chave
-                        if 'entrada' in proc_norm_sem_acento:
-                            chave_entrada = proc_norm_sem_acento
+                    if not linha_valida(idx):
+                        continue
+                    chave_entrada = colunas['chave_entrada'][idx]
+                    if chave_entrada not in entradas_distintas:
+                        entradas_distintas.add(chave_entrada)
+                        # Tempo real de setup
+                        setup_por_entrada[chave_entrada] = colunas['tempo_min'][idx]
+                        # Tempo programado de setup
+                        processo = colunas['processo'][idx]
+                        if colunas['tem_tempo_setup'][idx]:
+                            tempo_prog = colunas['tempo_setup_min'][idx]
                         else:
-                            partes = re.split(r'\s*-\s*', proc_norm_sem_acento)
-                            titulo = partes[0] if partes else proc_norm_sem_acento
-                            sufixo = ''
-                            if len(partes) > 1:
-                                sufixo = partes[-1]
-                            match_suf = re.search(r'(f|v|t/r|tr|fr|fv|vr|cmyk|preto|colorido|\(.*\))$', sufixo)
-                            sufixo_final = match_suf.group(1) if match_suf else sufixo
-                            chave_entrada = f"{titulo.strip()}|{sufixo_final.strip()}"
-                        if chave_entrada not in entradas_distintas:
-                            entradas_distintas.add(chave_entrada)
-                            # Tempo real de setup
-                            tempo_real = tempo_para_minutos(str(row.get('Tempo', '')))
-                            setup_por_entrada[chave_entrada] = tempo_real
-                            # Tempo programado de setup
-                            tempo_setup_str = str(row.get('Tempo Setup', '')).strip()
-                            if tempo_setup_str and tempo_setup_str != '':
-                                tempo_prog = tempo_para_minutos(tempo_setup_str)
-                            else:
-                                tempo_prog = get_setup_time(processo)
-                            setup_por_entrada[f"prog_{chave_entrada}"] = tempo_prog
-                            if not processo_str:
-                                processo_str = processo
-                    except Exception:
-                        pass
+                            tempo_prog = get_setup_time(processo)
+                        setup_por_entrada[f"prog_{chave_entrada}"] = tempo_prog
+                        if not processo_str:
+                            processo_str = processo
     # Soma apenas um setup por entrada distinta para o programado,
     # mas para o tempo real, some todos os tempos das linhas de acerto do mesmo grupo/entrada
     total_tempo_setup = 0
-    for chave in entradas_distintas:
-        # Para cada entrada distinta, some todos os tempos das linhas de acerto daquele grupo/entrada
-        tempo_real_entrada = 0
-        for nome_grupo, dados in grupos_op:
-            if 'linhas' in dados:
-                for idx in dados['linhas']:
-                    try:
-                        row = df.iloc[idx]
-                        evento = str(row.get('Evento', '')).lower()
-                        processo = str(row.get('Processo', ''))
-                        proc_norm = processo.lower().strip()
-                        import re, unidecode
-                        proc_norm_sem_acento = unidecode.unidecode(proc_norm)
-                        # 1. Se contém 'entrada', usa como chave
-                        if 'entrada' in proc_norm_sem_acento:
-                            chave_entrada = proc_norm_sem_acento
-                        else:
-                            partes = re.split(r'\s*-\s*', proc_norm_sem_acento)
-                            titulo = partes[0] if partes else proc_norm_sem_acento
-                            sufixo = ''
-                            if len(partes) > 1:
-                                sufixo = partes[-1]
-                            match_suf = re.search(r'(f|v|t/r|tr|fr|fv|vr|cmyk|preto|colorido|\(.*\))$', sufixo)
-                            sufixo_final = match_suf.group(1) if match_suf else sufixo
-                            chave_entrada = f"{titulo.strip()}|{sufixo_final.strip()}"
-                        # --- AJUSTE SAKURAI: soma 'acerto' e 'gravando tela' ---
-                        is_sakurai = 'sakurai' in proc_norm_sem_acento
-                        if chave_entrada == chave and (
-                            'acerto' in evento or (is_sakurai and 'gravando tela' in evento)
-                        ):
-                            tempo_real_entrada += tempo_para_minutos(str(row.get('Tempo', '')))
-                    except Exception:
-                        pass
-        total_tempo_setup += tempo_real_entrada
+    if entradas_distintas:
+        tempo_real_por_entrada = {}
+        for _nome_grupo, dados_grupo in grupos_op:
+            if 'linhas' in dados_grupo:
+                for idx in dados_grupo['linhas']:
+                    if not linha_valida(idx):
+                        continue
+                    chave_entrada = colunas['chave_entrada'][idx]
+                    # --- AJUSTE SAKURAI: soma 'acerto' e 'gravando tela' ---
+                    if chave_entrada in entradas_distintas and (
+                        colunas['evento_acerto'][idx] or (colunas['is_sakurai'][idx] and colunas['gravando_tela'][idx])
+                    ):
+                        tempo_real_por_entrada[chave_entrada] = tempo_real_por_entrada.get(chave_entrada, 0) + \
+                            colunas['tempo_min'][idx]
+        total_tempo_setup = sum(tempo_real_por_entrada.values())
     tempo_setup_programado = sum(setup_por_entrada[k] for k in setup_por_entrada if k.startswith('prog_'))
     if not dados_consolidados['os'] and dados.get('os'):
         dados_consolidados['os'] = dados['os']
@@ -218,27 +232,15 @@ def consolidar_dados_op(grupos_op, df):
     # Prioriza 'Média Produção' do DataFrame se existir
     if df is not None and len(linhas) > 0:
         for idx in linhas:
-            try:
-                row = df.iloc[idx]
-                media_producao = str(row.get('Média Produção', '')).strip()
-                if media_producao:
-                    match = re.search(r'(\d{1,3}(?:\.\d{3})*,?\d*|\d+)\s*p/h', media_producao)
-                    if match:
-                        media_str = match.group(1).replace('.', '').replace(',', '.')
-                        media_ph = float(media_str)
-                        break
-            except Exception:
-                pass
+            if linha_valida(idx) and not math.isnan(colunas['media_ph'][idx]):
+                media_ph = colunas['media_ph'][idx]
+                break
     if not media_ph:
         if not processo_str:
             processo_str = dados_consolidados['processo']
-        match = re.search(r'(\d{1,3}(?:\.\d{3})*,?\d*|\d+)\s*p/h', processo_str)
-        if match:
-            media_str = match.group(1).replace('.', '').replace(',', '.')
-            try:
-                media_ph = float(media_str)
-            except Exception:
-                media_ph = 0
+        velocidade = parse_speed(processo_str)
+        if velocidade is not None:
+            media_ph = velocidade
     if media_ph > 0 and total_qtd_produzida > 0:
         qtd_por_minuto = media_ph / 60
         tempo_programado = total_qtd_produzida / qtd_por_minuto
@@ -1,6 +1,8 @@
 """
 OP analysis module.
 Contains functions for generating the OP analysis section of the report.
+Os registros por OP (montar_registros_ops) são calculados uma vez e
+formatados em texto por formatar_secao_ops.
 """
 
 from .efficiency import (
@@ -9,243 +11,310 @@ from .efficiency import (
     calculate_setup_time,
     consolidar_dados_op
 )
-import unidecode
 from src.core.metrics.utils import formatar_quantidade
+from src.core.metrics.parsing import speed_label
 
-def generate_ops_section(ops_analise, grupos_para_analise, df):
-    """Generate OPs analysis section with corrected formulas and per-entry analysis"""
-    from src.core.data.data_processor import to_float, tempo_para_minutos
-    section = "🎯 ANÁLISE DETALHADA POR ORDEM DE PRODUÇÃO\n"
-    section += "=" * 80 + "\n\n"
-    
+# Campos de consolidar_dados_op copiados para o registro da OP
+CAMPOS_CONSOLIDADOS = (
+    'tempo_total_producao', 'tempo_setup', 'tempo_setup_programado', 'qtd_produzida',
+    'velocidade_real', 'velocidade_nominal', 'tempo_programado_producao', 'ganho_producao',
+    'ganho_setup', 'acerto_sem_producao', 'tem_producao', 'tem_acerto')
+
+def _colunas_entrada(df, tipado):
+    """Listas por posição usadas na análise por entrada (tipadas, mais os textos brutos exibidos)."""
+    if df is None or 'Processo' not in df.columns or 'Evento' not in df.columns:
+        return None
+    if tipado is None:
+        from src.core.data.typed_frame import construir_frame_tipado
+        tipado = construir_frame_tipado(df)
+    colunas = {nome: tipado[nome].tolist() for nome in (
+        'processo', 'chave_entrada', 'evento_acerto', 'evento_producao', 'tempo_min',
+        'tempo_setup_min', 'qtd_produzida_f')}
+    for nome, coluna in (('tempo_bruto', 'Tempo'), ('tempo_setup_bruto', 'Tempo Setup'),
+                         ('media_bruta', 'Média Produção'), ('tempo_aux_bruto', 'Tempo (min)')):
+        colunas[nome] = df[coluna].tolist() if coluna in df.columns else [''] * len(df)
+    return colunas
+
+def _buscar_producao_vizinha(colunas, idx_atual, op_linhas):
+    for idx_next in op_linhas:
+        if idx_next > idx_atual and colunas['evento_producao'][idx_next]:
+            return idx_next
+    for idx_prev in reversed(op_linhas):
+        if idx_prev < idx_atual and colunas['evento_producao'][idx_prev]:
+            return idx_prev
+    return None
+
+def _velocidade_programada(colunas, idx, op_linhas):
+    """Rótulo 'N p/h' da entrada: a própria linha, a produção vizinha ou a primeira linha da OP com média."""
+    vel_prog_str = '—'
+    media_produzida = colunas['media_bruta'][idx]
+    if media_produzida:
+        vel_prog_str = speed_label(str(media_produzida)) or vel_prog_str
+    if vel_prog_str == '—':
+        idx_vizinha = _buscar_producao_vizinha(colunas, idx, op_linhas)
+        if idx_vizinha is not None:
+            media_prod_vizinha = colunas['media_bruta'][idx_vizinha]
+            if media_prod_vizinha:
+                vel_prog_str = speed_label(str(media_prod_vizinha)) or vel_prog_str
+    if vel_prog_str == '—':
+        for idx_op in op_linhas:
+            media_prod_op = colunas['media_bruta'][idx_op]
+            if media_prod_op:
+                rotulo = speed_label(str(media_prod_op))
+                if rotulo:
+                    vel_prog_str = rotulo
+                    break
+    return vel_prog_str
+
+def _velocidade_real_entrada(colunas, idx_acerto, processo, op_linhas):
+    """Velocidade (p/h) das produções entre o acerto e o próximo acerto de outro processo (None sem produção)."""
+    from src.core.data.data_processor import to_float
+    idx_prox_acerto = None
+    for idx_next in op_linhas:
+        if idx_next > idx_acerto and colunas['evento_acerto'][idx_next] and \
+                colunas['processo'][idx_next].strip().lower() != processo.lower():
+            idx_prox_acerto = idx_next
+            break
+    qtd_total = 0.0
+    tempo_total = 0.0
+    for idx_prod in op_linhas:
+        if idx_prod > idx_acerto and (idx_prox_acerto is None or idx_prod < idx_prox_acerto):
+            if colunas['evento_producao'][idx_prod]:
+                qtd_total += colunas['qtd_produzida_f'][idx_prod]
+                tempo_aux = colunas['tempo_aux_bruto'][idx_prod]
+                if tempo_aux not in [None, '', 0]:
+                    tempo_total += to_float(tempo_aux)
+                else:
+                    tempo_total += colunas['tempo_min'][idx_prod]
+    if tempo_total > 0 and qtd_total > 0:
+        return qtd_total / tempo_total * 60
+    return None
+
+def _entradas_op(colunas, op_linhas):
+    """Registros da análise por entrada (vazio quando a OP tem uma única entrada distinta)."""
+    if colunas is None:
+        return []
+    entradas = []
+    entradas_chaves = set()
+    for idx in op_linhas:
+        processo = colunas['processo'][idx].strip()
+        if colunas['evento_acerto'][idx] and processo:
+            chave_entrada = colunas['chave_entrada'][idx]
+            entradas.append((processo, idx))
+            entradas_chaves.add(chave_entrada)
+    # Só há ANÁLISE POR ENTRADA se houver mais de uma entrada distinta
+    if len(entradas_chaves) <= 1:
+        return []
+    registros = []
+    for i, (processo, idx) in enumerate(entradas, 1):
+        tempo_real_min = colunas['tempo_min'][idx]
+        tempo_prog_min = colunas['tempo_setup_min'][idx]
+        registros.append({
+            'numero': i,
+            'processo': processo,
+            'tempo_setup_programado': colunas['tempo_setup_bruto'][idx],
+            'tempo_setup_real': colunas['tempo_bruto'][idx],
+            'tempo_setup_programado_min': tempo_prog_min,
+            'tempo_setup_real_min': tempo_real_min,
+            'diferenca_min': tempo_real_min - tempo_prog_min,
+            'velocidade_programada': _velocidade_programada(colunas, idx, op_linhas),
+            'velocidade_real': _velocidade_real_entrada(colunas, idx, processo, op_linhas),
+        })
+    return registros
+
+def _tem_evento_acerto(df, op_numero_original, colunas, op_linhas):
+    """Algum evento de acerto nas linhas da OP (as linhas do grupo são todas as da OS)."""
+    if colunas is not None:
+        return any(colunas['evento_acerto'][idx] for idx in op_linhas)
+    if 'Evento' not in df.columns:
+        return False
+    op_col = 'OS' if 'OS' in df.columns else 'OP'
+    mask_op = df[op_col] == op_numero_original
+    eventos_op = df.loc[mask_op, 'Evento'].astype(str).str.lower()
+    return bool(eventos_op.str.contains('acerto').any())
+
+def montar_registro_op(grupos_op, dados_op, df, colunas):
+    """
+    Build the record of one OP: consolidated totals, efficiencies, entries and groups.
+
+    Args:
+        grupos_op (list): (nome_grupo, dados) pairs of the OP
+        dados_op (dict): Output of consolidar_dados_op for the OP
+        df (pd.DataFrame): Analyzed data
+        colunas (dict | None): Output of _colunas_entrada
+
+    Returns:
+        dict: OP record (the numbers keep the types used in the text report)
+    """
+    op_numero_original = extract_op_number_original(grupos_op)
+    # Ordenar os índices das linhas da OP para garantir agrupamento correto
+    op_linhas = sorted(set([idx for nome_grupo, dados in grupos_op for idx in dados.get('linhas', [])]))
+    registro = {
+        'os': op_numero_original,
+        'cliente': dados_op['cliente'],
+        'processo': dados_op['processo'],
+    }
+    registro.update((campo, dados_op[campo]) for campo in CAMPOS_CONSOLIDADOS)
+    registro['tem_evento_acerto'] = _tem_evento_acerto(df, op_numero_original, colunas, op_linhas)
+    eficiencia = None
+    if dados_op['tempo_programado_producao'] > 0 and dados_op['tempo_total_producao'] > 0 and dados_op['qtd_produzida'] > 0:
+        eficiencia = (dados_op['tempo_programado_producao'] / dados_op['tempo_total_producao']) * 100
+    eficiencia_acerto = None
+    if dados_op['tempo_setup'] > 0:
+        if dados_op['acerto_sem_producao']:
+            eficiencia_acerto = 100.0
+        else:
+            eficiencia_acerto = (dados_op['tempo_setup_programado'] / dados_op['tempo_setup']) * 100
+    media_final = None
+    if eficiencia is not None and eficiencia_acerto is not None:
+        media_final = (eficiencia + eficiencia_acerto) / 2
+    elif eficiencia is not None or eficiencia_acerto is not None:
+        media_final = eficiencia if eficiencia is not None else eficiencia_acerto
+    registro['eficiencia_producao'] = eficiencia
+    registro['eficiencia_acerto'] = eficiencia_acerto
+    registro['media_final'] = media_final
+    registro['entradas'] = _entradas_op(colunas, op_linhas)
+    # Linhas numeradas como no relatório (a partir de 1)
+    registro['grupos'] = [{
+        'nome': nome_grupo,
+        'linhas': [i + 1 for i in dados['linhas']],
+        'tem_acerto': bool(dados['tem_acerto']),
+        'tem_producao': bool(dados['tem_producao']),
+    } for nome_grupo, dados in grupos_op]
+    return registro
+
+def montar_registros_ops(ops_analise, df, consolidados=None, tipado=None):
+    """
+    Build the per-OP records of the report, in ops_analise order.
+
+    Args:
+        ops_analise (dict): OP key -> list of (nome_grupo, dados)
+        df (pd.DataFrame): Analyzed data
+        consolidados (dict, optional): consolidar_ops result already computed for the report
+        tipado (pd.DataFrame, optional): Typed frame of df; built here when omitted
+
+    Returns:
+        list: One dict per OP (see montar_registro_op)
+    """
+    colunas = _colunas_entrada(df, tipado)
+    registros = []
     for op_key, grupos_op in ops_analise.items():
-        op_numero_original = extract_op_number_original(grupos_op)
-        section += f"📋 OP {op_numero_original}\n"
-        section += "─" * 60 + "\n"
-        dados_op = consolidar_dados_op(grupos_op, df)
-        section += f"Cliente: {dados_op['cliente']}\n"
-        section += f"Processo: {dados_op['processo']}\n"
-        # --- ANÁLISE POR ENTRADA ---
-        # Ordenar os índices das linhas da OP para garantir agrupamento correto
-        op_linhas = sorted(set([idx for nome_grupo, dados in grupos_op for idx in dados.get('linhas', [])]))
-        entradas = []
-        entradas_chaves = set()
-        if df is not None and 'Processo' in df.columns and 'Evento' in df.columns:
-            import re, unidecode
-            for idx in op_linhas:
-                row = df.iloc[idx]
-                processo = str(row.get('Processo', '')).strip()
-                evento = str(row.get('Evento', '')).strip().lower()
-                if 'acerto' in evento and processo:
-                    proc_norm = processo.lower().strip()
-                    proc_norm_sem_acento = unidecode.unidecode(proc_norm)
-                    # 1. Se contém 'entrada', usa como chave
-                    if 'entrada' in proc_norm_sem_acento:
-                        chave_entrada = proc_norm_sem_acento
-                    else:
-                        partes = re.split(r'\s*-\s*', proc_norm_sem_acento)
-                        titulo = partes[0] if partes else proc_norm_sem_acento
-                        sufixo = ''
-                        if len(partes) > 1:
-                            sufixo = partes[-1]
-                        match_suf = re.search(r'(f|v|t/r|tr|fr|fv|vr|cmyk|preto|colorido|\(.*\))$', sufixo)
-                        sufixo_final = match_suf.group(1) if match_suf else sufixo
-                        chave_entrada = f"{titulo.strip()}|{sufixo_final.strip()}"
-                    entradas.append((processo, idx, chave_entrada))
-                    entradas_chaves.add(chave_entrada)
-        # Só exibe ANÁLISE POR ENTRADA se houver mais de uma entrada distinta
-        if len(entradas_chaves) > 1:
-            section += "\n🔎 ANÁLISE POR ENTRADA:\n"
-            for i, (processo, idx, chave_entrada) in enumerate(entradas, 1):
-                row = df.iloc[idx]
-                tempo_setup_programado = row.get('Tempo Setup', '')
-                tempo_setup_real = row.get('Tempo', '')
-                media_produzida = row.get('Média Produção', '')
-                # Calcular velocidade real se possível
-                qtd_produzida = row.get('Qtd. Produzida', 0)
-                tempo_real_min = 0
-                try:
-                    tempo_real_min = tempo_para_minutos(tempo_setup_real)
-                except Exception:
-                    pass
-                velocidade_real = None
-                qtd_produzida_float = 0.0
-                try:
-                    qtd_produzida_float = to_float(qtd_produzida)
-                except Exception:
-                    pass
-                if tempo_real_min > 0 and qtd_produzida_float > 0:
-                    try:
-                        velocidade_real = qtd_produzida_float / tempo_real_min * 60
-                    except Exception:
-                        velocidade_real = None
-                # Calcular diferença entre programado e real (em minutos)
-                tempo_prog_min = 0
-                try:
-                    tempo_prog_min = tempo_para_minutos(tempo_setup_programado)
-                except Exception:
-                    pass
-                diff_min = tempo_real_min - tempo_prog_min
-                # Extrair apenas o número da velocidade programada
-                import re
-                vel_prog_str = '—'
-                vel_real_str = '0 p/h'
-                def buscar_producao_vizinha(idx_atual, op_linhas):
-                    for idx_next in op_linhas:
-                        if idx_next > idx_atual:
-                            row_next = df.iloc[idx_next]
-                            evento_next = str(row_next.get('Evento', '')).strip().lower()
-                            if 'producao' in unidecode.unidecode(evento_next):
-                                return row_next
-                    for idx_prev in reversed(op_linhas):
-                        if idx_prev < idx_atual:
-                            row_prev = df.iloc[idx_prev]
-                            evento_prev = str(row_prev.get('Evento', '')).strip().lower()
-                            if 'producao' in unidecode.unidecode(evento_prev):
-                                return row_prev
-                    return None
-                if media_produzida:
-                    match = re.search(r'(\d+[\.,]?\d*)', str(media_produzida))
-                    if match:
-                        vel_prog_str = f"{match.group(1).replace(',', '')} p/h"
-                if vel_prog_str == '—':
-                    prod_vizinha = buscar_producao_vizinha(idx, op_linhas)
-                    if prod_vizinha is not None:
-                        media_prod_vizinha = prod_vizinha.get('Média Produção', '')
-                        if media_prod_vizinha:
-                            match = re.search(r'(\d+[\.,]?\d*)', str(media_prod_vizinha))
-                            if match:
-                                vel_prog_str = f"{match.group(1).replace(',', '')} p/h"
-                if vel_prog_str == '—':
-                    for idx_op in op_linhas:
-                        row_op = df.iloc[idx_op]
-                        media_prod_op = row_op.get('Média Produção', '')
-                        if media_prod_op:
-                            match = re.search(r'(\d+[\.,]?\d*)', str(media_prod_op))
-                            if match:
-                                vel_prog_str = f"{match.group(1).replace(',', '')} p/h"
-                                break
-                match_entrada = re.match(r'(\d+ª entrada)', processo.lower())
-                entrada_id = match_entrada.group(1) if match_entrada else ''
-                vel_real_str = '0 p/h'
-                idx_acerto = idx
-                idx_prox_acerto = None
-                for idx_next in op_linhas:
-                    if idx_next > idx_acerto:
-                        row_next = df.iloc[idx_next]
-                        evento_next = str(row_next.get('Evento', '')).strip().lower()
-                        processo_next = str(row_next.get('Processo', '')).strip().lower()
-                        if 'acerto' in evento_next and processo_next != processo.lower():
-                            idx_prox_acerto = idx_next
-                            break
-                def normaliza_proc(proc):
-                    p = unidecode.unidecode(str(proc)).lower().replace('1°', '1a').replace('1ª', '1a').replace('2°', '2a').replace('2ª', '2a').replace('3°', '3a').replace('3ª', '3a').replace('4°', '4a').replace('4ª', '4a')
-                    return ' '.join(p.split())
-                proc_entrada = normaliza_proc(processo)
-                qtd_total = 0.0
-                tempo_total = 0.0
-                encontrou_producao = False
-                for idx_prod in op_linhas:
-                    if idx_prod > idx_acerto and (idx_prox_acerto is None or idx_prod < idx_prox_acerto):
-                        row_prod = df.iloc[idx_prod]
-                        evento_prod = str(row_prod.get('Evento', '')).strip().lower()
-                        evento_prod_norm = unidecode.unidecode(evento_prod)
-                        if 'producao' in evento_prod_norm:
-                            qtd_total += to_float(row_prod.get('Qtd. Produzida', 0))
-                            if 'Tempo (min)' in row_prod and row_prod['Tempo (min)'] not in [None, '', 0]:
-                                tempo_total += to_float(row_prod['Tempo (min)'])
-                            else:
-                                tempo_total += tempo_para_minutos(row_prod.get('Tempo', 0))
-                            encontrou_producao = True
-                if tempo_total > 0 and qtd_total > 0:
-                    vel_real_str = f"{(qtd_total / tempo_total * 60):.0f} p/h"
-                def format_diff(mins):
-                    if mins == 0:
-                        return '±00:00'
-                    sinal = '-' if mins > 0 else '+'
-                    mins_abs = abs(int(mins))
-                    h = mins_abs // 60
-                    m = mins_abs % 60
-                    return f"{sinal}{h:02d}:{m:02d}"
-                diff_str = format_diff(diff_min) if tempo_prog_min > 0 or tempo_real_min > 0 else '—'
-                section += f"  {i}ª entrada: {processo}\n"
-                section += f"    • Tempo acerto programado: {tempo_setup_programado}\n"
-                section += f"    • Tempo acerto real: {tempo_setup_real}\n"
-                section += f"    • Diferença: {diff_str}\n"
-                section += f"    • Velocidade programada: {vel_prog_str}\n"
-                section += f"    • Velocidade real: {vel_real_str}\n"
-        # --- FIM ANÁLISE POR ENTRADA ---
-        # Resumo geral da OP (como já existe)
-        section += f"\nTempo Produção: {dados_op['tempo_total_producao']} min ({dados_op['tempo_total_producao']/60:.1f}h)\n"
-        # Exibe tempo de setup programado apenas se houver acerto na OP
-        tem_acerto_op = False
-        if 'Evento' in df.columns:
-            op_col = 'OS' if 'OS' in df.columns else 'OP'
-            mask_op = df[op_col] == op_numero_original
-            eventos_op = df.loc[mask_op, 'Evento'].astype(str).str.lower()
-            tem_acerto_op = eventos_op.str.contains('acerto').any()
-        if tem_acerto_op and dados_op['tempo_setup_programado'] > 0:
-            section += f"Tempo de Setup Programado: {dados_op['tempo_setup_programado']} min\n"
-            section += f"Tempo de Setup Utilizado: {dados_op['tempo_setup']:.0f} min\n"
+        if consolidados is not None and op_key in consolidados:
+            dados_op = consolidados[op_key]
+        else:
+            dados_op = consolidar_dados_op(grupos_op, df)
+        registros.append(montar_registro_op(grupos_op, dados_op, df, colunas))
+    return registros
+
+def _formatar_diferenca(mins):
+    if mins == 0:
+        return '±00:00'
+    sinal = '-' if mins > 0 else '+'
+    mins_abs = abs(int(mins))
+    h = mins_abs // 60
+    m = mins_abs % 60
+    return f"{sinal}{h:02d}:{m:02d}"
+
+def _formatar_entradas(entradas):
+    section = "\n🔎 ANÁLISE POR ENTRADA:\n"
+    for entrada in entradas:
+        if entrada['tempo_setup_programado_min'] > 0 or entrada['tempo_setup_real_min'] > 0:
+            diff_str = _formatar_diferenca(entrada['diferenca_min'])
+        else:
+            diff_str = '—'
+        velocidade_real = entrada['velocidade_real']
+        vel_real_str = f"{velocidade_real:.0f} p/h" if velocidade_real is not None else '0 p/h'
+        section += f"  {entrada['numero']}ª entrada: {entrada['processo']}\n"
+        section += f"    • Tempo acerto programado: {entrada['tempo_setup_programado']}\n"
+        section += f"    • Tempo acerto real: {entrada['tempo_setup_real']}\n"
+        section += f"    • Diferença: {diff_str}\n"
+        section += f"    • Velocidade programada: {entrada['velocidade_programada']}\n"
+        section += f"    • Velocidade real: {vel_real_str}\n"
+    return section
+
+def formatar_registro_op(dados_op):
+    """Texto de uma OP do relatório a partir do registro de montar_registro_op."""
+    section = f"📋 OP {dados_op['os']}\n"
+    section += "─" * 60 + "\n"
+    section += f"Cliente: {dados_op['cliente']}\n"
+    section += f"Processo: {dados_op['processo']}\n"
+    if dados_op['entradas']:
+        section += _formatar_entradas(dados_op['entradas'])
+    # Resumo geral da OP
+    section += f"\nTempo Produção: {dados_op['tempo_total_producao']} min ({dados_op['tempo_total_producao']/60:.1f}h)\n"
+    # Exibe tempo de setup programado apenas se houver acerto na OP
+    if dados_op['tem_evento_acerto'] and dados_op['tempo_setup_programado'] > 0:
+        section += f"Tempo de Setup Programado: {dados_op['tempo_setup_programado']} min\n"
+        section += f"Tempo de Setup Utilizado: {dados_op['tempo_setup']:.0f} min\n"
+    else:
+        section += "Sem setup, apenas produção\n"
+    if dados_op['ganho_setup'] > 0:
+        section += f"Ganho de Setup: {dados_op['ganho_setup']} min (VÁLIDO - há produção)\n"
+    elif dados_op['ganho_setup'] < 0:
+        section += f"Atraso de Setup: {abs(dados_op['ganho_setup'])} min\n"
+    # Caso especial: OP só de acerto
+    if dados_op['acerto_sem_producao']:
+        if dados_op['ganho_setup'] < 0:
+            section += f"Atraso de Setup: {abs(dados_op['ganho_setup'])} min (NÃO VÁLIDO - sem produção, conta como 100% até o programado)\n"
         else:
-            section += "Sem setup, apenas produção\n"
-        if dados_op['ganho_setup'] > 0:
-            section += f"Ganho de Setup: {dados_op['ganho_setup']} min (VÁLIDO - há produção)\n"
-        elif dados_op['ganho_setup'] < 0:
-            section += f"Atraso de Setup: {abs(dados_op['ganho_setup'])} min\n"
-        # Caso especial: OP só de acerto
+            section += f"Setup aparentemente ganho: 0 min (NÃO VÁLIDO - sem produção, conta como 100%)\n"
+    section += f"Qtd Produzida: {formatar_quantidade(dados_op['qtd_produzida'])}\n"
+    # Velocidade real
+    if dados_op['velocidade_real'] > 0:
+        section += f"Velocidade Real: {dados_op['velocidade_real']:.0f} p/h\n"
+    if dados_op['velocidade_nominal'] > 0:
+        section += f"Velocidade Programada: {dados_op['velocidade_nominal']:.0f} p/h\n"
+    # Ganho/perda de produção
+    if dados_op['ganho_producao'] > 0:
+        section += f"Ganho de Produção: {dados_op['ganho_producao']:.0f} min\n"
+    elif dados_op['ganho_producao'] < 0:
+        section += f"Atraso de Produção: {abs(dados_op['ganho_producao']):.0f} min\n"
+    # Eficiência de produção
+    eficiencia = dados_op['eficiencia_producao']
+    if eficiencia is not None:
+        section += f"Eficiência de Produção: {eficiencia:.2f}%\n"
+        # Bloco MÉDIA DE PRODUÇÃO DA OP
+        section += f"\n📊 MÉDIA DE PRODUÇÃO DA OP:\n  • {eficiencia:.2f}%\n  • Minutos ganhos: {dados_op['ganho_producao']:.0f} min\n"
+    # Média de acerto da OP
+    eficiencia_acerto = dados_op['eficiencia_acerto']
+    if eficiencia_acerto is not None:
         if dados_op['acerto_sem_producao']:
-            if dados_op['ganho_setup'] < 0:
-                section += f"Atraso de Setup: {abs(dados_op['ganho_setup'])} min (NÃO VÁLIDO - sem produção, conta como 100% até o programado)\n"
-            else:
-                section += f"Setup aparentemente ganho: 0 min (NÃO VÁLIDO - sem produção, conta como 100%)\n"
-        section += f"Qtd Produzida: {formatar_quantidade(dados_op['qtd_produzida'])}\n"
-        # Velocidade real
-        if dados_op['velocidade_real'] > 0:
-            section += f"Velocidade Real: {dados_op['velocidade_real']:.0f} p/h\n"
-        if dados_op['velocidade_nominal'] > 0:
-            section += f"Velocidade Programada: {dados_op['velocidade_nominal']:.0f} p/h\n"
-        # Ganho/perda de produção
-        if dados_op['ganho_producao'] > 0:
-            section += f"Ganho de Produção: {dados_op['ganho_producao']:.0f} min\n"
-        elif dados_op['ganho_producao'] < 0:
-            section += f"Atraso de Produção: {abs(dados_op['ganho_producao']):.0f} min\n"
-        # Eficiência de produção
-        eficiencia = None
-        if dados_op['tempo_programado_producao'] > 0 and dados_op['tempo_total_producao'] > 0 and dados_op['qtd_produzida'] > 0:
-            eficiencia = (dados_op['tempo_programado_producao'] / dados_op['tempo_total_producao']) * 100
-            section += f"Eficiência de Produção: {eficiencia:.2f}%\n"
-            # Bloco MÉDIA DE PRODUÇÃO DA OP
-            section += f"\n📊 MÉDIA DE PRODUÇÃO DA OP:\n  • {eficiencia:.2f}%\n  • Minutos ganhos: {dados_op['ganho_producao']:.0f} min\n"
-        # Média de acerto da OP
-        eficiencia_acerto = None
-        if dados_op['tempo_setup'] > 0:
-            tempo_setup_programado = dados_op['tempo_setup_programado']
-            if dados_op['acerto_sem_producao']:
-                eficiencia_acerto = 100.0
-                section += f"⚙️ MÉDIA DE ACERTO DA OP:\n  • {eficiencia_acerto:.1f}% (considerado como exato - sem produção)\n  • Observação: Ganho não contabilizado pois não há produção\n"
-            else:
-                eficiencia_acerto = (tempo_setup_programado / dados_op['tempo_setup']) * 100 if dados_op['tempo_setup'] else 0
-                section += f"⚙️ MÉDIA DE ACERTO DA OP:\n  • {eficiencia_acerto:.1f}%\n  • Minutos ganhos: {dados_op['ganho_setup']} min {'(VÁLIDO)' if dados_op['tempo_total_producao'] > 0 else ''}\n"
-        # Média final da OP
-        if eficiencia is not None or eficiencia_acerto is not None:
-            if eficiencia is not None and eficiencia_acerto is not None:
-                media_final = (eficiencia + eficiencia_acerto) / 2
-                section += f"\n🎯 MÉDIA FINAL DA OP:\n  • Média: {media_final:.1f}% {'🟢 EXCELENTE' if media_final >= 100 else '⚠️ REGULAR' if media_final >= 70 else '❌ INSATISFATÓRIO'}\n  • Fórmula: {eficiencia:.1f}% + {eficiencia_acerto:.1f}% / 2 = {media_final:.1f}%\n    - Produção: {dados_op['ganho_producao']:.0f} min\n    - Acerto: {dados_op['ganho_setup']} min\n"
-            elif eficiencia is not None:
-                section += f"\n🎯 MÉDIA FINAL DA OP:\n  • Média: {eficiencia:.1f}%\n  • Apenas produção nesta OP\n    - Produção: {dados_op['ganho_producao']:.0f} min\n"
-            elif eficiencia_acerto is not None:
-                section += f"\n🎯 MÉDIA FINAL DA OP:\n  • Média: {eficiencia_acerto:.1f}%\n  • Apenas acerto nesta OP\n    - Acerto: {dados_op['ganho_setup']} min\n"
-        # Grupos desta OP
-        section += "\n📁 Grupos desta OP:\n"
-        for nome_grupo, dados in grupos_op:
-            if dados['tem_acerto']:
-                section += f"  • Acerto: linha(s) {', '.join(str(i+1) for i in dados['linhas'])}\n"
-            if dados['tem_producao']:
-                section += f"  • Produção: linha(s) {', '.join(str(i+1) for i in dados['linhas'])}\n"
-        section += "\n" + "="*60 + "\n\n"
+            section += f"⚙️ MÉDIA DE ACERTO DA OP:\n  • {eficiencia_acerto:.1f}% (considerado como exato - sem produção)\n  • Observação: Ganho não contabilizado pois não há produção\n"
+        else:
+            section += f"⚙️ MÉDIA DE ACERTO DA OP:\n  • {eficiencia_acerto:.1f}%\n  • Minutos ganhos: {dados_op['ganho_setup']} min {'(VÁLIDO)' if dados_op['tempo_total_producao'] > 0 else ''}\n"
+    # Média final da OP
+    media_final = dados_op['media_final']
+    if eficiencia is not None and eficiencia_acerto is not None:
+        section += f"\n🎯 MÉDIA FINAL DA OP:\n  • Média: {media_final:.1f}% {'🟢 EXCELENTE' if media_final >= 100 else '⚠️ REGULAR' if media_final >= 70 else '❌ INSATISFATÓRIO'}\n  • Fórmula: {eficiencia:.1f}% + {eficiencia_acerto:.1f}% / 2 = {media_final:.1f}%\n    - Produção: {dados_op['ganho_producao']:.0f} min\n    - Acerto: {dados_op['ganho_setup']} min\n"
+    elif eficiencia is not None:
+        section += f"\n🎯 MÉDIA FINAL DA OP:\n  • Média: {eficiencia:.1f}%\n  • Apenas produção nesta OP\n    - Produção: {dados_op['ganho_producao']:.0f} min\n"
+    elif eficiencia_acerto is not None:
+        section += f"\n🎯 MÉDIA FINAL DA OP:\n  • Média: {eficiencia_acerto:.1f}%\n  • Apenas acerto nesta OP\n    - Acerto: {dados_op['ganho_setup']} min\n"
+    # Grupos desta OP
+    section += "\n📁 Grupos desta OP:\n"
+    for grupo in dados_op['grupos']:
+        linhas = ', '.join(str(i) for i in grupo['linhas'])
+        if grupo['tem_acerto']:
+            section += f"  • Acerto: linha(s) {linhas}\n"
+        if grupo['tem_producao']:
+            section += f"  • Produção: linha(s) {linhas}\n"
+    section += "\n" + "="*60 + "\n\n"
     return section
 
+def formatar_secao_ops(registros):
+    """Texto da seção de OPs a partir dos registros de montar_registros_ops."""
+    section = "🎯 ANÁLISE DETALHADA POR ORDEM DE PRODUÇÃO\n"
+    section += "=" * 80 + "\n\n"
+    return section + ''.join(formatar_registro_op(registro) for registro in registros)
+
+def generate_ops_section(ops_analise, grupos_para_analise, df, consolidados=None, tipado=None):
+    """
+    Generate OPs analysis section with corrected formulas and per-entry analysis.
+    consolidados: resultado de consolidar_ops já calculado no relatório (opcional).
+    tipado: frame tipado de df (construir_frame_tipado); construído aqui quando omitido.
+    """
+    return formatar_secao_ops(montar_registros_ops(ops_analise, df, consolidados, tipado))
+
 def extract_op_number_original(grupos_op):
     """Extract original OP number keeping format"""
     for nome_grupo, dados in grupos_op:
@@ -33,6 +33,19 @@ def calculate_available_time(hora_inicio, hora_fim, intervalo):
     total = int((dt_fim - dt_inicio).total_seconds() // 60) - int(intervalo)
     return total
 
+def tempo_disponivel(report_config):
+    """
+    Available minutes of a report configuration.
+
+    Com 'turnos' (calendário) são os minutos de turno do mapa do dia; sem ele,
+    a janela hora_inicio → hora_fim menos o intervalo (calculate_available_time).
+    """
+    turnos = report_config.get('turnos')
+    if turnos is not None:
+        return turnos.disponivel
+    return calculate_available_time(report_config.get('hora_inicio'), report_config.get('hora_fim'),
+                                    report_config.get('intervalo', 60))
+
 def generate_period_section(hora_inicio, hora_fim, intervalo, tempo_disponivel):
     """Generate period section of the report, showing date+hour if present."""
     section = "⏰ PERÍODO DE TRABALHO\n"
@@ -0,0 +1,57 @@
+"""
+Timeline section module.
+Contains the report section built from the Início/Término timeline
+(see src.core.metrics.timeline.analisar_linha_do_tempo).
+"""
+
+# Maiores lacunas listadas no texto (o modelo guarda todas)
+MAX_LACUNAS = 5
+LARGURA_BARRA = 20
+
+def _barra(utilizacao):
+    cheios = int(round(min(max(utilizacao, 0.0), 100.0) / 100 * LARGURA_BARRA))
+    return '█' * cheios + '·' * (LARGURA_BARRA - cheios)
+
+def _origem_lacuna(lacuna):
+    if lacuna['registrado_min'] == 0:
+        return 'sem registro'
+    if lacuna['registrado_min'] >= lacuna['minutos']:
+        return 'pausa registrada'
+    return f"{lacuna['registrado_min']} min registrados"
+
+def generate_timeline_section(linha_do_tempo):
+    """Generate the timeline section (real occupation, gaps and hourly utilization)."""
+    if not linha_do_tempo:
+        return ''
+    janela_min = linha_do_tempo['janela_min']
+    ocupado = linha_do_tempo['ocupado_min']
+    percentual = ocupado / janela_min * 100 if janela_min else 0.0
+    section = "🕒 LINHA DO TEMPO (Início/Término)\n"
+    section += "─" * 60 + "\n"
+    section += (f"Janela do turno:          {linha_do_tempo['janela_inicio']:%d/%m %H:%M} → "
+                f"{linha_do_tempo['janela_fim']:%d/%m %H:%M} ({janela_min} min)\n")
+    section += f"Tempo ocupado (real):     {ocupado:>5} min  ({percentual:>5.1f}% da janela)\n"
+    section += (f"Tempo ocioso (real):      {linha_do_tempo['ocioso_min']:>5} min  "
+                f"(descontado o intervalo de {linha_do_tempo['intervalo']} min)\n")
+    section += f"Sem nenhum registro:      {linha_do_tempo['sem_registro_min']:>5} min\n"
+    section += f"Sobreposição de eventos:  {linha_do_tempo['sobreposicao_min']:>5} min\n"
+    section += f"Fora da janela do turno:  {linha_do_tempo['fora_da_janela_min']:>5} min\n"
+
+    maiores = sorted(linha_do_tempo['lacunas'], key=lambda l: -l['minutos'])[:MAX_LACUNAS]
+    if maiores:
+        section += "\nMaiores lacunas sem acerto/produção:\n"
+        for lacuna in sorted(maiores, key=lambda l: l['inicio']):
+            section += (f"  • {lacuna['inicio']:%H:%M} → {lacuna['fim']:%H:%M}  "
+                        f"{lacuna['minutos']:>4} min ({_origem_lacuna(lacuna)})\n")
+
+    if linha_do_tempo['por_hora']:
+        section += "\nUtilização por hora:\n"
+        for hora in linha_do_tempo['por_hora']:
+            if not hora['minutos']:
+                # Hora inteira em pausa no calendário de turnos
+                section += f"  {hora['inicio']:%H:%M}  {'':{LARGURA_BARRA}}  fora do turno\n"
+                continue
+            section += (f"  {hora['inicio']:%H:%M}  {_barra(hora['utilizacao'])} {hora['utilizacao']:>5.1f}%"
+                        f"  ({hora['ocupado_min']}/{hora['minutos']} min)\n")
+    section += "\n"
+    return section
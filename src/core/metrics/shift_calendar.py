@@ -0,0 +1,344 @@
+"""
+Shift calendar.
+Turnos por máquina e dia da semana, com pausas e feriados, lidos de um JSON.
+Cada dia vira um mapa de minutos (bitmap de 2 dias, pois turnos da noite
+passam da meia-noite); os mapas por dia da semana são montados uma vez por
+máquina e um período inteiro é resolvido por indexação. Cada análise recebe
+o mapa do seu dia (TurnosDoDia), que a linha do tempo cruza minuto a minuto
+com os eventos para o tempo disponível e a utilização por hora.
+
+Formato do arquivo:
+
+    {
+      "turnos": {
+        "padrao": [
+          {"nome": "1º turno", "dias": ["seg", "ter", "qua", "qui", "sex"],
+           "inicio": "06:00", "fim": "14:00", "pausas": [["09:00", "09:15"]]},
+          {"nome": "3º turno", "dias": ["seg", "ter", "qua", "qui", "sex"],
+           "inicio": "22:00", "fim": "06:00", "pausas": [["02:00", "02:30"]]}
+        ],
+        "bobst": [...]
+      },
+      "feriados": ["2025-06-19", "25/12/2025"],
+      "feriados_maquina": {"komori": ["20/06/2025"]}
+    }
+
+A shift belongs to the day it starts on; 'padrao' applies to the machines
+without their own list. 'dias' defaults to every day of the week.
+"""
+
+import os
+import json
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+MINUTOS_DIA = 24 * 60
+# Um dia mais o que os turnos iniciados nele avançam sobre o dia seguinte
+MINUTOS_MAPA = 2 * MINUTOS_DIA
+
+DIAS_SEMANA = {
+    'seg': 0, 'segunda': 0, 'ter': 1, 'terca': 1, 'terça': 1, 'qua': 2, 'quarta': 2,
+    'qui': 3, 'quinta': 3, 'sex': 4, 'sexta': 4, 'sab': 5, 'sáb': 5, 'sabado': 5, 'sábado': 5,
+    'dom': 6, 'domingo': 6,
+}
+
+PADRAO = 'padrao'
+
+def _minutos_hora(valor):
+    """'HH:MM' -> minutos desde 00:00."""
+    try:
+        hora, minuto = str(valor).strip().split(':')
+        hora, minuto = int(hora), int(minuto)
+    except ValueError:
+        raise ValueError(f"Horário inválido no calendário: {valor!r} (use HH:MM)")
+    if not (0 <= hora <= 24 and 0 <= minuto <= 59) or hora * 60 + minuto > MINUTOS_DIA:
+        raise ValueError(f"Horário inválido no calendário: {valor!r}")
+    return hora * 60 + minuto
+
+def _dia(valor):
+    """'DD/MM/YYYY' ou 'YYYY-MM-DD' -> numpy.datetime64 (dia)."""
+    texto = str(valor).strip()
+    formato = '%d/%m/%Y' if '/' in texto else '%Y-%m-%d'
+    try:
+        return np.datetime64(datetime.strptime(texto, formato).date(), 'D')
+    except ValueError:
+        raise ValueError(f"Data inválida no calendário: {valor!r} (use DD/MM/YYYY ou YYYY-MM-DD)")
+
+def dias(datas):
+    """Datas ('DD/MM/YYYY', 'YYYY-MM-DD' ou datetime64) -> vetor datetime64[D]."""
+    if isinstance(datas, np.ndarray) and np.issubdtype(datas.dtype, np.datetime64):
+        return datas.astype('datetime64[D]')
+    return np.array([_dia(d) for d in datas], dtype='datetime64[D]')
+
+def dia_da_semana(dias_):
+    """Segunda = 0 ... domingo = 6 (01/01/1970 foi uma quinta-feira)."""
+    return (dias_.astype(np.int64) + 3) % 7
+
+class Turno:
+    """
+    One shift of the calendar.
+
+    Args:
+        inicio (str): Start 'HH:MM'
+        fim (str): End 'HH:MM'; at or before the start means the next day
+        pausas (list): [inicio, fim] 'HH:MM' pairs inside the shift
+        dias (list, optional): Weekdays ('seg'..'dom' or 0..6); default every day
+        nome (str): Label
+    """
+
+    def __init__(self, inicio, fim, pausas=(), dias=None, nome=''):
+        self.nome = nome
+        self.inicio = _minutos_hora(inicio)
+        self.fim = _minutos_hora(fim)
+        if self.fim <= self.inicio:
+            self.fim += MINUTOS_DIA
+        self.dias = self._dias_semana(dias)
+        self.pausas = []
+        for pausa in pausas:
+            pausa_inicio, pausa_fim = (_minutos_hora(h) for h in pausa)
+            # Pausas de turnos da noite depois da meia-noite
+            if pausa_inicio < self.inicio:
+                pausa_inicio += MINUTOS_DIA
+            if pausa_fim <= pausa_inicio:
+                pausa_fim += MINUTOS_DIA
+            self.pausas.append((max(pausa_inicio, self.inicio), min(pausa_fim, self.fim)))
+
+    def __repr__(self):
+        return f"Turno({self.nome!r}, {self.inicio}-{self.fim} min, dias={sorted(self.dias)})"
+
+    @staticmethod
+    def _dias_semana(dias_):
+        if not dias_:
+            return frozenset(range(7))
+        resultado = set()
+        for dia in dias_:
+            if isinstance(dia, int) and 0 <= dia <= 6:
+                resultado.add(dia)
+                continue
+            chave = str(dia).strip().lower()
+            if chave not in DIAS_SEMANA:
+                raise ValueError(f"Dia da semana inválido no calendário: {dia!r}")
+            resultado.add(DIAS_SEMANA[chave])
+        return frozenset(resultado)
+
+    @classmethod
+    def de_dict(cls, dados):
+        if 'inicio' not in dados or 'fim' not in dados:
+            raise ValueError(f"Turno sem 'inicio'/'fim' no calendário: {dados!r}")
+        return cls(dados['inicio'], dados['fim'], dados.get('pausas', ()), dados.get('dias'), dados.get('nome', ''))
+
+    def marcar(self, mapa):
+        """Marca os minutos trabalhados do turno num mapa de MINUTOS_MAPA posições."""
+        mapa[self.inicio:self.fim] = True
+        for pausa_inicio, pausa_fim in self.pausas:
+            mapa[pausa_inicio:pausa_fim] = False
+
+class CalendarioTurnos:
+    """
+    Shifts per machine and weekday, with breaks and holidays.
+
+    Args:
+        turnos (dict): Machine name (or 'padrao') -> list of Turno
+        feriados (iterable): Dates without shifts for every machine
+        feriados_maquina (dict, optional): Machine name -> dates without shifts
+    """
+
+    def __init__(self, turnos, feriados=(), feriados_maquina=None):
+        from src.core.metrics.maquinas.registro import resolver_alias
+        self.turnos = {(chave if chave == PADRAO else resolver_alias(chave)): lista
+                       for chave, lista in turnos.items()}
+        self.feriados = dias(list(feriados))
+        self.feriados_maquina = {resolver_alias(maquina): dias(list(datas))
+                                 for maquina, datas in (feriados_maquina or {}).items()}
+        self._modelos = {}
+
+    def turnos_da_maquina(self, maquina):
+        """Turnos da máquina (ou os do 'padrao'); lista vazia sem nenhum dos dois."""
+        from src.core.metrics.maquinas.registro import resolver_alias
+        return self.turnos.get(resolver_alias(maquina), self.turnos.get(PADRAO, []))
+
+    def modelos_semana(self, maquina):
+        """
+        Minute maps of the machine for each weekday, built once.
+
+        Returns:
+            np.ndarray: (7, MINUTOS_MAPA) bool; row 0 is Monday
+        """
+        from src.core.metrics.maquinas.registro import resolver_alias
+        chave = resolver_alias(maquina)
+        modelos = self._modelos.get(chave)
+        if modelos is None:
+            modelos = np.zeros((7, MINUTOS_MAPA), dtype=bool)
+            for turno in self.turnos_da_maquina(maquina):
+                for dia in turno.dias:
+                    turno.marcar(modelos[dia])
+            modelos.setflags(write=False)
+            self._modelos[chave] = modelos
+        return modelos
+
+    def mapas(self, maquina, datas):
+        """
+        Minute maps of the shifts that start on each date (holidays are empty).
+
+        Args:
+            maquina (str): Machine name or alias
+            datas (iterable): Dates (see dias)
+
+        Returns:
+            np.ndarray: (len(datas), MINUTOS_MAPA) bool; column 0 is 00:00 of the date
+        """
+        from src.core.metrics.maquinas.registro import resolver_alias
+        datas = dias(datas)
+        resultado = self.modelos_semana(maquina)[dia_da_semana(datas)]
+        feriados = self.feriados
+        extras = self.feriados_maquina.get(resolver_alias(maquina))
+        if extras is not None:
+            feriados = np.concatenate((feriados, extras))
+        if len(feriados):
+            resultado[np.isin(datas, feriados)] = False
+        return resultado
+
+    def minutos_disponiveis(self, maquina, datas):
+        """Available minutes of the shifts that start on each date (int64 array)."""
+        return self.mapas(maquina, datas).sum(axis=1, dtype=np.int64)
+
+    def turnos_do_dia(self, maquina, data):
+        """
+        Shift minutes of one date, for the analysis of that (date, machine).
+
+        Args:
+            maquina (str): Machine name or alias
+            data (str): Date in format DD/MM/YYYY
+
+        Returns:
+            TurnosDoDia | None: None when the date has no shift (holiday, day off)
+        """
+        mapa = self.mapas(maquina, [data])[0]
+        trabalhados = np.flatnonzero(mapa)
+        if len(trabalhados) == 0:
+            return None
+        primeiro, ultimo = int(trabalhados[0]), int(trabalhados[-1]) + 1
+        inicio_dia = int(_dia(data).astype(np.int64)) * MINUTOS_DIA
+        return TurnosDoDia(data, inicio_dia + primeiro, mapa[primeiro:ultimo].copy())
+
+class TurnosDoDia:
+    """
+    Shift minutes of one date: the window from the first shift start to the
+    last shift end and, minute by minute, whether it is shift time.
+
+    Minutos False dentro da janela são pausas ou folgas entre turnos; a análise
+    usa o mapa para o tempo disponível e para a utilização por hora.
+
+    Args:
+        data (str): Date in format DD/MM/YYYY
+        inicio (int): Window start, in minutes since the epoch
+        mapa (np.ndarray): bool per window minute (True = shift time)
+    """
+
+    def __init__(self, data, inicio, mapa):
+        self.data = data
+        self.inicio = int(inicio)
+        self.mapa = np.asarray(mapa, dtype=bool)
+        self.fim = self.inicio + len(self.mapa)
+        self.disponivel = int(self.mapa.sum())
+
+    def __repr__(self):
+        return f"TurnosDoDia({self.data}, {self.hora_inicio} → {self.hora_fim}, {self.disponivel} min)"
+
+    @property
+    def janela_min(self):
+        return self.fim - self.inicio
+
+    @property
+    def intervalo(self):
+        """Minutos da janela fora de turno (pausas e folgas entre turnos)."""
+        return self.janela_min - self.disponivel
+
+    @property
+    def hora_inicio(self):
+        return _formatar_minuto(self.inicio)
+
+    @property
+    def hora_fim(self):
+        return _formatar_minuto(self.fim)
+
+def _formatar_minuto(minuto):
+    """Minutos desde a época -> 'DD/MM/YYYY HH:MM'."""
+    return np.datetime64(int(minuto), 'm').astype(datetime).strftime('%d/%m/%Y %H:%M')
+
+def calendario_de_dict(dados):
+    """
+    Build a calendar from the parsed JSON (see the module docstring).
+
+    Raises:
+        ValueError: If a shift, weekday, time or date is invalid
+    """
+    if not isinstance(dados, dict) or not isinstance(dados.get('turnos'), dict):
+        raise ValueError("Calendário sem a seção 'turnos'")
+    turnos = {maquina: [Turno.de_dict(t) for t in lista] for maquina, lista in dados['turnos'].items()}
+    return CalendarioTurnos(turnos, dados.get('feriados', ()), dados.get('feriados_maquina'))
+
+@lru_cache(maxsize=8)
+def carregar_calendario(caminho):
+    """
+    Load a calendar JSON file (cached per path within the process).
+
+    Args:
+        caminho (str): JSON file
+
+    Returns:
+        CalendarioTurnos: The calendar
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the content is invalid
+    """
+    with open(caminho, encoding='utf-8') as f:
+        try:
+            dados = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Calendário inválido ({caminho}): {e}")
+    return calendario_de_dict(dados)
+
+def caminho_calendario_padrao():
+    """
+    Calendar file used when none is given.
+
+    ANALISADOR_CALENDARIO when set; otherwise turnos.json in the user's
+    folder, if it exists. None means the hours typed in the GUI/CLI are used.
+    """
+    caminho = os.environ.get('ANALISADOR_CALENDARIO')
+    if caminho:
+        return os.path.abspath(caminho)
+    padrao = Path.home() / '.analisador_producao' / 'turnos.json'
+    return str(padrao) if padrao.is_file() else None
+
+def aplicar_calendario(config, data, maquina):
+    """
+    Attach the day's shifts to an analysis configuration.
+
+    Com config['calendario'], a análise usa config['turnos'] (TurnosDoDia) para
+    o tempo disponível e a utilização por hora, em vez de hora_inicio/hora_fim
+    e intervalo. Sem calendário, a configuração volta sem alterações.
+
+    Args:
+        config (dict): Analysis configuration
+        data (str): Date in format DD/MM/YYYY
+        maquina (str): Machine name or alias
+
+    Returns:
+        dict: The configuration (a copy when changed)
+
+    Raises:
+        ValueError: If the calendar is invalid or has no shift on the date
+        OSError: If the calendar file cannot be read
+    """
+    if not config.get('calendario') or not data or not maquina:
+        return config
+    turnos = carregar_calendario(config['calendario']).turnos_do_dia(maquina, data)
+    if turnos is None:
+        raise ValueError(f"Sem turno para {maquina} em {data} no calendário")
+    return dict(config, turnos=turnos)
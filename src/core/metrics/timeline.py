@@ -0,0 +1,317 @@
+"""
+Event timeline engine.
+Converte Início/Término das linhas do relatório em vetores de minutos
+(inteiros), une os intervalos de trabalho (acerto e produção) e mede, dentro
+da janela do turno, o tempo realmente ocupado, as lacunas, a sobreposição de
+eventos e a utilização por hora.
+
+All times are int64 minutes since the Unix epoch. Union is a sort followed by
+a running maximum of the ends (O(n log n)); coverage queries over the merged,
+disjoint intervals use prefix sums and binary search.
+"""
+
+import numpy as np
+
+# Posições dos dígitos em 'DD/MM/YYYY HH:MM' (largura fixa) e dos separadores
+_DIGITOS = (0, 1, 3, 4, 6, 7, 8, 9, 11, 12, 14, 15)
+_SEPARADORES = ((2, '/'), (5, '/'), (10, ' '), (13, ':'))
+
+def minutos_epoca(valores):
+    """
+    Parse 'DD/MM/YYYY HH:MM' values into minutes since the epoch.
+
+    O formato do PDF tem largura fixa, então os campos saem de uma matriz de
+    caracteres sem passar por strptime; só os valores fora da largura fixa
+    (ex.: '6/6/2025 06:00') vão para o pandas.
+
+    Args:
+        valores (iterable): Início or Término column
+
+    Returns:
+        tuple: (minutes as int64 array, validity mask); invalid entries are 0 and False
+    """
+    textos = [str(v).strip() for v in valores]
+    n = len(textos)
+    minutos = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return minutos, np.zeros(0, dtype=bool)
+    comprimentos = np.fromiter((len(t) for t in textos), dtype=np.int64, count=n)
+    caracteres = np.array(textos, dtype='U16').view('U1').reshape(n, 16)
+    validos = comprimentos == 16
+    for posicao, separador in _SEPARADORES:
+        validos &= caracteres[:, posicao] == separador
+    digitos = caracteres[:, _DIGITOS].view(np.int32).reshape(n, len(_DIGITOS)) - ord('0')
+    validos &= ((digitos >= 0) & (digitos <= 9)).all(axis=1)
+    digitos = np.where(validos[:, None], digitos, 0).astype(np.int64)
+    dia = digitos[:, 0] * 10 + digitos[:, 1]
+    mes = digitos[:, 2] * 10 + digitos[:, 3]
+    ano = digitos[:, 4] * 1000 + digitos[:, 5] * 100 + digitos[:, 6] * 10 + digitos[:, 7]
+    hora = digitos[:, 8] * 10 + digitos[:, 9]
+    minuto = digitos[:, 10] * 10 + digitos[:, 11]
+    validos &= (mes >= 1) & (mes <= 12) & (dia >= 1) & (hora <= 23) & (minuto <= 59)
+    mes = np.where(validos, mes, 1)
+    dia = np.where(validos, dia, 1)
+    inicio_mes = ((ano - 1970) * 12 + mes - 1).astype('datetime64[M]')
+    dias = inicio_mes.astype('datetime64[D]') + (dia - 1)
+    # 31/02 e afins caem no mês seguinte
+    validos &= dias.astype('datetime64[M]') == inicio_mes
+    minutos[validos] = dias[validos].astype(np.int64) * 1440 + hora[validos] * 60 + minuto[validos]
+    restantes = np.flatnonzero(~validos & (comprimentos > 0) & (comprimentos != 16))
+    if len(restantes):
+        import pandas as pd
+        datas = pd.to_datetime(pd.Series([textos[i] for i in restantes], dtype=object),
+                               format='%d/%m/%Y %H:%M', errors='coerce')
+        convertidas = datas.notna().to_numpy()
+        minutos[restantes[convertidas]] = datas[convertidas].to_numpy().astype('datetime64[m]').astype(np.int64)
+        validos[restantes[convertidas]] = True
+    return minutos, validos
+
+def _ordenar(inicios, fins, selecao):
+    inicios, fins = inicios[selecao], fins[selecao]
+    ordem = np.argsort(inicios, kind='stable')
+    return inicios[ordem], fins[ordem]
+
+def _ler_horarios(df):
+    """Início/Término em minutos e a máscara das linhas com os dois válidos e término >= início."""
+    inicios, validos_inicio = minutos_epoca(df['Início'])
+    fins, validos_fim = minutos_epoca(df['Término'])
+    return inicios, fins, validos_inicio & validos_fim & (fins >= inicios)
+
+def intervalos_eventos(df, mascara=None):
+    """
+    Intervals [início, término) of the rows of a report, sorted by start.
+
+    Linhas sem data válida ou com término antes do início são ignoradas.
+
+    Args:
+        df (pd.DataFrame): Report rows with 'Início' and 'Término'
+        mascara (array, optional): Boolean row selection, aligned to df positions
+
+    Returns:
+        tuple: (inicios, fins) int64 arrays
+    """
+    if df is None or 'Início' not in df.columns or 'Término' not in df.columns:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    inicios, fins, selecao = _ler_horarios(df)
+    if mascara is not None:
+        selecao = selecao & np.asarray(mascara, dtype=bool)
+    return _ordenar(inicios, fins, selecao)
+
+def unir_intervalos(inicios, fins):
+    """
+    Merge overlapping or touching intervals.
+
+    Args:
+        inicios, fins (np.ndarray): Interval bounds (any order)
+
+    Returns:
+        tuple: (inicios, fins) of disjoint intervals, sorted; empty intervals are dropped
+    """
+    inicios = np.asarray(inicios, dtype=np.int64)
+    fins = np.asarray(fins, dtype=np.int64)
+    nao_vazios = fins > inicios
+    inicios, fins = inicios[nao_vazios], fins[nao_vazios]
+    if len(inicios) == 0:
+        return inicios, fins
+    ordem = np.argsort(inicios, kind='stable')
+    inicios, fins = inicios[ordem], fins[ordem]
+    fim_corrente = np.maximum.accumulate(fins)
+    # Um novo bloco começa quando o início passa do maior término visto até a linha anterior
+    novo_bloco = np.empty(len(inicios), dtype=bool)
+    novo_bloco[0] = True
+    novo_bloco[1:] = inicios[1:] > fim_corrente[:-1]
+    posicoes = np.flatnonzero(novo_bloco)
+    ultimos = np.append(posicoes[1:] - 1, len(inicios) - 1)
+    return inicios[posicoes], fim_corrente[ultimos]
+
+def recortar(inicios, fins, janela_inicio, janela_fim):
+    """Intervals clipped to [janela_inicio, janela_fim); the ones outside become empty and are dropped."""
+    inicios = np.clip(inicios, janela_inicio, janela_fim)
+    fins = np.clip(fins, janela_inicio, janela_fim)
+    nao_vazios = fins > inicios
+    return inicios[nao_vazios], fins[nao_vazios]
+
+def cobertura_ate(inicios, fins, pontos):
+    """
+    Covered minutes before each point, for disjoint sorted intervals.
+
+    Args:
+        inicios, fins (np.ndarray): Output of unir_intervalos
+        pontos (np.ndarray): Instants (minutes)
+
+    Returns:
+        np.ndarray: Covered minutes in (-inf, ponto) for each point
+    """
+    pontos = np.asarray(pontos, dtype=np.int64)
+    if len(inicios) == 0:
+        return np.zeros(len(pontos), dtype=np.int64)
+    acumulado = np.concatenate(([0], np.cumsum(fins - inicios)))
+    # Intervalos que começam até o ponto; o último deles pode estar em andamento
+    k = np.searchsorted(inicios, pontos, side='right')
+    anterior = np.maximum(k - 1, 0)
+    parcial = np.clip(pontos - inicios[anterior], 0, fins[anterior] - inicios[anterior])
+    return np.where(k > 0, acumulado[anterior] + parcial, 0)
+
+def cobertura_por_faixa(inicios, fins, limites):
+    """Covered minutes between consecutive limits (len(limites) - 1 values)."""
+    return np.diff(cobertura_ate(inicios, fins, limites))
+
+def lacunas(inicios, fins, janela_inicio, janela_fim):
+    """
+    Gaps of the window not covered by disjoint sorted intervals.
+
+    Returns:
+        tuple: (inicios, fins) of the gaps, sorted
+    """
+    inicios, fins = recortar(inicios, fins, janela_inicio, janela_fim)
+    bordas_inicio = np.concatenate(([janela_inicio], fins))
+    bordas_fim = np.concatenate((inicios, [janela_fim]))
+    positivas = bordas_fim > bordas_inicio
+    return bordas_inicio[positivas], bordas_fim[positivas]
+
+def limites_por_hora(janela_inicio, janela_fim):
+    """Window start, each full hour inside the window and the window end."""
+    primeira_hora = (janela_inicio // 60 + 1) * 60
+    horas = np.arange(primeira_hora, janela_fim, 60, dtype=np.int64)
+    return np.concatenate(([janela_inicio], horas, [janela_fim]))
+
+def _janela(hora_inicio, hora_fim, referencia):
+    """Janela do turno em minutos; horários sem data usam o dia do primeiro evento."""
+    from datetime import datetime, timedelta
+    from src.core.metrics.report.sections.period import parse_datetime_or_time
+    base = datetime(1970, 1, 1) + timedelta(minutes=int(referencia))
+    base = base.replace(hour=0, minute=0)
+    dt_inicio = parse_datetime_or_time(hora_inicio, default_date=base)
+    dt_fim = parse_datetime_or_time(hora_fim, default_date=dt_inicio)
+    # Fim antes do início: o turno termina no dia seguinte (como em calculate_available_time)
+    if dt_fim <= dt_inicio:
+        dt_fim += timedelta(days=1)
+    epoca = datetime(1970, 1, 1)
+    return (int((dt_inicio - epoca).total_seconds() // 60), int((dt_fim - epoca).total_seconds() // 60))
+
+def mapa_intervalos(inicios, fins, janela_inicio, janela_fim):
+    """
+    Minute bitmap of disjoint sorted intervals over a window.
+
+    Args:
+        inicios, fins (np.ndarray): Output of unir_intervalos, clipped to the window
+        janela_inicio, janela_fim (int): Window bounds (minutes)
+
+    Returns:
+        np.ndarray: bool per window minute
+    """
+    # Intervalos disjuntos (unir_intervalos junta os que se tocam): +1/-1 e soma acumulada
+    bordas = np.zeros(janela_fim - janela_inicio + 1, dtype=np.int32)
+    bordas[inicios - janela_inicio] += 1
+    bordas[fins - janela_inicio] -= 1
+    return np.cumsum(bordas[:-1]) > 0
+
+def trechos(mapa, deslocamento=0):
+    """(inicios, fins) of the runs of True in a bitmap, shifted by deslocamento."""
+    bordas = np.diff(np.concatenate(([0], mapa.astype(np.int8), [0])))
+    return np.flatnonzero(bordas == 1) + deslocamento, np.flatnonzero(bordas == -1) + deslocamento
+
+def _data_hora(minutos):
+    from datetime import datetime, timedelta
+    return datetime(1970, 1, 1) + timedelta(minutes=int(minutos))
+
+def analisar_linha_do_tempo(df, hora_inicio, hora_fim, intervalo=0, tipado=None, turnos=None):
+    """
+    Measure the shift from the Início/Término timestamps.
+
+    Acerto and produção rows are work; the other rows (pauses, 'Ocioso') only
+    mark gap minutes as registered.
+
+    Com turnos (calendário), a janela e os minutos de turno vêm do mapa do dia:
+    pausas e folgas entre turnos não contam como lacuna nem como tempo
+    disponível na hora, e o trabalho feito nelas conta como fora da janela.
+
+    Args:
+        df (pd.DataFrame): Report rows
+        hora_inicio, hora_fim (str): Shift start/end ('HH:MM' or 'DD/MM/YYYY HH:MM')
+        intervalo (int): Break minutes, discounted from the idle time
+        tipado (pd.DataFrame, optional): Typed frame of df; built here when omitted
+        turnos (TurnosDoDia, optional): Shift minutes of the day (shift_calendar);
+            replaces hora_inicio, hora_fim and intervalo
+
+    Returns:
+        dict | None: None when no row has valid timestamps, otherwise:
+            janela_inicio, janela_fim (datetime), janela_min, intervalo,
+            ocupado_min (union of work inside the window), ocioso_min (window minus
+            break minus ocupado), sobreposicao_min (work minutes counted more than once),
+            fora_da_janela_min (work outside the window), sem_registro_min (window
+            minutes without any row), lacunas (list of inicio, fim, minutos,
+            registrado_min) and por_hora (list of inicio, minutos — shift minutes of
+            the hour —, ocupado_min, utilizacao)
+    """
+    if df is None or 'Início' not in df.columns or 'Término' not in df.columns:
+        return None
+    horarios_inicio, horarios_fim, validos = _ler_horarios(df)
+    if not validos.any():
+        return None
+    todos_inicios, todos_fins = _ordenar(horarios_inicio, horarios_fim, validos)
+    if tipado is None:
+        from src.core.data.typed_frame import construir_frame_tipado
+        tipado = construir_frame_tipado(df)
+    trabalho = tipado['is_acerto'].to_numpy() | tipado['is_producao'].to_numpy()
+    if turnos is not None:
+        janela_inicio, janela_fim, intervalo = turnos.inicio, turnos.fim, turnos.intervalo
+    else:
+        janela_inicio, janela_fim = _janela(hora_inicio, hora_fim, todos_inicios[0])
+    janela_min = janela_fim - janela_inicio
+
+    inicios, fins = _ordenar(horarios_inicio, horarios_fim, validos & trabalho)
+    uniao_inicios, uniao_fins = unir_intervalos(inicios, fins)
+    dentro_inicios, dentro_fins = recortar(uniao_inicios, uniao_fins, janela_inicio, janela_fim)
+    ocupado_janela = int((dentro_fins - dentro_inicios).sum())
+    recortados_inicios, recortados_fins = recortar(inicios, fins, janela_inicio, janela_fim)
+    sobreposicao = int((recortados_fins - recortados_inicios).sum()) - ocupado_janela
+
+    registrados_inicios, registrados_fins = unir_intervalos(todos_inicios, todos_fins)
+    registrados_inicios, registrados_fins = recortar(registrados_inicios, registrados_fins,
+                                                     janela_inicio, janela_fim)
+    sem_registro = janela_min - int((registrados_fins - registrados_inicios).sum())
+
+    limites = limites_por_hora(janela_inicio, janela_fim)
+    if turnos is None:
+        ocupado = ocupado_janela
+        lacunas_inicios, lacunas_fins = lacunas(dentro_inicios, dentro_fins, janela_inicio, janela_fim)
+        ocupado_hora = cobertura_por_faixa(dentro_inicios, dentro_fins, limites)
+        duracao_hora = np.diff(limites)
+    else:
+        # Interseção com o turno minuto a minuto (a janela tem no máximo dois dias)
+        em_turno = turnos.mapa
+        ocupado_mapa = mapa_intervalos(dentro_inicios, dentro_fins, janela_inicio, janela_fim)
+        trabalhado = ocupado_mapa & em_turno
+        ocupado = int(trabalhado.sum())
+        lacunas_inicios, lacunas_fins = trechos(em_turno & ~ocupado_mapa, janela_inicio)
+        posicoes = limites[:-1] - janela_inicio
+        ocupado_hora = np.add.reduceat(trabalhado.astype(np.int64), posicoes)
+        duracao_hora = np.add.reduceat(em_turno.astype(np.int64), posicoes)
+    fora_da_janela = int((uniao_fins - uniao_inicios).sum()) - ocupado
+    registrado = cobertura_ate(registrados_inicios, registrados_fins, lacunas_fins) - \
+        cobertura_ate(registrados_inicios, registrados_fins, lacunas_inicios)
+
+    return {
+        'janela_inicio': _data_hora(janela_inicio),
+        'janela_fim': _data_hora(janela_fim),
+        'janela_min': int(janela_min),
+        'intervalo': int(intervalo),
+        'ocupado_min': ocupado,
+        'ocioso_min': max(0, int(janela_min) - int(intervalo) - ocupado),
+        'sobreposicao_min': sobreposicao,
+        'fora_da_janela_min': fora_da_janela,
+        'sem_registro_min': int(sem_registro),
+        'lacunas': [{
+            'inicio': _data_hora(inicio),
+            'fim': _data_hora(fim),
+            'minutos': int(fim - inicio),
+            'registrado_min': int(minutos),
+        } for inicio, fim, minutos in zip(lacunas_inicios, lacunas_fins, registrado)],
+        'por_hora': [{
+            'inicio': _data_hora(inicio),
+            'minutos': int(duracao),
+            'ocupado_min': int(minutos),
+            'utilizacao': float(minutos) / float(duracao) * 100 if duracao else 0.0,
+        } for inicio, duracao, minutos in zip(limites[:-1], duracao_hora, ocupado_hora)],
+    }
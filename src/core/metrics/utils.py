@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import re
 
@@ -18,33 +19,187 @@ def limpar_setup_op_sem_acerto(df: pd.DataFrame) -> pd.DataFrame:
             df.loc[mask_op, 'Tempo Setup'] = ''
     return df
 
+def _como_lista(valor):
+    if valor is None:
+        return ()
+    if isinstance(valor, str):
+        return (valor,)
+    return tuple(valor)
+
+def compilar_regras(regras):
+    """
+    Compila uma especificação declarativa de regras.
+
+    Cada regra é um dict com o valor em 'valor' e, opcionalmente, os predicados
+    (todos devem valer; regra sem predicados casa sempre):
+        'processo': substring ou lista de substrings que devem estar todas no Processo
+        'processo_algum': lista de substrings das quais ao menos uma deve estar no Processo
+        'evento': substring ou lista de substrings que devem estar todas no Evento
+        'regex': expressão regular buscada no Processo
+    Processo e Evento são comparados em minúsculas. 'valor' pode ser uma string
+    ou uma função (processo, evento) -> str. A primeira regra que casar vence.
+
+    Ex: [{'processo': 'destaque', 'valor': '03:00'},
+         {'processo_algum': ['relevo + corte', 'hot stamping'], 'valor': '02:00'},
+         {'valor': '01:00'}]
+
+    Returns:
+        list: Regras compiladas, aceitas por preencher_campos_generico
+    """
+    if regras and isinstance(regras[0], _RegraCompilada):
+        return regras
+    return [_RegraCompilada(regra) for regra in regras]
+
+class _RegraCompilada:
+    def __init__(self, regra):
+        self.processo = _como_lista(regra.get('processo'))
+        self.processo_algum = _como_lista(regra.get('processo_algum'))
+        self.evento = _como_lista(regra.get('evento'))
+        regex = regra.get('regex')
+        self.regex = re.compile(regex) if isinstance(regex, str) else regex
+        self.valor = regra['valor']
+
+    def mascara(self, processo, evento):
+        """Avalia a regra para todas as linhas de uma vez."""
+        mascara = np.ones(len(processo), dtype=bool)
+        for termo in self.processo:
+            mascara &= processo.str.contains(termo, regex=False).to_numpy(dtype=bool)
+        if self.processo_algum:
+            algum = np.zeros(len(processo), dtype=bool)
+            for termo in self.processo_algum:
+                algum |= processo.str.contains(termo, regex=False).to_numpy(dtype=bool)
+            mascara &= algum
+        for termo in self.evento:
+            mascara &= evento.str.contains(termo, regex=False).to_numpy(dtype=bool)
+        if self.regex is not None:
+            mascara &= processo.str.contains(self.regex).to_numpy(dtype=bool)
+        return mascara
+
+class _RegraLambda:
+    """Adapta as regras antigas (condição, valor) ao motor vetorizado."""
+
+    def __init__(self, cond, valor):
+        self.cond = cond
+        self.valor = valor
+
+    def mascara(self, processo, evento):
+        return np.fromiter((bool(self.cond(p, e)) for p, e in zip(processo, evento)),
+                           dtype=bool, count=len(processo))
+
+def _preparar_regras(regras):
+    preparadas = []
+    for regra in regras:
+        if isinstance(regra, dict):
+            regra = _RegraCompilada(regra)
+        elif isinstance(regra, tuple):
+            regra = _RegraLambda(*regra)
+        preparadas.append(regra)
+    return preparadas
+
+def _aplicar_regras(df, coluna, regras, linhas, processo, evento):
+    """Preenche df[coluna] nas linhas selecionadas com o valor da primeira regra que casar."""
+    if not regras or not linhas.any():
+        return
+    proc_sel = processo[linhas]
+    evt_sel = evento[linhas]
+    condicoes = [regra.mascara(proc_sel, evt_sel) for regra in regras]
+    # np.select respeita a ordem: a primeira condição verdadeira vence
+    escolha = np.select(condicoes, list(range(len(regras))), default=-1)
+    if not (escolha >= 0).any():
+        return
+    valores = np.empty(len(escolha), dtype=object)
+    for i, regra in enumerate(regras):
+        casou = escolha == i
+        if not casou.any():
+            continue
+        if callable(regra.valor):
+            valores[casou] = [regra.valor(p, e) for p, e in zip(proc_sel[casou], evt_sel[casou])]
+        else:
+            valores[casou] = regra.valor
+    posicoes = np.flatnonzero(linhas)[escolha >= 0]
+    if coluna not in df.columns:
+        df[coluna] = ''
+    col = df.columns.get_loc(coluna)
+    df.iloc[posicoes, col] = valores[escolha >= 0]
+
 def preencher_campos_generico(df, regras_setup, regras_media):
     """
     Preenche Tempo Setup e Média Produção conforme regras passadas, mas só se o campo estiver vazio.
-    regras_setup: lista de tuplas (condição, valor), prioridade da primeira para a última. Ex: [(lambda proc, evt: 'destaque' in proc, '03:00'), ...]
-    regras_media: lista de tuplas (condição, valor), prioridade da primeira para a última. Ex: [(lambda proc, evt: 'micro ondulado' in proc, '2000 p/h'), ...]
+    regras_setup: regras declarativas (ver compilar_regras), prioridade da primeira para a última. Ex: [{'processo': 'destaque', 'valor': '03:00'}, ...]
+    regras_media: regras declarativas, prioridade da primeira para a última. Ex: [{'evento': 'produção', 'processo': 'micro ondulado', 'valor': '2000 p/h'}, ...]
+    Também aceita o formato antigo de tuplas (condição, valor). Ex: [(lambda proc, evt: 'destaque' in proc, '03:00'), ...]
     """
-    for idx, row in df.iterrows():
-        processo = str(row.get('Processo', '')).lower()
-        evento = str(row.get('Evento', '')).lower()
-        # Tempo Setup
-        setup_atual = str(row.get('Tempo Setup', '')).strip()
-        if 'acerto' in evento and not setup_atual:
-            for cond, valor in regras_setup:
-                if cond(processo, evento):
-                    df.at[idx, 'Tempo Setup'] = valor
-                    break
-        # Média Produção: só para linhas de produção
-        media_atual = str(row.get('Média Produção', '')).strip()
-        if 'produção' in evento:
-            if not media_atual:
-                for cond, valor in regras_media:
-                    if cond(processo, evento):
-                        df.at[idx, 'Média Produção'] = valor(processo, evento) if callable(valor) else valor
-                        break
-        else:
-            df.at[idx, 'Média Produção'] = ''
-    return df 
+    if df.empty:
+        return df
+    regras_setup = _preparar_regras(regras_setup)
+    regras_media = _preparar_regras(regras_media)
+
+    def _texto(coluna):
+        if coluna in df.columns:
+            return df[coluna].map(str)
+        return pd.Series('', index=df.index, dtype=object)
+
+    processo = _texto('Processo').str.lower()
+    evento = _texto('Evento').str.lower()
+
+    # Tempo Setup: só para linhas de acerto com o campo vazio
+    sem_setup = (_texto('Tempo Setup').str.strip() == '').to_numpy()
+    acerto = evento.str.contains('acerto', regex=False).to_numpy(dtype=bool)
+    _aplicar_regras(df, 'Tempo Setup', regras_setup, acerto & sem_setup, processo, evento)
+
+    # Média Produção: só para linhas de produção; as demais ficam vazias
+    sem_media = (_texto('Média Produção').str.strip() == '').to_numpy()
+    producao = evento.str.contains('produção', regex=False).to_numpy(dtype=bool)
+    if 'Média Produção' not in df.columns:
+        df['Média Produção'] = ''
+    if (~producao).any():
+        df.iloc[np.flatnonzero(~producao), df.columns.get_loc('Média Produção')] = ''
+    _aplicar_regras(df, 'Média Produção', regras_media, producao & sem_media, processo, evento)
+    return df
+
+def coluna_ou_vazia(df, coluna, padrao=''):
+    """Coluna do DataFrame, ou uma Series de padrao quando ela não existe (como linha.get(coluna, padrao))."""
+    if coluna in df.columns:
+        return df[coluna]
+    return pd.Series([padrao] * len(df), index=df.index, dtype=object)
+
+def _serie_objetos(valores, indice):
+    """Series object a partir de uma lista (via np.fromiter: bem mais rápido que pd.Series(lista))."""
+    return pd.Series(np.fromiter(valores, dtype=object, count=len(valores)), index=indice, copy=False)
+
+def mapear_valores(*colunas, func):
+    """
+    Apply func once per distinct combination of values across aligned columns.
+
+    Args:
+        *colunas (pd.Series): Columns with the same index
+        func (callable): Called with one value per column
+
+    Returns:
+        pd.Series: Results, with the index of the first column
+    """
+    resultados = {}
+    valores = []
+    if len(colunas) == 1:
+        # Caso mais comum: chave é o próprio valor, sem montar tuplas
+        for valor in colunas[0].tolist():
+            try:
+                valores.append(resultados[valor])
+            except KeyError:
+                resultados[valor] = func(valor)
+                valores.append(resultados[valor])
+            except TypeError:
+                valores.append(func(valor))
+        return _serie_objetos(valores, colunas[0].index)
+    for chave in zip(*(c.tolist() for c in colunas)):
+        try:
+            valores.append(resultados[chave])
+        except KeyError:
+            resultados[chave] = func(*chave)
+            valores.append(resultados[chave])
+        except TypeError:
+            valores.append(func(*chave))
+    return _serie_objetos(valores, colunas[0].index)
 
 # --- FUNÇÕES GLOBAIS UNIVERSAIS ---
 def formatar_quantidade(valor):
@@ -0,0 +1,149 @@
+"""
+Analysis pipeline module.
+Encadeia localização do PDF, extração, preparação do DataFrame e geração do
+relatório sem depender da interface gráfica.
+"""
+
+from core.extractor.file_finder import construir_caminho_pdf
+from core.extractor.pdf_cache import extrair_dados_pdf_com_cache
+from core.data.data_processor import calculate_setup_times
+from src.core.metrics.utils import limpar_setup_op_sem_acerto
+from src.core.metrics.maquinas.registro import obter_maquina, nomes_disponiveis
+from src.utils.timers import etapa, contar
+
+def preparar_dataframe(df, maquina):
+    """
+    Prepare the DataFrame read from the PDF for analysis.
+
+    Uses the first row as header, fills the 'Máquina', 'Tempo Setup' and
+    'Média Produção' columns and applies the machine-specific field rules.
+
+    Args:
+        df (pd.DataFrame): Raw data from extrair_dados_pdf
+        maquina (str): Machine name (already resolved from aliases)
+
+    Returns:
+        pd.DataFrame: Prepared data
+    """
+    if df.empty:
+        return df
+
+    with etapa('preparar_dataframe'):
+        contar('linhas_extraidas', len(df) - 1)
+        return _preparar_dataframe(df, maquina)
+
+def _preparar_dataframe(df, maquina):
+    """Corpo de preparar_dataframe, medido como uma única etapa."""
+    header = list(df.iloc[0])
+    df = df[1:].reset_index(drop=True)
+    df.columns = header
+
+    # Garante que a coluna 'Máquina' existe e está preenchida
+    valor_maquina = maquina.lower() if maquina else ''
+    if 'Máquina' not in df.columns:
+        df.insert(2, 'Máquina', valor_maquina)  # Insere na posição 2 (após 'Término')
+    else:
+        df['Máquina'] = df['Máquina'].fillna('').replace('', valor_maquina)
+        df['Máquina'] = df['Máquina'].apply(lambda x: valor_maquina if not x or (isinstance(x, str) and x.strip() == '') else (x.lower() if isinstance(x, str) else x))
+
+    # Garante que a coluna 'Tempo Setup' existe e está visível
+    if 'Tempo Setup' not in df.columns:
+        df.insert(3, 'Tempo Setup', '')  # Insere após 'Máquina'
+
+    # Garante que a coluna 'Média Produção' existe e está visível
+    if 'Média Produção' not in df.columns:
+        df.insert(4, 'Média Produção', '')  # Insere após 'Tempo Setup'
+
+    with etapa('tempos_setup'):
+        df = calculate_setup_times(df)
+
+    # Preenche campos especiais para todas as máquinas (generalizado)
+    registro = obter_maquina(valor_maquina)
+    try:
+        preencher = registro.preencher_campos if registro else None
+        if preencher is not None:
+            with etapa('regras_maquina'):
+                df = preencher(df)
+    except Exception:
+        pass
+
+    # Limpa tempo de setup de OPs sem acerto (universal para todas as máquinas)
+    with etapa('limpar_setup_sem_acerto'):
+        df = limpar_setup_op_sem_acerto(df)
+
+    # Reorganiza as colunas para garantir que 'Tempo Setup' e 'Média Produção' fiquem sempre visíveis e lado a lado
+    cols = df.columns.tolist()
+    if 'Tempo Setup' in cols and 'Média Produção' in cols:
+        idx_setup = cols.index('Tempo Setup')
+        idx_media = cols.index('Média Produção')
+        if idx_media != idx_setup + 1:
+            # Remove 'Média Produção' e insere logo após 'Tempo Setup'
+            cols.pop(idx_media)
+            cols.insert(idx_setup + 1, 'Média Produção')
+            df = df[cols]
+
+    return df
+
+def carregar_relatorio(data, maquina, workers=None):
+    """
+    Locate, extract and prepare the production data for a date and machine.
+
+    Args:
+        data (str): Date in format DD/MM/YYYY
+        maquina (str): Machine name (already resolved from aliases)
+        workers (int, optional): Worker processes for PDF extraction
+
+    Returns:
+        pd.DataFrame: Prepared data
+
+    Raises:
+        FileNotFoundError: If the PDF is not found
+    """
+    with etapa('localizar_pdf'):
+        caminho_pdf = construir_caminho_pdf(data, maquina)
+    with etapa('extrair_pdf'):
+        df = extrair_dados_pdf_com_cache(caminho_pdf, workers=workers)
+    return preparar_dataframe(df, maquina)
+
+def gerar_relatorio(df, maquina, config):
+    """
+    Run the machine-specific performance analysis.
+
+    Args:
+        df (pd.DataFrame): Prepared production data
+        maquina (str): Machine name or alias
+        config (dict): Analysis configuration (hora_inicio, hora_fim, intervalo, linhas_agrupadas)
+
+    Returns:
+        str: Formatted report
+
+    Raises:
+        ValueError: If the machine has no analysis module
+    """
+    registro = obter_maquina(maquina)
+    if registro is None or registro.calcular_desempenho is None:
+        raise ValueError(f"Máquina '{maquina}' não encontrada ou não implementada.\nMáquinas disponíveis: {nomes_disponiveis()}")
+    with etapa(f'calcular_desempenho ({registro.nome})'):
+        return registro.calcular_desempenho(df, config)
+
+def gerar_modelo(df, maquina, config):
+    """
+    Run the machine's analysis and return the structured report instead of text.
+    Usado por lotes que exportam JSON/CSV e não precisam do texto.
+
+    Args:
+        df (pd.DataFrame): Prepared production data
+        maquina (str): Machine name or alias
+        config (dict): Analysis configuration (hora_inicio, hora_fim, intervalo, linhas_agrupadas)
+
+    Returns:
+        RelatorioDesempenho: Metrics and per-OP records (see report.renderers)
+
+    Raises:
+        ValueError: If the machine has no analysis module or the shift hours are missing
+    """
+    registro = obter_maquina(maquina)
+    if registro is None or registro.calcular_desempenho is None:
+        raise ValueError(f"Máquina '{maquina}' não encontrada ou não implementada.\nMáquinas disponíveis: {nomes_disponiveis()}")
+    with etapa(f'calcular_desempenho ({registro.nome})'):
+        return registro.modelo_desempenho(df, config)
@@ -8,18 +8,61 @@ from tkinter import ttk, font, filedialog, messagebox
 import sys
 import platform
 import os
-import warnings
-from pathlib import Path
+import functools
 sys.path.append('.')
 from src.interface import globals
-from fpdf import FPDF
+from src.utils.logger import get_logger
 
 from ..components.toolbar import create_toolbar
 from ..components.table import create_table_view
-from ..components.terminal import create_terminal_panel
 from ..handlers.event_handler import register_events
 from ..handlers.table_handler import editar_celula, inserir_linha, deletar_linha, aplicar_cores_grupos, editar_celula, configurar_colunas_da_tabela, atualizar_dataframe_global
 
+logger = get_logger(__name__)
+
+def _tarefa_calcular(df, config, data, token=None, medicao_carregamento=None, rodape=False):
+    """Análise em segundo plano (não acessa widgets)."""
+    from src.core.metrics.calculator import gerar_texto_desempenho
+    from src.utils.timers import coletar, etapa, formatar_rodape
+    if token is not None:
+        token.progresso(f"analisando {len(df) if df is not None else 0} linha(s)")
+    with coletar("Análise") as medicao:
+        config, erro = _config_com_calendario(config)
+        texto = erro or gerar_texto_desempenho(df, config)
+        if token is not None:
+            token.verificar()
+        if data and not texto.startswith("❌"):
+            if token is not None:
+                token.progresso("gravando no armazém de análises")
+            with etapa('armazem_analises'):
+                _gravar_no_armazem(data, df, config)
+    if rodape and not texto.startswith("❌"):
+        texto_rodape = formatar_rodape(medicao_carregamento, medicao)
+        logger.info("Desempenho da análise:%s", texto_rodape.rstrip())
+        texto += texto_rodape
+    return texto
+
+def _config_com_calendario(config):
+    """
+    Com um calendário de turnos configurado, a análise usa os turnos da máquina no dia digitado.
+    Retorna (config, None) ou (config, mensagem de erro).
+    """
+    from src.core.metrics.shift_calendar import aplicar_calendario
+    try:
+        return aplicar_calendario(config, config.get('data', ''), config.get('maquina', '')), None
+    except (OSError, ValueError) as e:
+        return config, f"❌ ERRO no calendário de turnos ({config['calendario']}): {e}"
+
+def _gravar_no_armazem(data, df, config):
+    """Guarda o resultado por OP no armazém; falhas só vão para o log."""
+    from src.core.data.analytics_store import armazem_habilitado, gravar_analise
+    if not armazem_habilitado():
+        return
+    try:
+        gravar_analise(data, config.get('maquina', ''), df, config)
+    except Exception:
+        logger.exception("Não foi possível gravar a análise de %s no armazém", data)
+
 class MainWindow:
     def __init__(self):
         self.window = tk.Tk()
@@ -42,6 +85,8 @@ class MainWindow:
             globals.entrada_hora_fim = self.toolbar.entrada_hora_fim
         if hasattr(self.toolbar, 'entrada_intervalo'):
             globals.entrada_intervalo = self.toolbar.entrada_intervalo
+        if hasattr(self.toolbar, 'rodape_desempenho'):
+            globals.rodape_desempenho = self.toolbar.rodape_desempenho
         self.create_action_buttons()
         register_events(self)
         globals.main_window_instance = self
@@ -100,9 +145,17 @@ class MainWindow:
         globals.table_component = self.table_component
 
         # Terminal VS Code style
-        self.terminal_frame, self.terminal = create_terminal_panel(self.painel)
+        from src.interface.components.terminal import TerminalComponent
+        self.terminal_component = TerminalComponent(self.painel)
+        self.terminal_frame = self.terminal_component.frame
+        self.terminal = self.terminal_component.text_widget
         self.painel.add(self.terminal_frame, height=200, minsize=50)
         globals.text_resultado = self.terminal  # garantir referência global
+        globals.terminal_component = self.terminal_component
+
+        # Carregamento e análise rodam em segundo plano; o progresso aparece no terminal
+        from src.interface.utils.task_runner import ExecutorTarefas
+        globals.executor_tarefas = ExecutorTarefas(self.window, self.terminal_component)
 
         # Add initial feedback
         if self.terminal:
@@ -114,19 +167,33 @@ class MainWindow:
     def calcular_desempenho_wrapper(self):
         from src.interface.handlers.table_handler import atualizar_dataframe_global
         atualizar_dataframe_global()
-        from src.core.metrics.calculator import calcular_desempenho
+        from src.core.metrics.calculator import exibir_resultado
         from src.core.config.setup_config import TEMPOS_SETUP
         config = TEMPOS_SETUP.copy()
         config['hora_inicio'] = globals.entrada_hora_inicio.get() if globals.entrada_hora_inicio else ''
         config['hora_fim'] = globals.entrada_hora_fim.get() if globals.entrada_hora_fim else ''
         config['intervalo'] = globals.entrada_intervalo.get() if globals.entrada_intervalo else '60'
-        config['linhas_agrupadas'] = globals.linhas_agrupadas
+        config['linhas_agrupadas'] = {grupo: list(linhas) for grupo, linhas in globals.linhas_agrupadas.items()}
         # Adiciona máquina selecionada
         config['maquina'] = globals.entrada_maquina.get() if globals.entrada_maquina else ''
-        calcular_desempenho(
-            globals.df_global,
-            globals.text_resultado,
-            config
+        # Calendário de turnos (ANALISADOR_CALENDARIO ou ~/.analisador_producao/turnos.json), se houver
+        from src.core.metrics.shift_calendar import caminho_calendario_padrao
+        config['calendario'] = caminho_calendario_padrao()
+        config['data'] = globals.entrada_data.get().strip() if globals.entrada_data else ''
+        # Cópia: a tabela pode ser editada enquanto a análise roda
+        df = globals.df_global.copy() if globals.df_global is not None else None
+        from src.interface.handlers.data_handler import rodape_desempenho_ativo
+        opcoes = {'medicao_carregamento': globals.medicao_carregamento, 'rodape': rodape_desempenho_ativo()}
+        if globals.executor_tarefas is None:
+            # Sem executor: análise síncrona, sem gravar no armazém (data vazia)
+            exibir_resultado(globals.text_resultado, _tarefa_calcular(df, config, '', **opcoes))
+            return
+        globals.executor_tarefas.executar(
+            "Calculando desempenho",
+            functools.partial(_tarefa_calcular, **opcoes),
+            (df, config, globals.entrada_data.get().strip() if globals.entrada_data else ''),
+            ao_concluir=lambda texto: exibir_resultado(globals.text_resultado, texto),
+            ao_falhar=lambda erro: exibir_resultado(globals.text_resultado, f"❌ ERRO ao calcular desempenho: {erro}")
         )
     
     def create_action_buttons(self):
@@ -200,93 +267,13 @@ class MainWindow:
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao exportar análise: {str(e)}")
-            print(f"Erro detalhado na exportação: {e}")
+            logger.exception("Erro detalhado na exportação")
     
     def _exportar_como_pdf(self, arquivo, conteudo):
-        """Exporta conteúdo como PDF - versão otimizada para executável"""
+        """Exporta conteúdo como PDF (fonte e tabela de caracteres carregadas uma vez)"""
         try:
-            # Suprime warnings da fpdf
-            warnings.filterwarnings("ignore", category=UserWarning, module="fpdf")
-            
-            # Cria o PDF
-            pdf = FPDF()
-            pdf.add_page()
-            
-            # Tenta usar fonte DejaVu se disponível, senão usa Arial
-            try:
-                # Determina caminho da fonte
-                if getattr(sys, 'frozen', False):
-                    # Executável PyInstaller
-                    base_path = Path(sys._MEIPASS)
-                else:
-                    # Script Python
-                    base_path = Path(__file__).parent.parent.parent.parent
-                
-                font_path = base_path / 'DejaVuSans.ttf'
-                
-                if font_path.exists():
-                    pdf.add_font('DejaVu', '', str(font_path))
-                    pdf.set_font('DejaVu', '', 10)
-                    use_dejavu = True
-                else:
-                    pdf.set_font('Arial', '', 10)
-                    use_dejavu = False
-            except Exception as font_error:
-                print(f"Aviso: Erro ao carregar fonte DejaVu: {font_error}")
-                pdf.set_font('Arial', '', 10)
-                use_dejavu = False
-            
-            # Limpa o conteúdo removendo caracteres especiais
-            conteudo_limpo = self._limpar_caracteres_especiais(conteudo)
-            
-            # Processa o conteúdo linha por linha
-            linhas = conteudo_limpo.split('\n')
-            
-            # Adiciona título
-            if use_dejavu:
-                pdf.set_font('DejaVu', 'B', 14)
-            else:
-                pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 10, 'Análise de Produção', ln=True, align='C')
-            pdf.ln(5)
-            
-            # Volta para fonte normal
-            if use_dejavu:
-                pdf.set_font('DejaVu', '', 10)
-            else:
-                pdf.set_font('Arial', '', 10)
-            
-            # Processa cada linha
-            for linha in linhas:
-                try:
-                    # Verifica se ainda há espaço na página
-                    if pdf.get_y() > 270:  # Próximo da margem inferior
-                        pdf.add_page()
-                    
-                    # Processa a linha
-                    linha_str = str(linha).strip()
-                    
-                    # Se a linha estiver vazia, adiciona uma quebra de linha
-                    if not linha_str:
-                        pdf.ln(4)
-                        continue
-                    
-                    # Quebra linhas muito longas
-                    if len(linha_str) > 80:
-                        # Usa multi_cell para quebrar automaticamente
-                        pdf.multi_cell(0, 6, linha_str)
-                    else:
-                        # Usa cell para linhas normais
-                        pdf.cell(0, 6, linha_str, ln=True)
-                        
-                except Exception as e:
-                    print(f"Erro ao processar linha: {e}")
-                    # Continua com próxima linha
-                    continue
-            
-            # Salva o PDF
-            pdf.output(arquivo)
-            
+            from src.core.metrics.report.pdf_writer import gerar_pdf
+            gerar_pdf(arquivo, [('Análise de Produção', conteudo)])
         except Exception as e:
             raise Exception(f"Erro na geração do PDF: {str(e)}")
     
@@ -298,73 +285,6 @@ class MainWindow:
         except Exception as e:
             raise Exception(f"Erro ao salvar arquivo TXT: {str(e)}")
     
-    def _limpar_caracteres_especiais(self, texto):
-        """Remove ou substitui caracteres especiais que podem causar problemas no PDF"""
-        # Dicionário de substituições para emojis comuns
-        substituicoes = {
-            '🎯': '-> ',
-            '🖱️': '-> ',
-            '📊': '[GRAFICO] ',
-            '⚡': '[RAPIDO] ',
-            '🔧': '[CONFIG] ',
-            '📈': '[CRESCIMENTO] ',
-            '⏰': '[TEMPO] ',
-            '🏭': '[FABRICA] ',
-            '🔗': '[LINK] ',
-            '🔓': '[DESBLOQUEADO] ',
-            '📝': '[EDICAO] ',
-            '➕': '+ ',
-            '🗑️': '- ',
-            '📤': '[EXPORTAR] ',
-            '📑': '[RELATORIO] ',
-            '✅': '[OK] ',
-            '❌': '[ERRO] ',
-            '⭐': '* ',
-            '🚀': '[LANCAMENTO] ',
-            '💡': '[IDEIA] ',
-            '🎨': '[DESIGN] ',
-            '🔍': '[BUSCA] ',
-            '📋': '[LISTA] ',
-            '⚙️': '[CONFIGURACAO] ',
-            '🎪': '[EVENTO] ',
-            '📦': '[PACOTE] ',
-            '🔄': '[ATUALIZAR] ',
-            '📅': '[DATA] ',
-            '🕐': '[HORA] ',
-            '📌': '[FIXAR] ',
-            '🎵': '[MUSICA] ',
-            '🎶': '[SOM] ',
-            '🎼': '[PARTITURA] ',
-            '🎹': '[PIANO] ',
-            '🎺': '[TROMPETE] ',
-            '🎻': '[VIOLINO] ',
-            '🎸': '[GUITARRA] ',
-            '🥁': '[BATERIA] ',
-            '🎷': '[SAXOFONE] '
-        }
-        
-        # Aplica as substituições
-        for emoji, substituto in substituicoes.items():
-            texto = texto.replace(emoji, substituto)
-        
-        # Remove outros caracteres que podem causar problemas
-        # Mantém apenas caracteres ASCII imprimíveis e alguns especiais
-        texto_limpo = ""
-        for char in texto:
-            if ord(char) < 32:  # Caracteres de controle
-                if char in ['\n', '\r', '\t']:  # Mantém quebras de linha e tabs
-                    texto_limpo += char
-                else:
-                    texto_limpo += ' '  # Substitui outros por espaço
-            elif ord(char) <= 126:  # Caracteres ASCII imprimíveis
-                texto_limpo += char
-            elif ord(char) >= 160 and ord(char) <= 255:  # Caracteres latinos estendidos
-                texto_limpo += char
-            else:  # Outros caracteres especiais
-                texto_limpo += ' '
-        
-        return texto_limpo
-    
     def aplicar_media_geral(self):
         """Atualiza apenas as linhas de produção na coluna 'Média Produção' com o valor digitado na média geral."""
         valor = self.entrada_media_geral.get().strip()
@@ -390,6 +310,9 @@ class MainWindow:
                 if 'Média Produção' in colunas and 'Evento' in colunas:
                     idx_media = colunas.index('Média Produção')
                     idx_evento = colunas.index('Evento')
+                    # No modo virtual, as linhas ainda não paginadas também precisam do novo valor
+                    from src.interface.handlers.table_handler import materializar_tabela
+                    materializar_tabela(tabela)
                     
                     for item in tabela.get_children():
                         valores = list(tabela.item(item)['values'])
@@ -399,7 +322,7 @@ class MainWindow:
                                 valores[idx_media] = valor
                                 tabela.item(item, values=valores)
             except Exception as e:
-                print(f"Erro ao aplicar média geral: {e}")
+                logger.warning("Erro ao aplicar média geral: %s", e)
     
     def run(self):
         """Start the application"""
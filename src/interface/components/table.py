@@ -15,6 +15,13 @@ from ..utils.header_generator import (
     criar_headers_alfabeticos
 )
 
+# Acima deste número de linhas a tabela entra no modo virtual: as linhas são
+# inseridas no Treeview em páginas, conforme a rolagem se aproxima do fim.
+LIMITE_VIRTUAL = 1000
+TAMANHO_PAGINA = 300
+# Linhas ainda não vistas que devem existir abaixo da área visível
+BUFFER_LINHAS = 100
+
 def create_table_view(parent):
     """Create table view with headers and scrollbars"""
     table = TableComponent(parent)
@@ -44,6 +51,9 @@ class TableComponent:
         self.parent = parent
         self.letter_labels = []
         self.df_atual = None
+        self.virtual = False
+        self.linhas_materializadas = 0
+        self.tags_linhas = {}
         self.create_table_frame()
         self.create_table()
         self.configure_scrollbars()
@@ -78,7 +88,7 @@ class TableComponent:
         # Treeview
         self.table = ttk.Treeview(
             self.frame_tree,
-            yscrollcommand=self.scrollbar_y.set,
+            yscrollcommand=self._ao_rolar,
             xscrollcommand=self.scrollbar_x.set,
             selectmode="extended",
             height=20
@@ -167,23 +177,103 @@ class TableComponent:
             self.frame_letters.after(100, self.update_letter_positions)
     
     def load_data(self, df):
-        """Load data into table"""
+        """
+        Load data into table.
+        Tabelas grandes (mais de LIMITE_VIRTUAL linhas) são carregadas em modo
+        virtual: só a primeira página é inserida e as demais entram na rolagem.
+        O iid de cada item é a posição da linha no DataFrame.
+        """
         if df is not None and not df.empty:
-            for item in self.table.get_children():
-                self.table.delete(item)
+            self.limpar()
             self.update_headers(df)
-            for index, row in df.iterrows():
-                valores = list(row)
-                self.table.insert("", "end", text=str(index + 1), values=valores)
+            self.virtual = len(df) > LIMITE_VIRTUAL
+            self.materializar_ate(TAMANHO_PAGINA if self.virtual else len(df))
             self.frame_letters.after(50, self.update_letter_positions)
             self.frame_letters.after(200, self.update_letter_positions)
             self.frame_letters.after(500, self.update_letter_positions)
-    
+
+    def limpar(self):
+        """Remove todas as linhas da tabela e descarta o DataFrame associado."""
+        self.table.delete(*self.table.get_children())
+        self.df_atual = None
+        self.virtual = False
+        self.linhas_materializadas = 0
+        self.tags_linhas = {}
+
+    def total_linhas(self):
+        """Número de linhas da tabela, incluindo as ainda não inseridas no Treeview."""
+        if self.df_atual is None:
+            return len(self.table.get_children())
+        return max(len(self.df_atual), self.linhas_materializadas)
+
+    def materializar_ate(self, fim):
+        """
+        Insert the DataFrame rows up to position fim (exclusive) into the Treeview.
+
+        Args:
+            fim (int): Row position; clipped to the DataFrame length
+        """
+        if self.df_atual is None:
+            return
+        inicio = self.linhas_materializadas
+        fim = min(fim, len(self.df_atual))
+        if fim <= inicio:
+            return
+        valores = self.df_atual.iloc[inicio:fim].to_numpy(dtype=object).tolist()
+        for pos, linha in enumerate(valores, start=inicio):
+            self.table.insert("", "end", iid=str(pos), text=str(pos + 1), values=linha,
+                              tags=self.tags_linhas.get(pos, ()))
+        self.linhas_materializadas = fim
+
+    def materializar_tudo(self):
+        """Insere todas as linhas restantes (necessário antes de ler a tabela inteira)."""
+        if self.df_atual is not None:
+            self.materializar_ate(len(self.df_atual))
+
+    def item_da_linha(self, pos):
+        """Retorna o iid da linha na posição pos, inserindo-a se necessário."""
+        self.materializar_ate(pos + 1)
+        return str(pos)
+
+    def valores_linhas(self):
+        """
+        Return the values of every row, in table order.
+        Linhas já inseridas vêm do Treeview (podem ter sido editadas); as demais, do DataFrame.
+        """
+        valores = [list(self.table.item(item)['values']) for item in self.table.get_children()]
+        if self.df_atual is not None and self.linhas_materializadas < len(self.df_atual):
+            valores.extend(self.df_atual.iloc[self.linhas_materializadas:].to_numpy(dtype=object).tolist())
+        return valores
+
+    def definir_tags(self, tags_por_linha, substituir=False):
+        """
+        Set row tags by position; rows not inserted yet receive them when paged in.
+
+        Args:
+            tags_por_linha (dict): {posição: tupla de tags}
+            substituir (bool): Se True, linhas fora do dicionário ficam sem tags
+        """
+        if substituir:
+            self.tags_linhas = {}
+            for item in self.table.get_children():
+                self.table.item(item, tags=())
+        for pos, tags in tags_por_linha.items():
+            self.tags_linhas[pos] = tags
+            if pos < self.linhas_materializadas:
+                self.table.item(str(pos), tags=tags)
+
+    def _ao_rolar(self, primeiro, ultimo):
+        """yscrollcommand: atualiza a barra e pagina mais linhas perto do fim."""
+        self.scrollbar_y.set(primeiro, ultimo)
+        if not self.virtual or self.df_atual is None or self.linhas_materializadas >= len(self.df_atual):
+            return
+        ultima_visivel = float(ultimo) * self.linhas_materializadas
+        if self.linhas_materializadas - ultima_visivel < BUFFER_LINHAS:
+            # Fora do callback de rolagem para não reentrar no Treeview
+            self.table.after_idle(lambda: self.materializar_ate(self.linhas_materializadas + TAMANHO_PAGINA))
+
     def update_groups(self, linhas_agrupadas):
         """Update group colors"""
         # Em vez de aplicar cores de grupo, deixe todas as linhas com fundo claro
-        for item in self.table.get_children():
-            self.table.item(item, tags=())
         self.table.tag_configure('clear', background='#f9f9f9')
-        for item in self.table.get_children():
-            self.table.item(item, tags=('clear',))
\ No newline at end of file
+        self.definir_tags({pos: ('clear',) for pos in range(self.total_linhas())}, substituir=True)
@@ -15,6 +15,7 @@ class TerminalComponent:
     def __init__(self, parent):
         self.parent = parent
         self.create_panel()
+        self.create_task_bar()
     
     def create_panel(self):
         """Create terminal panel with text widget"""
@@ -56,6 +57,36 @@ class TerminalComponent:
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
     
+    def create_task_bar(self):
+        """Create the progress/cancel bar shown while a background task runs"""
+        self.task_bar = tk.Frame(self.container, bg='#252526')
+        self.task_label = tk.Label(self.task_bar, text="", anchor='w', bg='#252526', fg='#f0f0f0',
+                                   font=('Arial', 9))
+        self.task_label.pack(side="left", fill="x", expand=True, padx=5)
+        self.task_progress = ttk.Progressbar(self.task_bar, mode='indeterminate', length=160)
+        self.task_progress.pack(side="left", padx=5, pady=2)
+        self.task_cancel = tk.Button(self.task_bar, text="✖ Cancelar", font=('Arial', 8),
+                                     bg='#F44336', fg='white')
+        self.task_cancel.pack(side="left", padx=5, pady=2)
+        self.task_descricao = ""
+    
+    def mostrar_tarefa(self, descricao, ao_cancelar):
+        """Show the task bar for a background task"""
+        self.task_descricao = descricao
+        self.task_label.config(text=f"⏳ {descricao}...")
+        self.task_cancel.config(command=ao_cancelar)
+        self.task_bar.grid(row=1, column=0, columnspan=2, sticky="ew")
+        self.task_progress.start(15)
+    
+    def atualizar_progresso(self, mensagem):
+        """Update the task bar with a progress message"""
+        self.task_label.config(text=f"⏳ {self.task_descricao}: {mensagem}")
+    
+    def ocultar_tarefa(self):
+        """Hide the task bar"""
+        self.task_progress.stop()
+        self.task_bar.grid_remove()
+    
     def clear(self):
         """Clear terminal content"""
         self.text_widget.delete("1.0", tk.END)
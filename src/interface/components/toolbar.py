@@ -13,6 +13,7 @@ from ..handlers.formatters import (
     ao_sair_hora
 )
 from ..handlers.config_handler import abrir_configuracoes
+from src.utils.timers import rodape_habilitado
 
 def create_toolbar(parent):
     """Create toolbar with input fields and control buttons"""
@@ -53,6 +54,10 @@ class ToolbarComponent:
         self.btn_config_setup = tk.Button(self.parent, text="⚙ Config Setup",
                  command=abrir_configuracoes)
         self.btn_config_setup.grid(row=0, column=5, padx=5)
+        # Rodapé com o tempo de cada etapa no resultado (também vai para o log)
+        self.rodape_desempenho = tk.BooleanVar(self.parent, value=rodape_habilitado())
+        tk.Checkbutton(self.parent, text="⏱ Tempos por etapa", variable=self.rodape_desempenho,
+                       bg='#f5f5f5').grid(row=0, column=6, padx=5)
         # Placeholder inteligente (autocomplete) - só crie após o botão
         self.machine_placeholder = tk.Label(self.parent, text="", fg="#bbbbbb", bg="#fff", font=("Arial", 9, "italic"))
         self.machine_placeholder.place(in_=self.entrada_maquina, relx=0, rely=0, x=2, y=1, anchor="nw")
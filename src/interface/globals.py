@@ -13,3 +13,9 @@ entrada_data = None
 entrada_maquina = None
 entrada_media_geral = None
 main_window_instance = None
+table_component = None
+diario_edicoes = None
+terminal_component = None
+executor_tarefas = None
+rodape_desempenho = None
+medicao_carregamento = None
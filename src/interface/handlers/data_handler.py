@@ -3,69 +3,36 @@ Data handler module.
 Funções para carregar e gerenciar os dados da interface.
 """
 
-import pandas as pd
 from tkinter import messagebox
 import tkinter as tk
 from src.interface import globals
+from src.utils.timers import etapa, coletar, rodape_habilitado, formatar_rodape
+from src.utils.logger import get_logger
 import os
 
-# Importações específicas (evita importações totais que forçam o __init__.py)
+# Importações específicas (evita importações totais que forçam o __init__.py).
+# pandas, pdfplumber e o processamento só são importados no primeiro carregamento.
 from core.extractor.file_finder import construir_caminho_pdf
-from core.extractor.pdf_extractor import extrair_dados_pdf
-from core.config.setup_config import get_setup_time
-from core.data.data_processor import process_data, validate_data, calculate_setup_times, extrair_media_producao
-from core.data.group_manager import GroupManager
-from src.core.metrics.utils import limpar_setup_op_sem_acerto
-
-from .table_handler import configurar_colunas_da_tabela, carregar_dados_na_tabela, aplicar_cores_grupos
-
-# Mapeamento de abreviações para nomes completos de máquinas
-MACHINE_ALIASES = {
-    'b': 'bobst',
-    'bobst': 'bobst',
-    'k': 'komori',
-    'komori': 'komori',
-    'f': 'furnax',
-    'furnax': 'furnax',
-    'cv': 'cv manual',
-    'cv manual': 'cv manual',
-    'cv guangya': 'cv_guangya',
-    'guangya': 'cv_guangya',
-    'guan': 'cv_guangya',
-    'cvgy': 'cv_guangya',
-    'cv guan': 'cv_guangya',
-    'gy': 'cv_guangya',
-    'h': 'hcd',
-    'hcd': 'hcd',
-    's': 'samkoon',
-    'samkoon': 'samkoon',
-    'l': 'laminadora',
-    'laminadora': 'laminadora',
-    # Aliases para Sakurai
-    'verniz uv sakurai': 'sakurai',
-    'verniz.uv sakurai': 'sakurai',
-    'verniz sakurai': 'sakurai',
-    'uv sakurai': 'sakurai',
-    'sakurai': 'sakurai',
-    'v': 'sakurai',
-    # Outros
-    'sbl': 'sbl',
-    'sbl': 'sbl',
-}
+
+from .table_handler import configurar_colunas_da_tabela, carregar_dados_na_tabela, aplicar_cores_grupos, iniciar_diario_edicoes
+
+# Mapeamento de abreviações para nomes completos de máquinas (derivado do registro)
+from src.core.metrics.maquinas.registro import MACHINE_ALIASES, resolver_alias
+
+logger = get_logger(__name__)
 
 def get_maquina_alias(valor):
-    valor = str(valor).strip().lower()
-    if valor in MACHINE_ALIASES:
-        return MACHINE_ALIASES[valor]
-    # Matching por prefixo
-    for alias in MACHINE_ALIASES:
-        if alias.startswith(valor):
-            return MACHINE_ALIASES[alias]
-    # Matching por substring (fuzzy leve)
-    for alias in MACHINE_ALIASES:
-        if valor in alias:
-            return MACHINE_ALIASES[alias]
-    return valor
+    return resolver_alias(str(valor).strip().lower())
+
+def rodape_desempenho_ativo():
+    """Rodapé de desempenho: opção da barra de ferramentas, ou ANALISADOR_PERF sem interface."""
+    opcao = getattr(globals, 'rodape_desempenho', None)
+    if opcao is None:
+        return rodape_habilitado()
+    try:
+        return bool(opcao.get())
+    except Exception:
+        return rodape_habilitado()
 
 def carregar_dados_wrapper():
     """Wrapper para carregar dados a partir dos campos da interface"""
@@ -74,96 +41,99 @@ def carregar_dados_wrapper():
     carregar_dados(data, maquina)
 
 def carregar_dados(data, maquina):
-    """Carrega os dados do arquivo PDF"""
+    """Carrega os dados do arquivo PDF (leitura e preparação em segundo plano)"""
     if not data or not maquina:
         messagebox.showwarning("Atenção", "Preencha a data e a máquina.")
         return
 
-    try:
-        caminho_pdf = construir_caminho_pdf(data, get_maquina_alias(maquina))
-        if not os.path.isfile(caminho_pdf):
-            messagebox.showerror("Erro", f"PDF da máquina '{maquina}' não encontrado!\nCaminho: {caminho_pdf}")
-            # Limpa dados globais e tabela
-            globals.df_global = None
-            globals.linhas_agrupadas = {}
-            if globals.tabela:
-                for item in globals.tabela.get_children():
-                    globals.tabela.delete(item)
-            if globals.text_resultado:
-                globals.text_resultado.delete("1.0", tk.END)
+    # Widgets só são lidos aqui, na thread do Tk
+    maquina_alias = get_maquina_alias(maquina)
+    maquina_valor = get_valor_maquina()
+    executor = getattr(globals, 'executor_tarefas', None)
+    if executor is None:
+        try:
+            resultado = _ler_dados_medindo(data, maquina_alias, maquina_valor)
+        except Exception as e:
+            _falha_carregamento(maquina, e)
             return
-        df = extrair_dados_pdf(caminho_pdf)
-        df = process_dataframe(df)
-        globals.df_global = df.copy()
-        globals.linhas_agrupadas = {}
-        if hasattr(globals, 'table_component') and globals.table_component:
-            globals.table_component.load_data(globals.df_global)
-        # Aplica cores de agrupamento automaticamente
-        aplicar_cores_grupos(globals.tabela, {})
+        _exibir_dados(*resultado)
+        return
+    executor.executar(
+        f"Carregando {maquina} {data}",
+        _ler_dados_medindo,
+        (data, maquina_alias, maquina_valor),
+        ao_concluir=lambda resultado: _exibir_dados(*resultado),
+        ao_falhar=lambda e: _falha_carregamento(maquina, e)
+    )
+
+def _ler_dados(data, maquina_alias, maquina_valor, token=None):
+    """Lê e prepara o PDF (não acessa widgets)."""
+    with etapa('localizar_pdf'):
+        caminho_pdf = construir_caminho_pdf(data, maquina_alias)
+    if not os.path.isfile(caminho_pdf):
+        raise FileNotFoundError(caminho_pdf)
+    if token is not None:
+        token.progresso("extraindo PDF")
+        token.verificar()
+    from core.extractor.pdf_cache import extrair_dados_pdf_com_cache
+    with etapa('extrair_pdf'):
+        df = extrair_dados_pdf_com_cache(caminho_pdf)
+    if token is not None:
+        token.progresso("preparando dados")
+        token.verificar()
+    from src.core.pipeline import preparar_dataframe
+    return preparar_dataframe(df, maquina_valor)
+
+def _ler_dados_medindo(data, maquina_alias, maquina_valor, token=None):
+    """_ler_dados com as etapas medidas; devolve (df, medição)."""
+    with coletar(f"Carregamento {maquina_alias} {data}") as medicao:
+        df = _ler_dados(data, maquina_alias, maquina_valor, token)
+    return df, medicao
+
+def _exibir_dados(df, medicao=None):
+    """Mostra o DataFrame carregado na tabela e reinicia o diário de edições."""
+    # Guardada para o rodapé do próximo cálculo de desempenho
+    globals.medicao_carregamento = medicao
+    globals.linhas_agrupadas = {}
+    if hasattr(globals, 'table_component') and globals.table_component:
+        globals.table_component.load_data(df)
+    # Normaliza uma única vez; as edições da tabela passam pelo diário
+    iniciar_diario_edicoes(df)
+    # Aplica cores de agrupamento automaticamente
+    aplicar_cores_grupos(globals.tabela, {})
+    if globals.text_resultado:
+        globals.text_resultado.delete("1.0", tk.END)
+        globals.text_resultado.insert(tk.END, 
+            "Dados carregados! Selecione linhas e clique em 'Agrupar' ou 'Calcular Desempenho'")
+    if medicao is not None and rodape_desempenho_ativo():
+        rodape = formatar_rodape(medicao)
+        logger.info("Desempenho do carregamento:%s", rodape.rstrip())
         if globals.text_resultado:
-            globals.text_resultado.delete("1.0", tk.END)
-            globals.text_resultado.insert(tk.END, 
-                "Dados carregados! Selecione linhas e clique em 'Agrupar' ou 'Calcular Desempenho'")
-    except Exception as e:
-        messagebox.showerror("Erro", str(e))
+            globals.text_resultado.insert(tk.END, rodape)
+
+def _falha_carregamento(maquina, erro):
+    if not isinstance(erro, FileNotFoundError):
+        messagebox.showerror("Erro", str(erro))
+        return
+    messagebox.showerror("Erro", f"PDF da máquina '{maquina}' não encontrado!\nCaminho: {erro}")
+    # Limpa dados globais e tabela
+    iniciar_diario_edicoes(None)
+    globals.linhas_agrupadas = {}
+    if getattr(globals, 'table_component', None):
+        globals.table_component.limpar()
+    elif globals.tabela:
+        globals.tabela.delete(*globals.tabela.get_children())
+    if globals.text_resultado:
+        globals.text_resultado.delete("1.0", tk.END)
 
 def process_dataframe(df):
     """Processa o DataFrame após a leitura do PDF"""
-    if df.empty:
-        return df
-
-    header = list(df.iloc[0])
-    df = df[1:].reset_index(drop=True)
-    df.columns = header
-
-    # Garante que a coluna 'Máquina' existe e está preenchida
-    valor_maquina = get_valor_maquina()
-    valor_maquina = valor_maquina.lower() if valor_maquina else ''
-    if 'Máquina' not in df.columns:
-        df.insert(2, 'Máquina', valor_maquina)  # Insere na posição 2 (após 'Término')
-    else:
-        df['Máquina'] = df['Máquina'].fillna('').replace('', valor_maquina)
-        df['Máquina'] = df['Máquina'].apply(lambda x: valor_maquina if not x or (isinstance(x, str) and x.strip() == '') else (x.lower() if isinstance(x, str) else x))
-
-    # Garante que a coluna 'Tempo Setup' existe e está visível
-    if 'Tempo Setup' not in df.columns:
-        df.insert(3, 'Tempo Setup', '')  # Insere após 'Máquina'
-
-    # Garante que a coluna 'Média Produção' existe e está visível
-    if 'Média Produção' not in df.columns:
-        df.insert(4, 'Média Produção', '')  # Insere após 'Tempo Setup'
-
-    df = calculate_setup_times(df)
-
-    # Preenche campos especiais para todas as máquinas (generalizado)
-    try:
-        modulo = f"src.core.metrics.maquinas.{valor_maquina}"
-        func_name = f"preencher_campos_{valor_maquina.replace(' ', '_')}"
-        import importlib
-        mod = importlib.import_module(modulo)
-        if hasattr(mod, func_name):
-            df = getattr(mod, func_name)(df)
-    except Exception:
-        pass
-
-    # Limpa tempo de setup de OPs sem acerto (universal para todas as máquinas)
-    df = limpar_setup_op_sem_acerto(df)
-
-    # Reorganiza as colunas para garantir que 'Tempo Setup' e 'Média Produção' fiquem sempre visíveis e lado a lado
-    cols = df.columns.tolist()
-    if 'Tempo Setup' in cols and 'Média Produção' in cols:
-        idx_setup = cols.index('Tempo Setup')
-        idx_media = cols.index('Média Produção')
-        if idx_media != idx_setup + 1:
-            # Remove 'Média Produção' e insere logo após 'Tempo Setup'
-            cols.pop(idx_media)
-            cols.insert(idx_setup + 1, 'Média Produção')
-            df = df[cols]
-
-    return df
+    from src.core.pipeline import preparar_dataframe
+    return preparar_dataframe(df, get_valor_maquina())
 
 def insert_setup_column(df):
     """Insere coluna de 'Tempo Setup'"""
+    import pandas as pd
     colunas_antigas = df.columns.tolist()
     novas_colunas = colunas_antigas[:2] + ['Tempo Setup'] + colunas_antigas[2:]
 
@@ -12,8 +12,9 @@ from .group_handler import (
 from src.interface import globals
 
 def importar_e_chamar_calcular_desempenho():
-    from src.core.metrics.calculator import calcular_desempenho
-    return calcular_desempenho()
+    """Dispara o cálculo de desempenho da janela principal (mesmo caminho do botão)."""
+    if globals.main_window_instance is not None:
+        return globals.main_window_instance.calcular_desempenho_wrapper()
 
 def handle_event(event_type, **kwargs):
     """
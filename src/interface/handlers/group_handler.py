@@ -41,12 +41,11 @@ def desagrupar_selecionadas_melhorado():
     globals.linhas_selecionadas.clear()
     
     # Clear table colors
+    from .table_handler import aplicar_cores_grupos, aplicar_tags_linhas
     if globals.tabela:
-        for item in globals.tabela.get_children():
-            globals.tabela.item(item, tags=())
+        aplicar_tags_linhas(globals.tabela, {}, substituir=True)
     
     # Update remaining groups
-    from .table_handler import aplicar_cores_grupos
     aplicar_cores_grupos(globals.tabela, globals.linhas_agrupadas)
     
     messagebox.showinfo("Sucesso", "Grupos desagrupados com sucesso.")
@@ -5,12 +5,10 @@ Contains functions for managing table data and display.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 from ..utils.header_generator import gerar_headers_colunas
 from src.interface import globals
 import unidecode
 import re
-from src.core.metrics.utils import formatar_quantidade, parse_quantidade, formatar_tempo, parse_tempo
 
 def configurar_tabela(treeview, colunas):
     """Configure table columns and headers"""
@@ -26,16 +24,129 @@ def configurar_tabela(treeview, colunas):
         treeview.column(col, anchor=tk.CENTER, width=100)
         treeview.heading(col, text=col, anchor=tk.CENTER)
 
+def _componente_da_tabela(tabela):
+    """Retorna o TableComponent que controla a tabela (modo virtual), se houver."""
+    componente = getattr(globals, 'table_component', None)
+    if componente is not None and getattr(componente, 'table', None) is tabela:
+        return componente
+    return None
+
+def valores_linhas_tabela(tabela):
+    """
+    Return the values of every table row, including rows not yet paged in.
+
+    Args:
+        tabela (ttk.Treeview): The table
+
+    Returns:
+        list: One list of values per row, in table order
+    """
+    componente = _componente_da_tabela(tabela)
+    if componente is not None:
+        return componente.valores_linhas()
+    return [list(tabela.item(item)['values']) for item in tabela.get_children()]
+
+def aplicar_tags_linhas(tabela, tags_por_linha, substituir=False):
+    """
+    Apply tags to table rows by position.
+
+    Args:
+        tabela (ttk.Treeview): The table
+        tags_por_linha (dict): {posição: tupla de tags}
+        substituir (bool): If True, rows missing from tags_por_linha lose their tags
+    """
+    componente = _componente_da_tabela(tabela)
+    if componente is not None:
+        componente.definir_tags(tags_por_linha, substituir)
+        return
+    itens = tabela.get_children()
+    if substituir:
+        for item in itens:
+            tabela.item(item, tags=())
+    for pos, tags in tags_por_linha.items():
+        if 0 <= pos < len(itens):
+            tabela.item(itens[pos], tags=tags)
+
+def materializar_tabela(tabela):
+    """Insere no Treeview as linhas ainda não paginadas (modo virtual)."""
+    componente = _componente_da_tabela(tabela)
+    if componente is not None:
+        componente.materializar_tudo()
+
+def _recarregar_tabela(tabela, df):
+    """Recarrega a tabela a partir do DataFrame, pelo componente quando disponível."""
+    componente = _componente_da_tabela(tabela)
+    if componente is not None:
+        if df is not None and not df.empty:
+            componente.load_data(df)
+        else:
+            componente.limpar()
+        return
+    tabela.delete(*tabela.get_children())
+    import pandas as pd
+    if isinstance(df, pd.DataFrame):
+        for i, linha in enumerate(df.to_numpy(dtype=object).tolist()):
+            tabela.insert('', 'end', text=str(i + 1), values=linha)
+
+def iniciar_diario_edicoes(df):
+    """
+    Normalize the loaded DataFrame once and start the edit journal.
+    globals.df_global passa a ser o DataFrame do diário (com a linha TOTAL).
+
+    Args:
+        df (pd.DataFrame): Data as shown in the table
+    """
+    from src.core.data.edit_journal import DiarioEdicoes, normalizar_dataframe
+    if df is None:
+        globals.diario_edicoes = None
+        globals.df_global = None
+        return
+    globals.diario_edicoes = DiarioEdicoes(normalizar_dataframe(df))
+    globals.df_global = globals.diario_edicoes.df
+
+def _diario():
+    """Retorna o diário de globals.df_global, reiniciando-o se o DataFrame foi substituído."""
+    diario = getattr(globals, 'diario_edicoes', None)
+    if globals.df_global is None:
+        return None
+    if diario is None or diario.df is not globals.df_global:
+        iniciar_diario_edicoes(globals.df_global)
+        diario = globals.diario_edicoes
+    return diario
+
+def _registrar_edicao(tabela, pos, coluna, valor):
+    """Aplica a edição de uma célula no diário e atualiza a linha TOTAL exibida."""
+    diario = _diario()
+    if diario is None:
+        return
+    df_antes = diario.df
+    if not diario.editar(pos, coluna, valor):
+        return
+    globals.df_global = diario.df
+    # A linha TOTAL só aparece na tabela quando ela foi carregada a partir de df_global
+    componente = _componente_da_tabela(tabela)
+    if componente is None or componente.df_atual is not df_antes:
+        return
+    if diario.df is not df_antes:
+        # Linha TOTAL criada ou removida
+        componente.load_data(diario.df)
+    elif diario.tem_total:
+        pos_total = diario.linhas_dados()
+        if pos_total < componente.linhas_materializadas:
+            tabela.item(componente.item_da_linha(pos_total), values=diario.df.iloc[pos_total].tolist())
+
 def carregar_dados_na_tabela(treeview, dados):
     """Load data into table"""
-    # Clear existing items
-    for item in treeview.get_children():
-        treeview.delete(item)
-    
-    # Insert new data
-    for idx, row in dados.iterrows():
-        values = [row.get(col, '') for col in treeview['columns']]
-        treeview.insert('', tk.END, values=values)
+    componente = _componente_da_tabela(treeview)
+    if componente is not None:
+        componente.load_data(dados)
+    else:
+        # Clear existing items
+        treeview.delete(*treeview.get_children())
+        # Insert new data
+        colunas = list(treeview['columns'])
+        for values in dados.reindex(columns=colunas, fill_value='').to_numpy(dtype=object).tolist():
+            treeview.insert('', tk.END, values=values)
     aplicar_cores_por_processo(treeview)
 
 def atualizar_selecao(treeview, indices_selecionados):
@@ -51,7 +162,7 @@ def configurar_colunas_da_tabela(tabela, df=None):
         df (pd.DataFrame, optional): DataFrame com os dados. Se None, usa headers padrão.
     """
     # Remove colunas existentes
-    tabela.delete(*tabela.get_children())
+    _recarregar_tabela(tabela, None)
     
     # Configura coluna #0 (índice) para não aparecer
     tabela.column("#0", width=0, stretch=tk.NO)
@@ -127,8 +238,7 @@ def aplicar_cores_grupos(tabela, grupos):
             op_to_indices = {}
             op_to_color_idx = {}
             cor_idx = 0
-            for idx, item_id in enumerate(tabela.get_children()):
-                valores = list(tabela.item(item_id)['values'])
+            for idx, valores in enumerate(valores_linhas_tabela(tabela)):
                 if op_col >= len(valores) or evento_col >= len(valores):
                     continue
                 op = str(valores[op_col]).strip()
@@ -139,22 +249,24 @@ def aplicar_cores_grupos(tabela, grupos):
                         op_to_color_idx[op] = cor_idx
                         cor_idx += 1
                     op_to_indices[op].append(idx)
+            tags_por_linha = {}
             for op, indices in op_to_indices.items():
                 cor = cores[op_to_color_idx[op] % len(cores)]
                 tag = f'grupo_sakurai_{op_to_color_idx[op]}'
                 tabela.tag_configure(tag, background=cor)
                 for idx in indices:
-                    item_id = tabela.get_children()[idx]
-                    tabela.item(item_id, tags=(tag,))
+                    tags_por_linha[idx] = (tag,)
+            aplicar_tags_linhas(tabela, tags_por_linha)
         return
     # Padrão para outras máquinas
+    tags_por_linha = {}
     for i, (grupo, indices) in enumerate(grupos.items()):
         cor = cores[i % len(cores)]  # Cicla pelas cores se houver mais grupos que cores
         tag = f'grupo_{i}'
         tabela.tag_configure(tag, background=cor)
         for idx in indices:
-            item_id = tabela.get_children()[idx]
-            tabela.item(item_id, tags=(tag,))
+            tags_por_linha[idx] = (tag,)
+    aplicar_tags_linhas(tabela, tags_por_linha)
 
 def ao_selecionar_linha(event):
     """
@@ -234,6 +346,7 @@ def editar_celula(event, treeview):
     """
     Habilita a edição de uma célula após duplo clique
     """
+    from src.core.metrics.utils import formatar_quantidade, parse_quantidade
     try:
         if not treeview or not treeview.winfo_exists():
             return
@@ -306,8 +419,7 @@ def editar_celula(event, treeview):
                         try:
                             num_val = parse_quantidade(novo_valor)
                             valores[column_index] = formatar_quantidade(num_val)
-                            if globals.df_global is not None:
-                                globals.df_global.at[treeview.index(item), colunas[column_index]] = num_val
+                            _registrar_edicao(treeview, treeview.index(item), colunas[column_index], num_val)
                         except Exception:
                             valores[column_index] = novo_valor
                     # Tempo: salva como minutos no DataFrame, exibe HH:MM na tabela
@@ -323,16 +435,13 @@ def editar_celula(event, treeview):
                             else:
                                 minutos = 0
                             valores[column_index] = f"{h:02d}:{m:02d}"
-                            if globals.df_global is not None:
-                                globals.df_global.at[treeview.index(item), colunas[column_index]] = minutos
+                            _registrar_edicao(treeview, treeview.index(item), colunas[column_index], minutos)
                         except Exception:
                             valores[column_index] = novo_valor
                     else:
                         valores[column_index] = novo_valor
-                        if globals.df_global is not None:
-                            globals.df_global.at[treeview.index(item), colunas[column_index]] = novo_valor
+                        _registrar_edicao(treeview, treeview.index(item), colunas[column_index], novo_valor)
                     treeview.item(item, values=valores)
-                atualizar_dataframe_global()
                 # Atualiza o relatório após edição
                 try:
                     if hasattr(globals, 'main_window_instance') and globals.main_window_instance:
@@ -362,123 +471,35 @@ def inserir_linha(tabela):
         idx = tabela.index(selecionadas[0])
     else:
         idx = 0
-    colunas = list(map(str, tabela['columns']))
-    nova_linha = ['' for _ in colunas]
-    tabela.insert('', idx, values=nova_linha)
-    df = globals.df_global.copy() if globals.df_global is not None else pd.DataFrame(columns=colunas)
-    nova_df = pd.DataFrame([['' for _ in colunas]], columns=pd.Index(colunas))
-    df1 = df.iloc[:idx] if idx > 0 else pd.DataFrame(columns=pd.Index(colunas))
-    df2 = df.iloc[idx:] if idx < len(df) else pd.DataFrame(columns=pd.Index(colunas))
-    globals.df_global = pd.concat([df1, nova_df, df2], ignore_index=True)
-    for item in tabela.get_children():
-        tabela.delete(item)
-    if isinstance(globals.df_global, pd.DataFrame):
-        for i, row in globals.df_global.iterrows():
-            tabela.insert('', 'end', values=list(row))
-    # Atualiza o DataFrame global e a linha TOTAL
-    atualizar_dataframe_global()
+    diario = _diario()
+    if diario is None:
+        import pandas as pd
+        colunas = list(map(str, tabela['columns']))
+        iniciar_diario_edicoes(pd.DataFrame(columns=pd.Index(colunas)))
+        diario = globals.diario_edicoes
+    diario.inserir(idx)
+    globals.df_global = diario.df
+    _recarregar_tabela(tabela, globals.df_global)
 
 def deletar_linha(tabela):
     selecionadas = tabela.selection()
     if not selecionadas:
         return
     indices = [tabela.index(item) for item in selecionadas]
-    if globals.df_global is not None and isinstance(globals.df_global, pd.DataFrame):
-        globals.df_global = globals.df_global.drop(indices).reset_index(drop=True)
-    # Limpa todos os itens da tabela
-    for item in tabela.get_children():
-        tabela.delete(item)
+    diario = _diario()
+    if diario is not None:
+        diario.deletar(indices)
+        globals.df_global = diario.df
     # Reinsere as linhas com numeração sequencial
-    if globals.df_global is not None and isinstance(globals.df_global, pd.DataFrame):
-        for i, row in globals.df_global.iterrows():
-            tabela.insert('', 'end', text=str(i + 1), values=list(row))
-    # Atualiza o DataFrame global e a linha TOTAL
-    atualizar_dataframe_global()
+    _recarregar_tabela(tabela, globals.df_global)
 
 def atualizar_dataframe_global():
     """
-    Sincroniza o DataFrame global com os dados atuais da tabela.
-    Converte e valida valores numéricos nas colunas de quantidade e tempo.
+    Garante que o DataFrame global está normalizado e ligado ao diário de edições.
+    As edições, inserções e remoções da tabela já são aplicadas linha a linha em
+    globals.df_global (ver DiarioEdicoes), então normalmente nada precisa ser feito.
     """
-    tabela = globals.tabela
-    if tabela is None or not tabela.winfo_exists():
-        return
-    try:
-        raw_cols = list(map(str, tabela['columns']))
-        colunas = [str(c) for c in raw_cols if isinstance(c, str) or isinstance(c, int)]
-    except Exception:
-        colunas = []
-    dados = []
-    for item in tabela.get_children():
-        valores = list(tabela.item(item)['values'])
-        for i, col in enumerate(colunas):
-            col_norm = unidecode.unidecode(col).lower()
-            if 'qtd' in col_norm:
-                valores[i] = parse_quantidade(valores[i])
-            elif 'tempo' in col_norm:
-                valores[i] = parse_tempo(valores[i])
-        if len(valores) == len(colunas):
-            dados.append(valores)
-    # Garante que a coluna 'Tempo (min)' existe
-    if not any('tempo (min' in unidecode.unidecode(c).lower() for c in colunas):
-        colunas.append('Tempo (min)')
-        for row in dados:
-            row.append('')
-    # Atualiza o campo 'Tempo (min)' para cada linha
-    idx_tempo = None
-    idx_tempo_min = None
-    for i, c in enumerate(colunas):
-        if 'tempo' in unidecode.unidecode(c).lower() and '(min' not in unidecode.unidecode(c).lower():
-            idx_tempo = i
-        if 'tempo (min' in unidecode.unidecode(c).lower():
-            idx_tempo_min = i
-    if idx_tempo is not None and idx_tempo_min is not None:
-        for row in dados:
-            tempo_str = row[idx_tempo] if idx_tempo < len(row) else ''
-            row[idx_tempo_min] = parse_tempo(tempo_str)
-    # Remove todas as linhas TOTAL existentes antes de processar
-    dados = [row for row in dados if str(row[0]).strip().upper() != 'TOTAL']
-    # Adiciona linha de totais ao final (somente para linhas de produção/OPs válidas)
-    if dados and colunas:
-        totais = ['' for _ in colunas]
-        # Identifica índices das colunas de quantidade
-        idxs_qtd = [i for i, col in enumerate(colunas) if 'qtd' in unidecode.unidecode(col).lower()]
-        # Filtra apenas linhas de produção (Evento contém 'produção')
-        linhas_validas = []
-        idx_evento = None
-        for i, col in enumerate(colunas):
-            if unidecode.unidecode(col).lower().startswith('evento'):
-                idx_evento = i
-                break
-        for row in dados:
-            if idx_evento is not None and idx_evento < len(row):
-                evento = str(row[idx_evento]).lower()
-                if 'producao' in unidecode.unidecode(evento):
-                    linhas_validas.append(row)
-        # Só adiciona linha TOTAL se houver dados válidos para somar
-        if linhas_validas:
-            for i in idxs_qtd:
-                try:
-                    total_num = sum(row[i] for row in linhas_validas if isinstance(row[i], (int, float)))
-                    totais[i] = formatar_quantidade(total_num)
-                except Exception:
-                    totais[i] = ''
-            if len(totais) > 0:
-                totais[0] = 'TOTAL'
-            dados.append(totais)
-    # Padroniza colunas para lista de strings simples
-    colunas = list(colunas)
-    colunas = [str(c) for c in colunas]
-    if dados and isinstance(colunas, list) and all(isinstance(c, str) for c in colunas):
-        import pandas as pd
-        try:
-            df = pd.DataFrame(data=dados, columns=pd.Index(colunas))
-            if not df.empty:
-                globals.df_global = df
-        except Exception:
-            df = pd.DataFrame(data=dados, columns=pd.Index(colunas))
-            if not df.empty:
-                globals.df_global = df
+    _diario()
 
 def importar_dados():
     pass
@@ -538,11 +559,8 @@ def aplicar_cores_por_processo(tabela):
             idx_proc = i
     if idx_op is None or idx_proc is None:
         return  # Não encontrou colunas necessárias
-    # Limpa tags antigas
-    for item in tabela.get_children():
-        tabela.item(item, tags=())
-    for idx, item in enumerate(tabela.get_children()):
-        valores = list(tabela.item(item)['values'])
+    tags_por_linha = {}
+    for idx, valores in enumerate(valores_linhas_tabela(tabela)):
         if idx_op is None or idx_proc is None or idx_op >= len(valores) or idx_proc >= len(valores):
             continue
         op = str(valores[idx_op]).strip()
@@ -560,6 +578,6 @@ def aplicar_cores_por_processo(tabela):
             bloco_idx += 1
         # Aplica cor se estiver em bloco de entrada
         if cor_atual and bloco_tag:
-            tabela.item(item, tags=(str(bloco_tag),))
-        else:
-            tabela.item(item, tags=())
+            tags_por_linha[idx] = (str(bloco_tag),)
+    # Substitui as tags antigas
+    aplicar_tags_linhas(tabela, tags_por_linha, substituir=True)
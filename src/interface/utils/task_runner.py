@@ -0,0 +1,145 @@
+"""
+Background task runner for the interface.
+Executa carregamento e análise fora da thread do Tk e entrega resultados,
+progresso e erros de volta à interface via after().
+
+Only one task runs at a time: starting a new task cancels the one in flight.
+Cancellation is cooperative — the task stops at its next checkpoint
+(token.verificar()) and any result it still produces is discarded.
+"""
+
+import queue
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_VERIFICACAO_MS = 50
+
+class TarefaCancelada(Exception):
+    """Levantada por TokenCancelamento.verificar quando a tarefa foi cancelada."""
+
+class TokenCancelamento:
+    """Cancellation flag and progress channel handed to a background task."""
+
+    def __init__(self, fila, id_tarefa):
+        self._fila = fila
+        self._id = id_tarefa
+        self._evento = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._evento.is_set()
+
+    def cancelar(self):
+        self._evento.set()
+
+    def verificar(self):
+        """Ponto de verificação: interrompe a tarefa se ela foi cancelada."""
+        if self._evento.is_set():
+            raise TarefaCancelada()
+
+    def progresso(self, mensagem):
+        """Envia uma mensagem de progresso para a interface (thread-safe)."""
+        self._fila.put(('progresso', self._id, mensagem))
+
+class ExecutorTarefas:
+    """
+    Run one background task at a time and dispatch its callbacks on the Tk thread.
+
+    Args:
+        widget (tk.Widget): Any widget, used to schedule after() polling
+        painel (object, optional): Progress surface with mostrar_tarefa(descricao, ao_cancelar),
+            atualizar_progresso(mensagem) and ocultar_tarefa() (see TerminalComponent)
+    """
+
+    def __init__(self, widget, painel=None):
+        self.widget = widget
+        self.painel = painel
+        self._fila = queue.Queue()
+        self._contador = 0
+        self._atual = None
+        self._callbacks = {}
+        self._verificando = False
+
+    def ocupado(self):
+        """Indica se há uma tarefa em andamento."""
+        return self._atual is not None
+
+    def executar(self, descricao, funcao, args=(), ao_concluir=None, ao_falhar=None):
+        """
+        Start funcao(*args, token=token) in a worker thread, cancelling any task in flight.
+
+        Args:
+            descricao (str): Text shown in the progress surface
+            funcao (callable): Task body; must not touch Tk widgets
+            args (tuple): Positional arguments
+            ao_concluir (callable, optional): Called on the Tk thread with the result
+            ao_falhar (callable, optional): Called on the Tk thread with the exception
+
+        Returns:
+            TokenCancelamento: Token of the new task
+        """
+        self.cancelar()
+        self._contador += 1
+        id_tarefa = self._contador
+        token = TokenCancelamento(self._fila, id_tarefa)
+        self._atual = (id_tarefa, token)
+        self._callbacks = {'ok': ao_concluir, 'erro': ao_falhar}
+        if self.painel is not None:
+            self.painel.mostrar_tarefa(descricao, self.cancelar)
+        threading.Thread(target=self._rodar, args=(id_tarefa, token, funcao, args),
+                         name=f"tarefa-{id_tarefa}", daemon=True).start()
+        self._agendar_verificacao()
+        return token
+
+    def cancelar(self):
+        """Cancela a tarefa em andamento (se houver) e descarta seu resultado."""
+        if self._atual is None:
+            return
+        id_tarefa, token = self._atual
+        token.cancelar()
+        self._atual = None
+        logger.debug("Tarefa %s cancelada", id_tarefa)
+        if self.painel is not None:
+            self.painel.ocultar_tarefa()
+
+    def _rodar(self, id_tarefa, token, funcao, args):
+        try:
+            resultado = funcao(*args, token=token)
+        except TarefaCancelada:
+            self._fila.put(('cancelada', id_tarefa, None))
+        except Exception as e:
+            logger.exception("Erro na tarefa %s", id_tarefa)
+            self._fila.put(('erro', id_tarefa, e))
+        else:
+            self._fila.put(('ok', id_tarefa, resultado))
+
+    def _agendar_verificacao(self):
+        if not self._verificando:
+            self._verificando = True
+            self.widget.after(INTERVALO_VERIFICACAO_MS, self._processar_fila)
+
+    def _processar_fila(self):
+        """Roda na thread do Tk: entrega as mensagens da tarefa atual e ignora as de tarefas canceladas."""
+        self._verificando = False
+        while True:
+            try:
+                tipo, id_tarefa, valor = self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if self._atual is None or id_tarefa != self._atual[0]:
+                continue
+            if tipo == 'progresso':
+                if self.painel is not None:
+                    self.painel.atualizar_progresso(valor)
+                continue
+            callback = self._callbacks.get(tipo)
+            self._atual = None
+            self._callbacks = {}
+            if self.painel is not None:
+                self.painel.ocultar_tarefa()
+            if callback is not None:
+                callback(valor)
+        if self._atual is not None:
+            self._agendar_verificacao()
@@ -0,0 +1,49 @@
+"""
+Regression checks for the benchmark harness.
+Confere que o harness mede todas as etapas e que a comparação com a linha de
+base acusa regressões reais e ignora ruído. A comparação de tempos com
+benchmarks/baseline.json só roda com ANALISADOR_BENCH=1 (depende da máquina).
+"""
+
+import os
+
+import pytest
+
+from benchmarks import run
+
+def test_cenario_pequeno_mede_todas_as_etapas():
+    resultados = run.executar(['pequeno'], repeticoes=1)
+    tempos = resultados['pequeno']
+    for etapa in run.ETAPAS:
+        if etapa == 'extrair_dados_pdf':
+            continue
+        assert tempos[etapa] > 0
+    assert tempos['linhas'] == run.CENARIOS_SINTETICOS['pequeno']['linhas']
+    assert tempos['ops'] > 0
+
+def test_cenario_desconhecido():
+    with pytest.raises(ValueError):
+        run.executar(['inexistente'], repeticoes=1)
+
+def test_comparar_acusa_regressao_acima_do_limite():
+    resultados = {'c': {'generate_report': 0.100, 'consolidar_ops': 0.050}}
+    baseline = {'c': {'generate_report': 0.050, 'consolidar_ops': 0.049}}
+    linhas = {etapa: regressao for _c, etapa, _a, _b, _v, regressao in run.comparar(resultados, baseline, 0.25)}
+    assert linhas == {'consolidar_ops': False, 'generate_report': True}
+
+def test_comparar_ignora_ruido_absoluto():
+    # +100%, mas abaixo da tolerância absoluta: ruído de medição
+    resultados = {'c': {'processar_grupos': 0.0004}}
+    baseline = {'c': {'processar_grupos': 0.0002}}
+    assert not run.comparar(resultados, baseline)[0][5]
+
+def test_comparar_sem_linha_de_base():
+    linha = run.comparar({'novo': {'frame_tipado': 0.01}}, {})[0]
+    assert linha[3] is None and linha[4] is None and not linha[5]
+
+@pytest.mark.skipif(os.environ.get('ANALISADOR_BENCH') != '1',
+                    reason='tempos dependem da máquina; use ANALISADOR_BENCH=1')
+def test_sem_regressao_contra_a_linha_de_base():
+    resultados = run.executar()
+    comparacao = run.comparar(resultados, run.carregar_baseline())
+    assert not any(linha[5] for linha in comparacao), run.formatar(resultados, comparacao)
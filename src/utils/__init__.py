@@ -4,8 +4,10 @@ Utility package.
 
 from . import formatters
 from . import validators
+from . import logger
 
 __all__ = [
     'formatters',
-    'validators'
+    'validators',
+    'logger'
 ]
@@ -0,0 +1,41 @@
+"""
+Logging utilities.
+Define o nível TRACE (abaixo de DEBUG) para diagnósticos linha a linha.
+
+TRACE is off by default. Set ANALISADOR_TRACE=1 to enable it for every
+logger obtained through get_logger. Hot loops must guard trace calls with
+trace_ativo(logger) so no message is formatted while tracing is off.
+"""
+
+import os
+import logging
+
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+def _trace_habilitado_no_ambiente():
+    return os.environ.get('ANALISADOR_TRACE', '').strip().lower() in ('1', 'true', 'sim', 'yes', 'on')
+
+def get_logger(name):
+    """
+    Return a module logger with TRACE support.
+
+    Args:
+        name (str): Logger name, usually __name__
+
+    Returns:
+        logging.Logger: Configured logger
+    """
+    logger = logging.getLogger(name)
+    if _trace_habilitado_no_ambiente():
+        logger.setLevel(TRACE)
+    return logger
+
+def trace_ativo(logger):
+    """Indica se mensagens TRACE deste logger serão emitidas."""
+    return logger.isEnabledFor(TRACE)
+
+def trace(logger, msg, *args):
+    """Emite uma mensagem TRACE com formatação preguiçosa."""
+    if logger.isEnabledFor(TRACE):
+        logger.log(TRACE, msg, *args)
@@ -0,0 +1,131 @@
+"""
+Startup time utilities.
+Mede o tempo até a primeira janela, lista as dependências pesadas já
+importadas nesse momento e pré-carrega essas dependências em segundo plano
+depois que a janela aparece.
+
+The GUI must not import pandas, numpy, pdfplumber or fpdf before the window
+is shown; they are loaded on first use (or by aquecer_dependencias).
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Meta de tempo até a primeira janela (segundos)
+ORCAMENTO_PRIMEIRA_JANELA_S = 1.5
+
+MODULOS_PESADOS = ('pandas', 'numpy', 'pdfplumber', 'fpdf', 'unidecode')
+
+# Pré-carregados depois que a janela aparece, para o primeiro F5 não pagar a importação
+MODULOS_AQUECIMENTO = ('pandas', 'pdfplumber')
+
+_inicio = time.perf_counter()
+
+def marcar_inicio(instante=None):
+    """Define o instante de início do processo (time.perf_counter())."""
+    global _inicio
+    _inicio = time.perf_counter() if instante is None else instante
+
+def tempo_desde_inicio():
+    """Segundos desde marcar_inicio (ou desde a importação deste módulo)."""
+    return time.perf_counter() - _inicio
+
+def modulos_pesados_carregados():
+    """Dependências pesadas já presentes em sys.modules."""
+    return [m for m in MODULOS_PESADOS if m in sys.modules]
+
+def aquecer_dependencias(modulos=MODULOS_AQUECIMENTO):
+    """
+    Import heavy dependencies in a daemon thread.
+
+    Args:
+        modulos (tuple): Module names to import
+
+    Returns:
+        threading.Thread: The started thread
+    """
+    def _importar():
+        inicio = time.perf_counter()
+        for nome in modulos:
+            try:
+                __import__(nome)
+            except ImportError:
+                logger.warning("Dependência %s indisponível", nome)
+        logger.info("Dependências pré-carregadas em %.2fs", time.perf_counter() - inicio)
+
+    thread = threading.Thread(target=_importar, name='aquecimento', daemon=True)
+    thread.start()
+    return thread
+
+def medir_importacoes(modulo, limite=15):
+    """
+    Measure the import of a module in a fresh interpreter with -X importtime.
+
+    Args:
+        modulo (str): Module to import (e.g. 'src.interface.components.main_window')
+        limite (int): Number of entries to return
+
+    Returns:
+        list: (cumulative_us, self_us, module) tuples, slowest first; empty when
+            running frozen (no interpreter to spawn) or on failure
+    """
+    if getattr(sys, 'frozen', False):
+        return []
+    base = os.environ.get('ANALISADOR_BASE_PATH') or os.getcwd()
+    caminho = os.pathsep.join([base, os.path.join(base, 'src'), os.environ.get('PYTHONPATH', '')])
+    try:
+        resultado = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+            capture_output=True, text=True, cwd=base, timeout=120,
+            env=dict(os.environ, PYTHONPATH=caminho)
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning("Não foi possível medir importações: %s", e)
+        return []
+    entradas = []
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith('import time:'):
+            continue
+        partes = linha[len('import time:'):].split('|')
+        if len(partes) != 3:
+            continue
+        try:
+            proprio, cumulativo = int(partes[0]), int(partes[1])
+        except ValueError:
+            continue  # cabeçalho
+        entradas.append((cumulativo, proprio, partes[2].strip()))
+    entradas.sort(reverse=True)
+    return entradas[:limite]
+
+def relatorio_inicializacao(tempo_janela, pesados, importacoes, orcamento=ORCAMENTO_PRIMEIRA_JANELA_S):
+    """
+    Format the startup report.
+
+    Args:
+        tempo_janela (float): Seconds until the first window (None if no window could be created)
+        pesados (list): Heavy modules already imported when the window appeared
+        importacoes (list): Output of medir_importacoes
+        orcamento (float): Time-to-first-window target in seconds
+
+    Returns:
+        str: Report text
+    """
+    linhas = ["RELATÓRIO DE INICIALIZAÇÃO", "=" * 60]
+    if tempo_janela is None:
+        linhas.append("Primeira janela: não medida (sem display)")
+    else:
+        situacao = "OK" if tempo_janela <= orcamento else "ACIMA DA META"
+        linhas.append(f"Primeira janela: {tempo_janela:.2f}s (meta {orcamento:.2f}s) - {situacao}")
+    linhas.append("Dependências pesadas antes da janela: " + (', '.join(pesados) if pesados else 'nenhuma'))
+    if importacoes:
+        linhas.append("")
+        linhas.append("Importações mais lentas (cumulativo / próprio, ms):")
+        for cumulativo, proprio, nome in importacoes:
+            linhas.append(f"  {cumulativo / 1000:8.1f} {proprio / 1000:8.1f}  {nome}")
+    return '\n'.join(linhas)
@@ -0,0 +1,131 @@
+"""
+Pipeline stage timers.
+Temporizadores (context managers) e contadores leves em volta das etapas do
+pipeline. Sem uma medição ativa (coletar) as etapas não medem nada, então os
+pontos de instrumentação podem ficar no código de produção.
+
+The active measurement lives in a context variable: each background task
+(thread) collects its own stages without seeing the others'.
+"""
+
+import os
+import time
+import contextvars
+from contextlib import contextmanager
+
+_medicao_atual = contextvars.ContextVar('medicao_atual', default=None)
+
+def rodape_habilitado():
+    """O rodapé de desempenho vem ligado com ANALISADOR_PERF=1."""
+    return os.environ.get('ANALISADOR_PERF', '').strip().lower() in ('1', 'true', 'sim', 'yes', 'on')
+
+class Medicao:
+    """
+    Stage times and counters of one operation (loading a PDF, one analysis).
+
+    Args:
+        titulo (str): Name shown in the footer
+    """
+
+    def __init__(self, titulo=''):
+        self.titulo = titulo
+        # (etapa externa, ..., etapa): [segundos, chamadas], na ordem em que começaram
+        self.etapas = {}
+        self.contadores = {}
+        self.inicio = time.perf_counter()
+        self.duracao = None
+        self._pilha = []
+
+    def iniciar_etapa(self, nome):
+        self._pilha.append(nome)
+        chave = tuple(self._pilha)
+        self.etapas.setdefault(chave, [0.0, 0])
+        return chave
+
+    def encerrar_etapa(self, chave, segundos):
+        del self._pilha[len(chave) - 1:]
+        self.etapas[chave][0] += segundos
+        self.etapas[chave][1] += 1
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def finalizar(self):
+        self.duracao = time.perf_counter() - self.inicio
+
+    def linhas(self):
+        """Linhas do rodapé desta medição (etapas aninhadas ficam recuadas)."""
+        duracao = self.duracao if self.duracao is not None else time.perf_counter() - self.inicio
+        linhas = [f"{self.titulo or 'Total'}: {duracao * 1000:.1f} ms"]
+        for chave, (segundos, chamadas) in self.etapas.items():
+            profundidade = len(chave) - 1
+            vezes = f" ({chamadas}x)" if chamadas > 1 else ''
+            linhas.append(f"{'  ' * (profundidade + 1)}{chave[-1]:<{max(30 - 2 * profundidade, 1)}} "
+                          f"{segundos * 1000:9.1f} ms{vezes}")
+        if self.contadores:
+            linhas.append('  ' + ', '.join(f"{nome}: {valor}" for nome, valor in self.contadores.items()))
+        return linhas
+
+def medicao_atual():
+    """Medição ativa neste contexto (None fora de coletar)."""
+    return _medicao_atual.get()
+
+@contextmanager
+def coletar(titulo=''):
+    """
+    Activate a measurement for the enclosed code.
+
+    Args:
+        titulo (str): Name shown in the footer
+
+    Yields:
+        Medicao: Filled by the etapa/contar calls made inside the block
+    """
+    medicao = Medicao(titulo)
+    marca = _medicao_atual.set(medicao)
+    try:
+        yield medicao
+    finally:
+        medicao.finalizar()
+        _medicao_atual.reset(marca)
+
+@contextmanager
+def etapa(nome):
+    """
+    Time a pipeline stage into the active measurement (no-op without one).
+
+    Args:
+        nome (str): Stage name; repeated calls under the same parent stage are summed
+    """
+    medicao = _medicao_atual.get()
+    if medicao is None:
+        yield
+        return
+    chave = medicao.iniciar_etapa(nome)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao.encerrar_etapa(chave, time.perf_counter() - inicio)
+
+def contar(nome, quantidade=1):
+    """Soma quantidade ao contador nome da medição ativa (no-op sem medição)."""
+    medicao = _medicao_atual.get()
+    if medicao is not None:
+        medicao.contar(nome, quantidade)
+
+def formatar_rodape(*medicoes):
+    """
+    Format the performance footer appended to a report.
+
+    Args:
+        *medicoes (Medicao): Measurements to show (None entries are skipped)
+
+    Returns:
+        str: Footer text, starting with a blank line
+    """
+    linhas = ['', '', '⏱ DESEMPENHO DA ANÁLISE', '-' * 50]
+    for medicao in medicoes:
+        if medicao is not None:
+            linhas.extend(medicao.linhas())
+    return '\n'.join(linhas) + '\n'